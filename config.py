@@ -6,3 +6,87 @@ load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")
+
+# Embedding cache (content-addressed, on disk)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") != "0"
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR", os.path.join(os.getcwd(), "researcher_embedding_cache")
+)
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+# arXiv result cache (SQLite)
+ARXIV_CACHE_ENABLED = os.getenv("ARXIV_CACHE_ENABLED", "1") != "0"
+ARXIV_CACHE_PATH = os.getenv(
+    "ARXIV_CACHE_PATH", os.path.join(os.getcwd(), "researcher_arxiv_cache.sqlite")
+)
+ARXIV_CACHE_TTL_SECONDS = float(os.getenv("ARXIV_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+ARXIV_CACHE_STALE_WHILE_REVALIDATE = os.getenv("ARXIV_CACHE_STALE_WHILE_REVALIDATE", "1") != "0"
+
+# LLM concurrency & rate limits (0 disables a limit)
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+
+# LLM response cache (SQLite). Semantic matching is off unless a threshold is set (e.g. 0.97).
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH", os.path.join(os.getcwd(), "researcher_llm_cache.sqlite")
+)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+LLM_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD", "0"))
+
+# Embeddings for reranking, memory and the LLM response cache (llm/embeddings.py):
+# "openai" (OPENAI_EMBEDDING_MODEL over the API) or "local" (the LOCAL_EMBEDDING_*
+# model below, the same instance RAG uses; no network). Vectors from different
+# providers are not comparable, so switching provider needs a fresh MEMORY_DIR.
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+
+# Local (HuggingFace / sentence-transformers) embedding model shared by the RAG modules
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+LOCAL_EMBEDDING_DEVICE = os.getenv("LOCAL_EMBEDDING_DEVICE", "cpu")
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "64"))
+# "torch" (default), "onnx" or "openvino". ONNX_FILE selects e.g. a quantized export
+# such as "onnx/model_qint8_avx512_vnni.onnx"; empty uses the model's default file.
+LOCAL_EMBEDDING_BACKEND = os.getenv("LOCAL_EMBEDDING_BACKEND", "torch")
+LOCAL_EMBEDDING_ONNX_FILE = os.getenv("LOCAL_EMBEDDING_ONNX_FILE", "")
+LOCAL_EMBEDDING_THREADS = int(os.getenv("LOCAL_EMBEDDING_THREADS", "0"))  # 0 = library default
+LOCAL_EMBEDDING_WARMUP = os.getenv("LOCAL_EMBEDDING_WARMUP", "1") != "0"
+
+# RAG vector index type: "flat" (exact), "ivf_flat", "hnsw" or "ivf_pq".
+# Approximate types are only used once the index holds RAG_ANN_MIN_VECTORS vectors;
+# smaller indexes stay exact (training IVF on a handful of chunks is meaningless).
+RAG_INDEX_TYPE = os.getenv("RAG_INDEX_TYPE", "flat")
+RAG_ANN_MIN_VECTORS = int(os.getenv("RAG_ANN_MIN_VECTORS", "10000"))
+RAG_ANN_TRAIN_SAMPLE = int(os.getenv("RAG_ANN_TRAIN_SAMPLE", "50000"))
+RAG_IVF_NLIST = int(os.getenv("RAG_IVF_NLIST", "0"))  # 0 = about 4 * sqrt(n)
+RAG_IVF_NPROBE = int(os.getenv("RAG_IVF_NPROBE", "16"))
+RAG_HNSW_M = int(os.getenv("RAG_HNSW_M", "32"))
+RAG_HNSW_EF_CONSTRUCTION = int(os.getenv("RAG_HNSW_EF_CONSTRUCTION", "80"))
+RAG_HNSW_EF_SEARCH = int(os.getenv("RAG_HNSW_EF_SEARCH", "64"))
+RAG_PQ_M = int(os.getenv("RAG_PQ_M", "0"))  # 0 = dim / 8 sub-quantizers
+RAG_PQ_NBITS = int(os.getenv("RAG_PQ_NBITS", "8"))
+
+# RAG retrieval: "dense", "lexical" (BM25 only), "hybrid" (both, fused with
+# reciprocal-rank fusion) or "auto" (lexical for identifier-like queries, else hybrid)
+RAG_RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "auto")
+RAG_RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+RAG_HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", "20"))
+
+# Token budget for retrieved context in RAG prompts (after merging and deduplication)
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "2000"))
+
+# Research memory (MemoryStore): "auto" (Chroma if installed, else SQLite),
+# "chroma" (PersistentClient) or "sqlite" (embedded SQLite + NumPy)
+MEMORY_BACKEND = os.getenv("MEMORY_BACKEND", "auto")
+MEMORY_DIR = os.getenv("MEMORY_DIR", os.path.join(os.getcwd(), "researcher_memory_db"))
+
+# Research memory compaction (python -m researcher.memory.compaction).
+# Near-duplicates above MEMORY_DEDUP_SIMILARITY (cosine) are merged; entries idle
+# for MEMORY_MAX_AGE_DAYS are evicted unless used MEMORY_KEEP_IF_ACCESSED times;
+# each collection is then capped at MEMORY_MAX_ITEMS (0 disables a rule).
+MEMORY_DEDUP_SIMILARITY = float(os.getenv("MEMORY_DEDUP_SIMILARITY", "0.95"))
+MEMORY_MAX_AGE_DAYS = float(os.getenv("MEMORY_MAX_AGE_DAYS", "180"))
+MEMORY_KEEP_IF_ACCESSED = int(os.getenv("MEMORY_KEEP_IF_ACCESSED", "3"))
+MEMORY_MAX_ITEMS = int(os.getenv("MEMORY_MAX_ITEMS", "5000"))
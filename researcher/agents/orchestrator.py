@@ -1,6 +1,10 @@
 # researcher/agents/orchestrator.py
-from typing import List, Dict, Any, Tuple, Optional
+import threading
+import time
+from typing import Callable, List, Dict, Any, Tuple, Optional
 from collections import deque, defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from difflib import SequenceMatcher
 
 from researcher.agents.planner_agent import plan_research
 from researcher.agents.worker_agent import WorkerAgent
@@ -8,9 +12,13 @@ from researcher.agents.reviewer_agent import ReviewerAgent
 
 
 class Orchestrator:
-    def __init__(self, reviewer_enabled: bool = True):
+    # Reviews whose revised_output is less similar than this to the original count as material
+    REVISION_SIMILARITY_THRESHOLD = 0.9
+
+    def __init__(self, reviewer_enabled: bool = True, max_workers: int = 4):
         self.worker = WorkerAgent()
         self.reviewer = ReviewerAgent() if reviewer_enabled else None
+        self.max_workers = max(1, max_workers)
 
     def _build_task_map(self, tasks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         return {t["name"]: t for t in tasks}
@@ -51,15 +59,236 @@ class Orchestrator:
         name_to_task = self._build_task_map(tasks)
         return [name_to_task[n] for n in ordered if n in name_to_task]
 
-    def run(self, query: str, initial_state: Optional[Dict[str, Any]] = None, review_each_task: bool = True) -> Dict[str, Any]:
+    def _review_text(self, task: Dict[str, Any], state: Dict[str, Any]) -> str:
+        """
+        Pick something to review: if expected_outputs declared, prefer that.
+        """
+        expected_outputs = task.get("expected_outputs", [])
+        if expected_outputs:
+            # combine outputs into a single text chunk
+            parts = []
+            for k in expected_outputs:
+                if k in state:
+                    parts.append(str(state[k]))
+            return "\n\n".join(parts)
+        # fallback: review the content stored under task name (if any)
+        return str(state.get(task["name"], ""))
+
+    @staticmethod
+    def _revision_target(task: Dict[str, Any], state: Dict[str, Any]) -> Optional[str]:
+        """
+        The state key a reviewer's revised text can replace: the task's single
+        declared output present in state, else its output stored under the
+        task name. None when several declared outputs were reviewed together
+        (one revised text cannot be split back across them) or none is text.
+        """
+        present = [k for k in task.get("expected_outputs", []) if k in state]
+        key = present[0] if len(present) == 1 else (task["name"] if not present else None)
+        if key is None or not isinstance(state.get(key), str):
+            return None
+        return key
+
+    def _review(self, task: Dict[str, Any], state: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """
+        Review a task's outputs. Returns (review_key, review_result, reviewed_text),
+        or None if the task produced nothing to review.
+        """
+        to_review_text = self._review_text(task, state)
+        if not to_review_text.strip():
+            return None
+        review_result = self.reviewer.review(task["name"], to_review_text)
+        return f"{task['name']}_review", review_result, to_review_text
+
+    def _execute(self, task: Dict[str, Any], snapshot: Dict[str, Any], review: bool) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run one task against a private copy of the state.
+        Returns (updates, log_entry) where `updates` holds every key the task
+        added or replaced, so it can be merged into the shared state.
+        """
+        started_at = time.time()
+        local = self.worker.execute_task(task, dict(snapshot))
+        updates = {k: v for k, v in local.items() if k not in snapshot or snapshot[k] is not v}
+
+        log_entry: Dict[str, Any] = {
+            "task": task["name"],
+            "produced": [k for k in updates if k not in snapshot],
+        }
+
+        if review:
+            reviewed = self._review(task, local)
+            if reviewed:
+                review_key, review_result, _ = reviewed
+                # Attach review results to state under a reserved key
+                updates[review_key] = review_result
+                log_entry["review"] = {"key": review_key, "issues": review_result.get("issues_found", [])}
+
+        finished_at = time.time()
+        log_entry.update({
+            "thread": threading.current_thread().name,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "duration_s": round(finished_at - started_at, 4),
+        })
+        return updates, log_entry
+
+    def _run_dag(
+        self,
+        tasks: List[Dict[str, Any]],
+        state: Dict[str, Any],
+        review: bool,
+        on_task_done: Optional[Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Dispatch each task as soon as all of its dependencies have finished,
+        using a bounded thread pool. Ties are broken by plan order, so runs
+        are deterministic for a given plan.
+
+        - Unknown dependencies are ignored (and reported in the task's log entry).
+        - Tasks that can never become ready (cycles, or downstream of one) run
+          last, one at a time in plan order, flagged with "cycle": True.
+
+        `on_task_done(task, state_snapshot, log_entry)` is called on the
+        scheduler thread right after each task's outputs are merged.
+        """
+        names = [t["name"] for t in tasks]
+        known = set(names)
+        position = {n: i for i, n in enumerate(names)}
+        name_to_task = self._build_task_map(tasks)
+
+        unknown = {n: [d for d in name_to_task[n].get("dependencies", []) if d not in known] for n in names}
+        waiting = {n: {d for d in name_to_task[n].get("dependencies", []) if d in known and d != n} for n in names}
+        self_loops = {n for n in names if n in name_to_task[n].get("dependencies", [])}
+        dependents = defaultdict(list)
+        for n in names:
+            for d in waiting[n]:
+                dependents[d].append(n)
+
+        run_log: List[Dict[str, Any]] = []
+        ready = [n for n in names if not waiting[n] and n not in self_loops]
+        done = set()
+
+        def finish(name: str, updates: Dict[str, Any], log_entry: Dict[str, Any]):
+            state.update(updates)
+            if unknown[name]:
+                log_entry["unknown_dependencies"] = unknown[name]
+            run_log.append(log_entry)
+            done.add(name)
+            if on_task_done:
+                on_task_done(name_to_task[name], dict(state), log_entry)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task") as pool:
+            running: Dict[Future, str] = {}
+            while ready or running:
+                for name in ready:
+                    future = pool.submit(self._execute, name_to_task[name], dict(state), review)
+                    running[future] = name
+                ready = []
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in sorted(finished, key=lambda f: position[running[f]]):
+                    name = running.pop(future)
+                    updates, log_entry = future.result()
+                    finish(name, updates, log_entry)
+                    for child in dependents[name]:
+                        waiting[child].discard(name)
+                        if not waiting[child] and child not in self_loops:
+                            ready.append(child)
+                ready.sort(key=position.get)
+
+        # Cycle members (and anything depending on them) — run best-effort in plan order
+        for name in names:
+            if name not in done:
+                updates, log_entry = self._execute(name_to_task[name], dict(state), review)
+                log_entry["cycle"] = True
+                finish(name, updates, log_entry)
+
+        return run_log
+
+    @staticmethod
+    def _is_material_revision(original: str, revised: Any) -> bool:
+        """
+        A revision is material when the reviewer's text differs noticeably
+        from what it was given (similarity below REVISION_SIMILARITY_THRESHOLD).
+        """
+        if not isinstance(revised, str) or not revised.strip():
+            return False
+        ratio = SequenceMatcher(None, original.strip(), revised.strip()).ratio()
+        return ratio < Orchestrator.REVISION_SIMILARITY_THRESHOLD
+
+    @staticmethod
+    def _descendants(tasks: List[Dict[str, Any]], roots: List[str]) -> List[str]:
+        """
+        All tasks downstream of `roots` (excluding the roots), in plan order.
+        """
+        dependents = defaultdict(set)
+        for t in tasks:
+            for d in t.get("dependencies", []):
+                dependents[d].add(t["name"])
+
+        found = set()
+        stack = list(roots)
+        while stack:
+            for child in dependents.get(stack.pop(), ()):
+                if child not in found:
+                    found.add(child)
+                    stack.append(child)
+        found -= set(roots)
+        return [t["name"] for t in tasks if t["name"] in found]
+
+    def _merge_reviews(
+        self,
+        pending: List[Tuple[Dict[str, Any], Dict[str, Any], Future]],
+        state: Dict[str, Any],
+    ) -> List[str]:
+        """
+        Wait for background reviews, merge them into state and the run log.
+        Returns the names of tasks whose output the reviewer materially revised.
+        """
+        revised = []
+        for task, log_entry, future in pending:
+            reviewed = future.result()
+            if not reviewed:
+                continue
+            review_key, review_result, reviewed_text = reviewed
+            state[review_key] = review_result
+            log_entry["review"] = {"key": review_key, "issues": review_result.get("issues_found", [])}
+            if self._is_material_revision(reviewed_text, review_result.get("revised_output")):
+                log_entry["review"]["revised"] = True
+                revised.append(task["name"])
+        return revised
+
+    def run(
+        self,
+        query: str,
+        initial_state: Optional[Dict[str, Any]] = None,
+        review_each_task: bool = True,
+        review_mode: str = "inline",
+        rerun_revised: bool = False,
+    ) -> Dict[str, Any]:
         """
         Run the full pipeline:
         1) Planner -> tasks
         2) Toposort tasks by dependencies
-        3) Execute each task via WorkerAgent
+        3) Execute tasks via WorkerAgent, dispatching each one as soon as its
+           dependencies finish (independent branches run in parallel)
         4) Optionally review each task's outputs via ReviewerAgent
-        Returns final state with metadata.
+        Returns final state with metadata. Each run_log entry records the
+        task's start/finish timestamps.
+
+        review_mode:
+          - "inline":    review each task before its dependents start (default).
+          - "pipelined": reviews run in the background while downstream tasks
+                         proceed on the unrevised output; results are merged
+                         into the final state once everything has finished.
+        rerun_revised (pipelined only): when the reviewer materially revises a
+        task, replace its output with the revision and re-run just the tasks
+        downstream of it. The output replaced is the task's one declared
+        expected output, or the value stored under the task name; tasks whose
+        several declared outputs were reviewed as one text are not re-run.
         """
+        if review_mode not in ("inline", "pipelined"):
+            raise ValueError(f"Unknown review_mode: {review_mode}")
+
         initial_state = initial_state.copy() if initial_state else {}
         initial_state.setdefault("query", query)
 
@@ -71,45 +300,39 @@ class Orchestrator:
         # 2) Sort
         ordered_tasks = self._toposort(tasks)
 
-        # 3) Execute
+        # 3 + 4) Execute (and review)
         state = initial_state
-        run_log: List[Dict[str, Any]] = []
+        review = bool(self.reviewer and review_each_task)
 
-        for task in ordered_tasks:
-            # execute
-            before_state_keys = set(state.keys())
-            state = self.worker.execute_task(task, state)
-            after_state_keys = set(state.keys())
-
-            produced_keys = list(after_state_keys - before_state_keys)
-            log_entry = {
-                "task": task["name"],
-                "produced": produced_keys,
-            }
-
-            # 4) Review if enabled and review_each_task
-            if self.reviewer and review_each_task:
-                # pick something to review: if expected_outputs declared, prefer that
-                expected_outputs = task.get("expected_outputs", [])
-                to_review_text = ""
-                if expected_outputs:
-                    # combine outputs into a single text chunk
-                    parts = []
-                    for k in expected_outputs:
-                        if k in state:
-                            parts.append(str(state[k]))
-                    to_review_text = "\n\n".join(parts)
-                else:
-                    # fallback: review the content stored under task name (if any)
-                    to_review_text = str(state.get(task["name"], ""))
-
-                if to_review_text.strip():
-                    review_result = self.reviewer.review(task["name"], to_review_text)
-                    # Attach review results to state under a reserved key
-                    review_key = f"{task['name']}_review"
-                    state[review_key] = review_result
-                    log_entry["review"] = {"key": review_key, "issues": review_result.get("issues_found", [])}
+        if not review or review_mode == "inline":
+            run_log = self._run_dag(ordered_tasks, state, review)
+            return {"state": state, "run_log": run_log, "tasks": [t["name"] for t in ordered_tasks]}
 
-            run_log.append(log_entry)
+        pending: List[Tuple[Dict[str, Any], Dict[str, Any], Future]] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="review") as review_pool:
+            def submit_review(task, snapshot, log_entry):
+                pending.append((task, log_entry, review_pool.submit(self._review, task, snapshot)))
+
+            run_log = self._run_dag(ordered_tasks, state, review=False, on_task_done=submit_review)
+            revised = self._merge_reviews(pending, state)
+
+        if rerun_revised and revised:
+            applied = []
+            task_map = self._build_task_map(ordered_tasks)
+            for name in revised:
+                target = self._revision_target(task_map[name], state)
+                if target is not None:
+                    state[target] = state[f"{name}_review"]["revised_output"]
+                    applied.append(name)
+
+            rerun = self._descendants(ordered_tasks, applied)
+            if rerun:
+                subset = [
+                    {**t, "dependencies": [d for d in t.get("dependencies", []) if d in rerun]}
+                    for t in ordered_tasks if t["name"] in rerun
+                ]
+                for log_entry in self._run_dag(subset, state, review=False):
+                    log_entry["rerun"] = True
+                    run_log.append(log_entry)
 
         return {"state": state, "run_log": run_log, "tasks": [t["name"] for t in ordered_tasks]}
@@ -1,24 +1,8 @@
 import json
 from typing import List, Dict, Any
-from researcher.memory.memory_store import MemoryStore
+from researcher.memory.memory_store import get_memory_store
 from researcher.llm.llm import generate
 
-def plan_research(query: str):
-    # Fetch memory relevant to this query
-    mem = MemoryStore.search(query, top_k=5)
-
-    # Extract documents nicely
-    past_docs = []
-    if mem and "documents" in mem:
-        for group in mem["documents"]:
-            for d in group:
-                past_docs.append(d)
-
-    memory_block = ""
-    if past_docs:
-        memory_block = "\n\nPAST KNOWLEDGE (from memory):\n" + "\n".join(
-            f"- {p}" for p in past_docs
-        )
 ALLOWED_TASKS = [
     "search_papers",
     "summarize_papers",
@@ -61,3 +45,46 @@ Example format:
 }}
 """
 
+
+def _memory_block(query: str, top_k: int = 5) -> str:
+    """Past knowledge relevant to the query, from every memory collection."""
+    store = get_memory_store()
+    if store is None:
+        return ""
+    try:
+        hits = store.search(query, top_k=top_k)
+    except Exception as e:
+        print(f"[Planner] Memory search failed: {e}")
+        return ""
+    if not hits:
+        return ""
+    return "\n\nPAST KNOWLEDGE (from memory):\n" + "\n".join(
+        f"- [{h['category']}] {h['document']}" for h in hits
+    )
+
+
+def _parse_tasks(response: str) -> List[Dict[str, Any]]:
+    """Tasks from the planner's JSON reply, keeping only allowed task names."""
+    text = response.strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end == -1:
+        return []
+    try:
+        plan = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return []
+    tasks = [t for t in plan.get("tasks", []) if isinstance(t, dict) and t.get("name") in ALLOWED_TASKS]
+    for t in tasks:
+        t.setdefault("dependencies", [])
+    return tasks
+
+
+def plan_research(query: str) -> List[Dict[str, Any]]:
+    # Fetch memory relevant to this query
+    memory_block = _memory_block(query)
+
+    prompt = f"{PLANNER_PROMPT}\nUSER QUERY: {query}{memory_block}\n"
+    tasks = _parse_tasks(generate(prompt))
+    if not tasks:
+        print("[Planner] Could not parse a plan from the LLM response.")
+    return tasks
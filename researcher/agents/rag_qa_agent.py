@@ -1,24 +1,40 @@
-from researcher.llm.llm import generate
-from data.rag_index import retrieve_relevant_chunks
+from typing import Iterator, List
+from langchain_core.documents import Document
+from config import RAG_CONTEXT_TOKENS
+from researcher.llm.llm import generate, stream_generate
+from researcher.data.rag_index import get_index_manager
+from researcher.utils.context_packing import PackedContext, pack_context
 
-def rag_answer(query: str, top_k: int = 5) -> str:
+def _retrieve(query: str, top_k: int, retriever=None) -> List[Document]:
     """
-    RAG question answering agent.
-    Retrieves relevant document chunks and answers using the global LLM provider.
+    Use the given LangChain retriever if any, else the shared vector store.
     """
-    if not query.strip():
-        return "No query provided."
+    if retriever is not None:
+        return retriever.invoke(query)[:top_k]
+    return get_index_manager().retrieve(query, top_k=top_k)
 
-    # Retrieve context from vector store
-    context_chunks = retrieve_relevant_chunks(query, top_k=top_k)
+def build_context(query: str, top_k: int = 5, retriever=None, max_tokens: int = RAG_CONTEXT_TOKENS) -> PackedContext:
+    """
+    Retrieve chunks for `query` and pack them into the context token budget:
+    overlapping neighbours are merged and near-duplicates dropped first.
+    """
+    packed = pack_context(_retrieve(query, top_k, retriever), max_tokens)
+    if packed.tokens_in:
+        print(
+            f"[RAG] Context {packed.tokens_in} -> {packed.tokens_used} tokens "
+            f"(saved {packed.tokens_saved}; merged {packed.merged}, "
+            f"duplicates {packed.duplicates}, over budget {packed.dropped})"
+        )
+    return packed
 
+def _build_prompt(query: str, context_chunks: List[str]) -> str:
     if not context_chunks:
         context_text = "No relevant context found."
     else:
         context_text = "\n\n".join(context_chunks)
 
     # Build structured prompt
-    prompt = f"""
+    return f"""
 You are an expert academic assistant.
 Use ONLY the provided context to answer the user question.
 If the answer is not in the context, say "The information is not available in the provided documents."
@@ -31,4 +47,26 @@ QUESTION:
 
 ANSWER:
 """
-    return generate(prompt)
+
+def rag_answer(query: str, top_k: int = 5, retriever=None) -> str:
+    """
+    RAG question answering agent.
+    Retrieves relevant document chunks and answers using the global LLM provider.
+    """
+    if not query.strip():
+        return "No query provided."
+
+    # Retrieve context from vector store
+    context = build_context(query, top_k, retriever)
+    return generate(_build_prompt(query, context.chunks))
+
+def stream_rag_answer(query: str, top_k: int = 5, retriever=None) -> Iterator[str]:
+    """
+    Same as `rag_answer`, but yields the answer as it is generated.
+    """
+    if not query.strip():
+        yield "No query provided."
+        return
+
+    context = build_context(query, top_k, retriever)
+    yield from stream_generate(_build_prompt(query, context.chunks))
@@ -2,7 +2,6 @@
 
 from typing import Dict, Any, List
 from researcher.agents.task_registry import TASK_MAP
-from researcher.memory.memory_store import memory
 
 
 class WorkerAgent:
@@ -10,17 +10,21 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 # ----------- Phase 2 + 3 Modules -----------
-from data.arxiv_fetcher import fetch_arxiv_papers
-from data.pdf_reader import extract_text_from_pdf
-from pipelines.pdf_summarizer import summarize_pdf_text
-from pipelines.summarizer import summarize_papers
-from pipelines.insight_extractor import extract_insights
+from data.arxiv_fetcher import search_papers
+from data.pdf_reader import extract_text_from_pdf, PDFExtractionError
+from pipelines.pdf_summarizer import stream_pdf_summary
+from pipelines.summarizer import stream_summary
+from pipelines.insight_extractor import stream_insights
 from utils.insight_utils import parse_insights
 
 # ----------- Phase 5 (RAG Agent) -----------
 from data.rag_loader import load_document
-from data.rag_index import chunk_documents, build_and_save_faiss_index, load_faiss_index
-from agents.rag_qa_agent import answer_query
+from agents.rag_qa_agent import stream_rag_answer
+# Same module objects the RAG code uses (rag_qa_agent imports researcher.data.rag_index),
+# so uploads land in the index manager answers are read from, and the warmed-up
+# model is the one they share
+from researcher.data.rag_index import get_index_manager
+from researcher.llm.embedding_registry import warm_up as warm_up_embeddings
 
 # ----------- Streamlit Page Setup -----------
 st.set_page_config(page_title="Auto Researcher", layout="wide")
@@ -41,6 +45,9 @@ if "last_summary" not in st.session_state:
 if "rag_data" not in st.session_state:
     st.session_state.rag_data = {"index": None}
 
+# Load the embedding model in the background while the user picks a tab
+warm_up_embeddings()
+
 # ----------- Tab 1: arXiv Search & Summarize -----------
 def summarize_arxiv_flow():
     st.header("🔍 Search and Summarize arXiv Papers")
@@ -54,7 +61,7 @@ def summarize_arxiv_flow():
             return
 
         with st.spinner("Fetching papers from arXiv..."):
-            papers = fetch_arxiv_papers(topic, max_results=num_papers)
+            papers = search_papers(topic, n_results=num_papers)
 
         if not papers:
             st.warning("No papers found.")
@@ -62,19 +69,18 @@ def summarize_arxiv_flow():
 
         st.success(f"Fetched {len(papers)} papers.")
         for i, paper in enumerate(papers, 1):
-            st.markdown(f"**{i}. {paper['title']}**")
-            st.markdown(f"*Authors:* {', '.join(paper['authors'])}")
-            st.markdown(f"*Published:* {paper['published']}")
-            st.markdown(f"[PDF Link]({paper['pdf_url']})")
-            st.markdown(f"> {paper['summary'][:300]}...")
+            st.markdown(f"**{i}. {paper.title}**")
+            st.markdown(f"*Authors:* {', '.join(paper.authors)}")
+            st.markdown(f"*Published:* {paper.published}")
+            st.markdown(f"[PDF Link]({paper.pdf_url})")
+            st.markdown(f"> {paper.summary[:300]}...")
             st.markdown("---")
 
-        abstracts = [p['summary'] for p in papers]
-        with st.spinner("Generating combined summary..."):
-            combined_summary = summarize_papers(abstracts)
+        abstracts = [p.summary for p in papers]
 
+        # Render tokens as they arrive; write_stream returns the full text
         st.subheader("📝 Combined Summary")
-        st.write(combined_summary)
+        combined_summary = st.write_stream(stream_summary("\n\n".join(abstracts)))
         st.session_state.last_summary = combined_summary
 
 # ----------- Tab 2: Upload & Summarize PDF -----------
@@ -86,29 +92,23 @@ def summarize_pdf_flow():
         st.info("Upload a PDF to extract and summarize.")
         return
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(uploaded_pdf.read())
-        tmp_pdf_path = tmp_file.name
-
     try:
         with st.spinner("Extracting full text..."):
-            full_text = extract_text_from_pdf(tmp_pdf_path)
-    finally:
-        os.remove(tmp_pdf_path)
+            full_text = extract_text_from_pdf(uploaded_pdf.getvalue())
+    except PDFExtractionError as e:
+        st.error(f"Failed to extract text: {e}")
+        return
 
-    if not full_text or full_text.startswith("Error"):
-        st.error(f"Failed to extract text: {full_text}")
+    if not full_text:
+        st.error("Failed to extract text: the PDF contains no extractable text.")
         return
 
     st.success("Extracted text from PDF successfully.")
     st.write(f"Total characters extracted: {len(full_text)}")
 
     if st.button("Summarize PDF"):
-        with st.spinner("Summarizing PDF..."):
-            summary = summarize_pdf_text(full_text)
-
         st.subheader("📝 PDF Summary")
-        st.write(summary)
+        summary = st.write_stream(stream_pdf_summary(full_text))
         st.session_state.last_summary = summary
 
 # ----------- Tab 3: Insight Extraction -----------
@@ -127,11 +127,8 @@ def insight_extraction_flow():
             st.error("Please enter a summary.")
             return
 
-        with st.spinner("Extracting insights..."):
-            raw_output = extract_insights(summary_input, num_insights=num_insights)
-
         st.subheader("📄 Raw Output")
-        st.code(raw_output)
+        raw_output = st.write_stream(stream_insights(summary_input, num_insights=num_insights))
 
         with st.spinner("Parsing insights..."):
             parsed = parse_insights(raw_output)
@@ -211,11 +208,11 @@ def rag_qa_flow():
             tmp_pdf_path = tmp_file.name
 
         with st.spinner("Indexing document with FAISS..."):
+            # Only chunks of documents not seen before are embedded and added
+            manager = get_index_manager()
             docs = load_document(tmp_pdf_path)
-            chunks = chunk_documents(docs)
-            build_and_save_faiss_index(chunks)
-            index = load_faiss_index()
-            st.session_state.rag_data["index"] = index
+            manager.add_documents(docs, source=uploaded_pdf.name)
+            st.session_state.rag_data["index"] = manager.vectorstore
 
         os.remove(tmp_pdf_path)
         st.success("Document indexed for QA.")
@@ -223,13 +220,9 @@ def rag_qa_flow():
     if st.session_state.rag_data.get("index"):
         question = st.text_input("Ask a question based on the uploaded PDF:")
         if st.button("Get Answer"):
-            with st.spinner("Retrieving answer..."):
-                answer = answer_query(
-                    query=question,
-                    retriever=st.session_state.rag_data["index"].as_retriever()
-                )
             st.subheader("🧠 Answer")
-            st.write(answer)
+            # No retriever: use the shared index's hybrid (BM25 + dense) retrieval
+            st.write_stream(stream_rag_answer(question))
 
 # ----------- Main App Entry -----------
 def main():
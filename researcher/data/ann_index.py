@@ -0,0 +1,292 @@
+# researcher/data/ann_index.py
+"""
+FAISS index factory for the RAG vectorstore.
+
+Supported types (all L2, matching LangChain's FAISS default):
+  flat      exact search, O(n) per query
+  ivf_flat  inverted lists over k-means cells; searches `nprobe` cells
+  hnsw      graph search; `ef_search` trades recall for latency
+  ivf_pq    IVF with product-quantized vectors (~dim/8 bytes per vector)
+
+Run `python -m researcher.data.ann_index` for a recall-vs-latency benchmark
+against the flat baseline.
+"""
+import argparse
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from config import (
+    RAG_INDEX_TYPE,
+    RAG_ANN_MIN_VECTORS,
+    RAG_ANN_TRAIN_SAMPLE,
+    RAG_IVF_NLIST,
+    RAG_IVF_NPROBE,
+    RAG_HNSW_M,
+    RAG_HNSW_EF_CONSTRUCTION,
+    RAG_HNSW_EF_SEARCH,
+    RAG_PQ_M,
+    RAG_PQ_NBITS,
+)
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+
+@dataclass
+class ANNConfig:
+    index_type: str = "flat"
+    min_vectors: int = 10000
+    train_sample: int = 50000
+    nlist: int = 0              # 0 = chosen from n
+    nprobe: int = 16
+    hnsw_m: int = 32
+    ef_construction: int = 80
+    ef_search: int = 64
+    pq_m: int = 0               # 0 = chosen from dim
+    pq_nbits: int = 8
+
+    def __post_init__(self):
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type {self.index_type!r}; expected one of {INDEX_TYPES}")
+
+    @classmethod
+    def from_config(cls) -> "ANNConfig":
+        return cls(
+            index_type=RAG_INDEX_TYPE,
+            min_vectors=RAG_ANN_MIN_VECTORS,
+            train_sample=RAG_ANN_TRAIN_SAMPLE,
+            nlist=RAG_IVF_NLIST,
+            nprobe=RAG_IVF_NPROBE,
+            hnsw_m=RAG_HNSW_M,
+            ef_construction=RAG_HNSW_EF_CONSTRUCTION,
+            ef_search=RAG_HNSW_EF_SEARCH,
+            pq_m=RAG_PQ_M,
+            pq_nbits=RAG_PQ_NBITS,
+        )
+
+
+def _auto_nlist(n: int) -> int:
+    # ~4*sqrt(n) cells, but keep >= 39 training points per cell (faiss' minimum)
+    return max(1, min(int(4 * np.sqrt(n)), n // 39))
+
+
+def _auto_pq_m(dim: int) -> int:
+    # largest divisor of dim that is <= dim/8
+    for m in range(max(1, dim // 8), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def index_type_of(index: faiss.Index) -> str:
+    """
+    Name of an index's type as used in ANNConfig ("flat", "ivf_flat", ...).
+    """
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf_flat"
+    return "flat"
+
+
+def supports_remove(index: faiss.Index) -> bool:
+    """
+    Whether LangChain's FAISS.delete is safe on this index. Only flat indexes
+    compact their ids on remove_ids, matching how LangChain renumbers
+    index_to_docstore_id; IVF keeps the old ids and HNSW cannot remove at
+    all, so those go through `refill` instead.
+    """
+    return index_type_of(index) == "flat"
+
+
+def create_index(dim: int, n_vectors: int, cfg: ANNConfig) -> faiss.Index:
+    """
+    Empty (untrained) index of cfg.index_type for `n_vectors` vectors of size `dim`.
+    """
+    if cfg.index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, cfg.hnsw_m)
+        index.hnsw.efConstruction = cfg.ef_construction
+        return index
+    if cfg.index_type in ("ivf_flat", "ivf_pq"):
+        nlist = cfg.nlist or _auto_nlist(min(n_vectors, cfg.train_sample))
+        quantizer = faiss.IndexFlatL2(dim)
+        if cfg.index_type == "ivf_flat":
+            return faiss.IndexIVFFlat(quantizer, dim, nlist)
+        return faiss.IndexIVFPQ(quantizer, dim, nlist, cfg.pq_m or _auto_pq_m(dim), cfg.pq_nbits)
+    return faiss.IndexFlatL2(dim)
+
+
+def set_search_params(index: faiss.Index, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    """
+    Apply query-time knobs; parameters that do not apply to the index type are ignored.
+    """
+    index = faiss.downcast_index(index)
+    if nprobe and isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(nprobe, index.nlist)
+    if ef_search and isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search
+
+
+def build_index(vectors: np.ndarray, cfg: ANNConfig, force: bool = False) -> faiss.Index:
+    """
+    Build an index over `vectors`, training on a random sample where needed.
+
+    Below cfg.min_vectors an exact flat index is built instead, unless `force`.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+    if not force and n < cfg.min_vectors:
+        cfg = replace(cfg, index_type="flat")
+
+    index = create_index(dim, n, cfg)
+    if not index.is_trained:
+        sample = vectors
+        if n > cfg.train_sample:
+            rows = np.random.default_rng(0).choice(n, cfg.train_sample, replace=False)
+            sample = vectors[np.sort(rows)]
+        index.train(sample)
+    index.add(vectors)
+    set_search_params(index, cfg.nprobe, cfg.ef_search)
+    return index
+
+
+def reconstruct_all(index: faiss.Index) -> np.ndarray:
+    """
+    All stored vectors in insertion order (exact for flat, HNSW and IVF-Flat;
+    decoded approximations for IVF-PQ).
+    """
+    if index.ntotal == 0:
+        return np.zeros((0, index.d), dtype=np.float32)
+    if isinstance(faiss.downcast_index(index), faiss.IndexIVF):
+        faiss.extract_index_ivf(index).make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def refill(index: faiss.Index, vectors: np.ndarray) -> faiss.Index:
+    """
+    A copy of `index` holding only `vectors`, with ids 0..n-1. Training
+    (IVF centroids, PQ codebooks) and search parameters are kept, so
+    nothing is retrained.
+    """
+    fresh = faiss.clone_index(index)
+    fresh.reset()
+    fresh.add(np.ascontiguousarray(vectors, dtype=np.float32))
+    return fresh
+
+
+def index_nbytes(index: faiss.Index) -> int:
+    return int(faiss.serialize_index(index).nbytes)
+
+
+# ------------ Benchmark ------------
+def _synthetic_vectors(n: int, dim: int, seed: int = 0, clusters: int = 64) -> np.ndarray:
+    """
+    Normalized Gaussian mixture — clustered like real sentence embeddings.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    x = centers[rng.integers(0, clusters, n)] + 0.35 * rng.standard_normal((n, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def benchmark(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    configs: Optional[List[ANNConfig]] = None,
+) -> List[Dict]:
+    """
+    Recall@k and per-query latency of each config against exact flat search.
+
+    Queries are issued one at a time, like RAG retrieval does.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    configs = configs or [ANNConfig(index_type=t) for t in INDEX_TYPES]
+
+    truth = None
+    results = []
+    for cfg in configs:
+        start = time.perf_counter()
+        index = build_index(vectors, cfg, force=True)
+        build_s = time.perf_counter() - start
+
+        latencies = []
+        found = np.empty((len(queries), k), dtype=np.int64)
+        for i in range(len(queries)):
+            t0 = time.perf_counter()
+            _, ids = index.search(queries[i:i + 1], k)
+            latencies.append(time.perf_counter() - t0)
+            found[i] = ids[0]
+
+        if truth is None:
+            truth = faiss.IndexFlatL2(vectors.shape[1])
+            truth.add(vectors)
+            _, truth = truth.search(queries, k)
+        recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+
+        results.append({
+            "index_type": cfg.index_type,
+            "params": _param_summary(index),
+            "build_s": build_s,
+            "recall": float(recall),
+            "mean_ms": 1000 * float(np.mean(latencies)),
+            "p95_ms": 1000 * float(np.percentile(latencies, 95)),
+            "mbytes": index_nbytes(index) / 1e6,
+        })
+    return results
+
+
+def _param_summary(index: faiss.Index) -> str:
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        return f"M={index.hnsw.nb_neighbors(1)} efSearch={index.hnsw.efSearch}"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return f"nlist={index.nlist} nprobe={index.nprobe} m={index.pq.M} nbits={index.pq.nbits}"
+    if isinstance(index, faiss.IndexIVF):
+        return f"nlist={index.nlist} nprobe={index.nprobe}"
+    return "exact"
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Recall vs latency of RAG index types")
+    parser.add_argument("--index-file", help="benchmark on vectors from an existing index.faiss")
+    parser.add_argument("--n", type=int, default=50000, help="synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=384, help="synthetic vector size")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[RAG_IVF_NPROBE])
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[RAG_HNSW_EF_SEARCH])
+    args = parser.parse_args(argv)
+
+    if args.index_file:
+        vectors = reconstruct_all(faiss.read_index(args.index_file))
+    else:
+        vectors = _synthetic_vectors(args.n, args.dim)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    base = ANNConfig.from_config()
+    configs = [replace(base, index_type="flat")]
+    for t in ("ivf_flat", "ivf_pq"):
+        configs += [replace(base, index_type=t, nprobe=p) for p in args.nprobe]
+    configs += [replace(base, index_type="hnsw", ef_search=ef) for ef in args.ef_search]
+
+    print(f"[ANN] {len(vectors)} vectors x {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}")
+    print(f"{'type':<9} {'params':<36} {'build s':>8} {'recall':>7} {'mean ms':>8} {'p95 ms':>7} {'MB':>8}")
+    for r in benchmark(vectors, queries, k=args.k, configs=configs):
+        print(
+            f"{r['index_type']:<9} {r['params']:<36} {r['build_s']:>8.2f} {r['recall']:>7.3f} "
+            f"{r['mean_ms']:>8.3f} {r['p95_ms']:>7.3f} {r['mbytes']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# researcher/data/arxiv_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from researcher.models.paper import Paper
+
+
+class ArxivCache:
+    """
+    Local cache of arXiv search results backed by SQLite.
+
+    Two tables:
+      - papers:  one row per arxiv_id (shared by every query that returned it)
+      - queries: query key -> ordered list of arxiv_ids + fetch time
+
+    Entries older than `ttl_seconds` are still returned, flagged as stale, so
+    callers can serve them immediately and refresh in the background.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 6 * 60 * 60):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS papers (
+                arxiv_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS queries (
+                key TEXT PRIMARY KEY,
+                arxiv_ids TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(
+        query: str,
+        categories: Optional[Sequence[str]],
+        sort_by: Any,
+        sort_order: Any,
+        count: int,
+    ) -> str:
+        """
+        Cache key for a search. `query` should already be normalized.
+        Category order does not matter.
+        """
+        parts = {
+            "q": query,
+            "cats": sorted(categories or []),
+            "sort_by": str(getattr(sort_by, "value", sort_by)),
+            "sort_order": str(getattr(sort_order, "value", sort_order)),
+            "n": count,
+        }
+        raw = json.dumps(parts, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[List[Paper], bool]]:
+        """
+        Return (papers, is_stale) for a cached query, or None on a miss.
+        A query whose papers are no longer all stored is treated as a miss.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT arxiv_ids, fetched_at FROM queries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            ids = json.loads(row[0])
+            papers = self._get_papers_locked(ids)
+
+        if len(papers) != len(ids):
+            return None
+
+        is_stale = (time.time() - row[1]) > self.ttl_seconds
+        return papers, is_stale
+
+    def put(self, key: str, papers: List[Paper]):
+        now = time.time()
+        ids = [p.arxiv_id for p in papers if p.arxiv_id]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO papers (arxiv_id, data, updated_at) VALUES (?, ?, ?)",
+                [(p.arxiv_id, p.to_json(), now) for p in papers if p.arxiv_id],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO queries (key, arxiv_ids, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(ids), now),
+            )
+            self._db.commit()
+
+    def get_papers(self, arxiv_ids: Sequence[str]) -> List[Paper]:
+        """
+        Fetch stored papers by id, preserving the given order and skipping unknown ids.
+        """
+        with self._lock:
+            return self._get_papers_locked(arxiv_ids)
+
+    def _get_papers_locked(self, arxiv_ids: Sequence[str]) -> List[Paper]:
+        if not arxiv_ids:
+            return []
+        placeholders = ",".join("?" for _ in arxiv_ids)
+        rows = self._db.execute(
+            f"SELECT arxiv_id, data FROM papers WHERE arxiv_id IN ({placeholders})",
+            list(arxiv_ids),
+        ).fetchall()
+        by_id = {aid: data for aid, data in rows}
+        return [Paper.from_json(by_id[a]) for a in arxiv_ids if a in by_id]
+
+    def clear(self):
+        with self._lock:
+            self._db.executescript("DELETE FROM queries; DELETE FROM papers;")
+            self._db.commit()
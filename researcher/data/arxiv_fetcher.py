@@ -1,13 +1,91 @@
+import json
 import time
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 import arxiv
 
+from config import (
+    ARXIV_CACHE_ENABLED,
+    ARXIV_CACHE_PATH,
+    ARXIV_CACHE_TTL_SECONDS,
+    ARXIV_CACHE_STALE_WHILE_REVALIDATE,
+)
+from researcher.data.arxiv_cache import ArxivCache
 from researcher.pipelines.semantic_reranker import rerank_papers_by_semantics
 from researcher.models.paper import Paper
 from researcher.pipelines.query_expander import expand_query
 
+# arXiv asks API users to make no more than one request every three seconds.
+ARXIV_MIN_INTERVAL_SECONDS = 3.0
+MAX_FETCH_WORKERS = 6
+
+
+# --- Rate limiting & shared client ---
+class _RateLimiter:
+    """
+    Thread-safe limiter that spaces request *starts* at least `min_interval`
+    seconds apart across all threads. Requests still overlap in flight, so
+    slow responses don't hold up the next query.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+_rate_limiter = _RateLimiter(ARXIV_MIN_INTERVAL_SECONDS)
+_client: Optional[arxiv.Client] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> arxiv.Client:
+    """
+    Shared arXiv client. Its own per-client delay is disabled because request
+    spacing is enforced globally by `_rate_limiter`.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = arxiv.Client(num_retries=1, delay_seconds=0)  # arxiv lib has internal attempts but we still wrap externally
+        return _client
+
+
+# --- Local result cache ---
+_cache: Optional[ArxivCache] = None
+_cache_lock = threading.Lock()
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="arxiv-refresh")
+_refreshing: set = set()
+_refresh_lock = threading.Lock()
+
+
+def _get_cache() -> Optional[ArxivCache]:
+    """
+    Shared arXiv result cache, or None when disabled via ARXIV_CACHE_ENABLED=0.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None and ARXIV_CACHE_ENABLED:
+            try:
+                _cache = ArxivCache(ARXIV_CACHE_PATH, ttl_seconds=ARXIV_CACHE_TTL_SECONDS)
+            except Exception as e:
+                print(f"[arxiv_fetcher] Cache unavailable, continuing without it: {e}")
+                return None
+        return _cache
+
+
 # --- Helpers ---
 def _normalize_query(q: str) -> str:
     """
@@ -32,6 +110,36 @@ def _extract_arxiv_id(entry_id: str) -> Optional[str]:
     return match.group(1) if match else None
 
 
+def _format_date(dt) -> str:
+    return dt.strftime("%Y-%m-%d") if dt and hasattr(dt, "strftime") else ""
+
+
+def _paper_from_result(res) -> Paper:
+    """
+    Convert an arxiv.Result into a slim Paper. Only plain values are copied,
+    so the Result object graph (links, author objects, ...) can be freed.
+    """
+    extras = {
+        "primary_category": getattr(res, "primary_category", None),
+        "categories": list(getattr(res, "categories", None) or []),
+        "doi": getattr(res, "doi", None),
+        "journal_ref": getattr(res, "journal_ref", None),
+        "comment": getattr(res, "comment", None),
+        "updated": _format_date(getattr(res, "updated", None)),
+    }
+    extras = {k: v for k, v in extras.items() if v}
+
+    return Paper(
+        title=(getattr(res, "title", "") or "").strip(),
+        summary=(getattr(res, "summary", "") or "").strip(),
+        authors=[a.name for a in getattr(res, "authors", [])],
+        published=_format_date(getattr(res, "published", None)),
+        pdf_url=getattr(res, "pdf_url", None) or None,
+        arxiv_id=_extract_arxiv_id(getattr(res, "entry_id", "") or ""),
+        extras_json=json.dumps(extras, separators=(",", ":")) if extras else "",
+    )
+
+
 # --- Core fetcher ---
 def fetch_arxiv_candidates(
     query: str,
@@ -41,6 +149,8 @@ def fetch_arxiv_candidates(
     categories: Optional[List[str]] = None,
     sort_by: arxiv.SortCriterion = arxiv.SortCriterion.Relevance,
     sort_order: arxiv.SortOrder = arxiv.SortOrder.Descending,
+    client: Optional[arxiv.Client] = None,
+    use_cache: bool = True,
 ) -> List[Paper]:
     """
     Fetch candidate papers from arXiv based on a user query.
@@ -50,6 +160,11 @@ def fetch_arxiv_candidates(
     - This function intentionally returns a larger candidate set (default 25)
       so that later semantic reranking can pick the best ones.
     - `categories` is optional; if provided, it will restrict the query.
+    - `client` defaults to the shared client; every attempt waits on the
+      global rate limiter, so this is safe to call from several threads.
+    - Results are cached locally (see `ArxivCache`). Fresh hits skip the
+      network; stale hits are returned immediately and refreshed in the
+      background. Pass `use_cache=False` to force a network fetch.
     """
 
     query = _normalize_query(query)
@@ -63,6 +178,51 @@ def fetch_arxiv_candidates(
     else:
         full_query = query
 
+    fetch_kwargs = dict(
+        full_query=full_query,
+        candidate_count=candidate_count,
+        retry_attempts=retry_attempts,
+        pause_seconds=pause_seconds,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        client=client,
+    )
+
+    cache = _get_cache() if use_cache else None
+    if cache is None:
+        return _fetch_from_arxiv(**fetch_kwargs)
+
+    key = ArxivCache.make_key(query, categories, sort_by, sort_order, candidate_count)
+    hit = cache.get(key)
+    if hit is not None:
+        papers, is_stale = hit
+        if not is_stale:
+            return papers
+        if ARXIV_CACHE_STALE_WHILE_REVALIDATE:
+            # serve stale results now, refresh in the background
+            _schedule_refresh(key, fetch_kwargs)
+            return papers
+
+    papers = _fetch_from_arxiv(**fetch_kwargs)
+    if papers:
+        cache.put(key, papers)
+    return papers
+
+
+def _fetch_from_arxiv(
+    full_query: str,
+    candidate_count: int,
+    retry_attempts: int,
+    pause_seconds: float,
+    sort_by: arxiv.SortCriterion,
+    sort_order: arxiv.SortOrder,
+    client: Optional[arxiv.Client] = None,
+) -> List[Paper]:
+    """
+    Run one arXiv search over the network, with retries and rate limiting.
+    """
+    client = client or _get_client()
+
     attempt = 0
     while attempt < retry_attempts:
         try:
@@ -73,28 +233,11 @@ def fetch_arxiv_candidates(
                 sort_order=sort_order,
             )
 
-            client = arxiv.Client(num_retries=1)  # arxiv lib has internal attempts but we still wrap externally
+            _rate_limiter.wait()
             papers: List[Paper] = []
 
             for res in client.results(search):
-                arxiv_id = _extract_arxiv_id(getattr(res, "entry_id", "") or "")
-                pdf_url = getattr(res, "pdf_url", None) or None
-
-                published_dt = getattr(res, "published", None)
-                if published_dt and hasattr(published_dt, "strftime"):
-                    published_str = published_dt.strftime("%Y-%m-%d")
-                else:
-                    published_str = ""
-                paper = Paper(
-                    title=getattr(res, "title", "").strip(),
-                    summary=(getattr(res, "summary", "") or "").strip(),
-                    authors=[a.name for a in getattr(res, "authors", [])],
-                    published=published_str,
-                    pdf_url=pdf_url,
-                    arxiv_id=arxiv_id,
-                    raw_entry=res.__dict__ if hasattr(res, "__dict__") else {},
-                )
-                papers.append(paper)
+                papers.append(_paper_from_result(res))
 
             return papers
 
@@ -112,6 +255,68 @@ def fetch_arxiv_candidates(
     return []  # fallback
 
 
+def _schedule_refresh(key: str, fetch_kwargs: dict):
+    """
+    Re-fetch a stale query in the background. At most one refresh per key
+    is in flight at a time.
+    """
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def _refresh():
+        try:
+            papers = _fetch_from_arxiv(**fetch_kwargs)
+            cache = _get_cache()
+            if papers and cache is not None:
+                cache.put(key, papers)
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(key)
+
+    _refresh_pool.submit(_refresh)
+
+
+def fetch_candidates_concurrently(
+    queries: List[str],
+    candidate_count: int = 25,
+    categories: Optional[List[str]] = None,
+    max_workers: int = MAX_FETCH_WORKERS,
+    client: Optional[arxiv.Client] = None,
+) -> Iterator[Tuple[str, List[Paper]]]:
+    """
+    Fetch candidates for several queries in parallel.
+    Yields (query, papers) pairs in completion order, so callers can merge
+    results as they arrive. Total wall time is bounded by the slowest query
+    (plus the rate limiter's spacing between request starts).
+    """
+    if not queries:
+        return
+
+    client = client or _get_client()
+    workers = max(1, min(max_workers, len(queries)))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arxiv") as pool:
+        futures = {
+            pool.submit(
+                fetch_arxiv_candidates,
+                query=q,
+                candidate_count=candidate_count,
+                categories=categories,
+                client=client,
+            ): q
+            for q in queries
+        }
+        for future in as_completed(futures):
+            q = futures[future]
+            try:
+                yield q, future.result()
+            except Exception as exc:
+                print(f"[arxiv_fetcher] Query failed: {q!r}: {exc}")
+                yield q, []
+
+
 # --- Small convenience wrapper used by higher-level API ---
 def search_papers(
     query: str,
@@ -134,29 +339,30 @@ def search_papers(
     for q in expanded_queries:
         print(" -", q)
 
-    all_candidates: List[Paper] = []
+    # --- 2. Fetch candidates concurrently ---
+    by_query = dict(fetch_candidates_concurrently(
+        expanded_queries,
+        candidate_count=candidates,
+        categories=categories,
+    ))
 
-    # --- 2. Fetch candidates for each expanded query ---
+    # --- 3. Merge + deduplicate by arXiv ID in query order, not arrival order,
+    # so the same query always gives the reranker the same candidates ---
+    unique = {}
+    total_fetched = 0
     for q in expanded_queries:
-        fetched = fetch_arxiv_candidates(
-            query=q,
-            candidate_count=candidates,
-            categories=categories
-        )
-        all_candidates.extend(fetched)
-
-    if not all_candidates:
-        return []
+        fetched = by_query.get(q, [])
+        total_fetched += len(fetched)
+        for p in fetched:
+            if p.arxiv_id:
+                unique.setdefault(p.arxiv_id, p)
 
-    # --- 3. Deduplicate by arXiv ID ---
-    unique = {}
-    for p in all_candidates:
-        if p.arxiv_id:
-            unique[p.arxiv_id] = p
+    if not unique:
+        return []
 
     deduped_list = list(unique.values())
 
-    print(f"\n[Candidates before dedupe]: {len(all_candidates)}")
+    print(f"\n[Candidates before dedupe]: {total_fetched}")
     print(f"[Candidates after dedupe]:  {len(deduped_list)}")
 
     # --- 4. Semantic re-ranking ---
@@ -0,0 +1,213 @@
+# researcher/data/bm25_index.py
+"""
+Okapi BM25 over chunk text, plus reciprocal-rank fusion for hybrid retrieval.
+
+Postings are kept as CSR numpy arrays (term -> rows, term frequencies) and
+saved with np.savez, so a large index loads as a handful of flat arrays.
+Chunks added after loading go to a small in-memory overlay until `save`.
+"""
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Words, plus identifiers such as "bge-small-en-v1.5", "GPT-4", "ResNet_50"
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how in is it its of on or "
+    "that the their this to was what when where which who why with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased terms. Compound identifiers are kept whole *and* split into
+    their parts, so "bge-small" matches both "bge-small" and "bge".
+    """
+    terms = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if tok in STOPWORDS:
+            continue
+        terms.append(tok)
+        if any(c in tok for c in "-_."):
+            terms.extend(p for p in re.split(r"[-_.]", tok) if p and p not in STOPWORDS)
+    return terms
+
+
+def is_lexical_query(query: str) -> bool:
+    """
+    Heuristic for queries that are better served by exact term matching
+    alone: quoted phrases, or a few tokens that all look like identifiers,
+    names with digits, or math (model names, datasets, equations).
+    """
+    query = query.strip()
+    if not query:
+        return False
+    if query.startswith('"') and query.endswith('"') and len(query) > 2:
+        return True
+    if any(c in query for c in "=^\\$"):
+        return True
+    words = query.split()
+    if len(words) > 4:
+        return False
+    return all(
+        any(ch.isdigit() for ch in w)
+        or any(ch in w for ch in "-_")
+        or (w[:1].isalpha() and any(ch.isupper() for ch in w[1:]))
+        or (w.isupper() and len(w) > 1)
+        for w in words
+    )
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = 60, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank).
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] += 1.0 / (k + rank)
+    fused = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    return fused[:limit] if limit else fused
+
+
+class BM25Index:
+    """
+    Incremental BM25 index keyed by chunk id.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.chunk_ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._doc_len = np.zeros(0, dtype=np.int32)
+        self._deleted = np.zeros(0, dtype=bool)
+
+        # base postings (CSR) + overlay for rows added since load
+        self._vocab: Dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.int32)
+        self._extra: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return int((~self._deleted).sum())
+
+    def __contains__(self, chunk_id: str) -> bool:
+        row = self._row_of.get(chunk_id)
+        return row is not None and not self._deleted[row]
+
+    # ---------- updates ----------
+    def add(self, chunk_ids: List[str], texts: List[str]):
+        new_lens = []
+        for chunk_id, text in zip(chunk_ids, texts):
+            if chunk_id in self:
+                self.remove([chunk_id])
+            row = len(self.chunk_ids)
+            self.chunk_ids.append(chunk_id)
+            self._row_of[chunk_id] = row
+            terms = tokenize(text)
+            new_lens.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._extra[term].append((row, tf))
+        self._doc_len = np.concatenate([self._doc_len, np.asarray(new_lens, dtype=np.int32)])
+        self._deleted = np.concatenate([self._deleted, np.zeros(len(new_lens), dtype=bool)])
+
+    def remove(self, chunk_ids: List[str]):
+        for chunk_id in chunk_ids:
+            row = self._row_of.pop(chunk_id, None)
+            if row is not None:
+                self._deleted[row] = True
+
+    # ---------- search ----------
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        rows, tfs = [], []
+        i = self._vocab.get(term)
+        if i is not None:
+            a, z = self._offsets[i], self._offsets[i + 1]
+            rows.append(self._rows[a:z])
+            tfs.append(self._tfs[a:z])
+        extra = self._extra.get(term)
+        if extra:
+            arr = np.asarray(extra, dtype=np.int64)
+            rows.append(arr[:, 0])
+            tfs.append(arr[:, 1])
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        rows, tfs = np.concatenate(rows), np.concatenate(tfs)
+        live = ~self._deleted[rows]
+        return rows[live], tfs[live]
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-k (chunk_id, score) pairs for `query`, best first.
+        """
+        n_docs = len(self)
+        terms = set(tokenize(query))
+        if not n_docs or not terms:
+            return []
+
+        live_len = self._doc_len[~self._deleted]
+        avgdl = max(float(live_len.mean()), 1.0)
+        norm = self.k1 * (1 - self.b + self.b * self._doc_len / avgdl)
+        scores = np.zeros(len(self.chunk_ids), dtype=np.float64)
+        for term in terms:
+            rows, tfs = self._postings(term)
+            if not len(rows):
+                continue
+            idf = np.log(1 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + norm[rows])
+
+        hits = np.flatnonzero(scores > 0)
+        if not len(hits):
+            return []
+        top = hits[np.argsort(-scores[hits], kind="stable")[:k]]
+        return [(self.chunk_ids[r], float(scores[r])) for r in top]
+
+    # ---------- persistence ----------
+    def save(self, path: str):
+        """
+        Write live rows as compact CSR arrays (np.savez; no pickle).
+        """
+        live_rows = np.flatnonzero(~self._deleted)
+        new_row = np.full(len(self.chunk_ids), -1, dtype=np.int64)
+        new_row[live_rows] = np.arange(len(live_rows))
+
+        terms = sorted(set(self._vocab) | set(self._extra))
+        offsets = [0]
+        rows_out, tfs_out = [], []
+        for term in terms:
+            rows, tfs = self._postings(term)
+            rows_out.append(new_row[rows])
+            tfs_out.append(tfs)
+            offsets.append(offsets[-1] + len(rows))
+
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                terms=np.array(terms, dtype=str),
+                offsets=np.asarray(offsets, dtype=np.int64),
+                rows=np.concatenate(rows_out).astype(np.int32) if rows_out else np.zeros(0, dtype=np.int32),
+                tfs=np.concatenate(tfs_out).astype(np.int32) if tfs_out else np.zeros(0, dtype=np.int32),
+                doc_len=self._doc_len[live_rows],
+                chunk_ids=np.array([self.chunk_ids[r] for r in live_rows], dtype=str),
+                params=np.array([self.k1, self.b]),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with np.load(path) as data:
+            k1, b = data["params"]
+            index = cls(k1=float(k1), b=float(b))
+            index._vocab = {str(t): i for i, t in enumerate(data["terms"])}
+            index._offsets = data["offsets"]
+            index._rows = data["rows"]
+            index._tfs = data["tfs"]
+            index._doc_len = data["doc_len"]
+            index.chunk_ids = [str(c) for c in data["chunk_ids"]]
+        index._row_of = {c: i for i, c in enumerate(index.chunk_ids)}
+        index._deleted = np.zeros(len(index.chunk_ids), dtype=bool)
+        return index
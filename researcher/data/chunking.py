@@ -0,0 +1,106 @@
+# researcher/data/chunking.py
+"""
+The one chunking stage shared by RAG indexing and document loading.
+
+Every chunk carries stable ids in its metadata:
+  content_hash  hash of the (normalized) chunk text — the same key the
+                embedding cache uses, so unchanged text is never re-embedded
+  chunk_id      content_hash scoped to its document, page and offset — unique
+                within an index and identical across re-ingests of the same file
+
+Bulk ingestion runs load + split per file across processes with
+`map_ordered` (see data/ingest.py).
+"""
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from researcher.llm.embedding_cache import content_key
+
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+SEPARATORS = ["\n\n", "\n", ".", " ", ""]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@lru_cache(maxsize=8)
+def get_splitter(chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP) -> RecursiveCharacterTextSplitter:
+    """
+    Shared splitter instance per configuration (splitters are stateless).
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=SEPARATORS,
+        add_start_index=True,
+    )
+
+
+def content_hash(text: str) -> str:
+    return content_key(text)
+
+
+def chunk_id(scope: str, chunk: Document) -> str:
+    """
+    Stable id: the chunk's content hash within its document, page and offset.
+    """
+    meta = chunk.metadata
+    raw = f"{scope}:{meta.get('page', '')}:{meta.get('start_index', '')}:{meta['content_hash']}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def split(
+    documents: List[Document],
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    scope: Optional[str] = None,
+) -> List[Document]:
+    """
+    Split documents into chunks and attach content_hash / chunk_id metadata.
+
+    Args:
+        documents (List[Document]): Pages or whole documents.
+        chunk_size (int): Max characters per chunk.
+        chunk_overlap (int): Characters shared by neighbouring chunks.
+        scope (str, optional): Id namespace (e.g. the document hash). Defaults
+            to each document's "doc_hash" or "source" metadata.
+
+    Returns:
+        List[Document]: Chunks in document order.
+    """
+    chunks = get_splitter(chunk_size, chunk_overlap).split_documents(documents)
+    for chunk in chunks:
+        meta = chunk.metadata
+        meta["content_hash"] = content_hash(chunk.page_content)
+        meta["chunk_id"] = chunk_id(scope or meta.get("doc_hash") or str(meta.get("source", "")), chunk)
+    return chunks
+
+
+def map_ordered(fn: Callable[[T], R], items: Iterable[T], workers: int, in_flight: Optional[int] = None) -> Iterator[R]:
+    """
+    `map(fn, items)` across a process pool: results come out in input order,
+    items are consumed lazily and at most `in_flight` (default 2 * workers)
+    tasks are pending, so memory stays flat. `fn` must be picklable
+    (a top-level function). workers=1 runs in-process.
+    """
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    in_flight = in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,207 @@
+# researcher/data/faiss_store.py
+"""
+Pickle-free on-disk format for LangChain FAISS vectorstores.
+
+A snapshot directory holds:
+  index.faiss      the FAISS index (faiss.write_index); memory-mapped on load
+  ids.npy          row -> chunk id, fixed-width strings; memory-mapped on load
+  docstore.sqlite  chunk id -> text + JSON metadata, read only for search hits
+
+Memory-mapped snapshots are read-only and shared through the OS page cache,
+so several processes can serve one index without each holding a copy.
+Call `make_writable` before adding to or deleting from a loaded store.
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Union
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_community.vectorstores import FAISS
+
+INDEX_FILE = "index.faiss"
+IDS_FILE = "ids.npy"
+DOCSTORE_FILE = "docstore.sqlite"
+
+
+class SQLiteDocstore(Docstore, AddableMixin):
+    """
+    LangChain docstore backed by a SQLite file.
+
+    Changes are buffered in memory and only written by `write_to`, so the
+    file on disk always matches the snapshot it belongs to.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._conn = None
+        if path and os.path.exists(path):
+            self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Document] = {}
+        self._deleted = set()
+
+    def search(self, search: str) -> Union[str, Document]:
+        if search in self._pending:
+            return self._pending[search]
+        if search in self._deleted or self._conn is None:
+            return f"ID {search} not found."
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, metadata FROM chunks WHERE id = ?", (search,)
+            ).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return Document(id=search, page_content=row[0], metadata=json.loads(row[1]))
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        for doc_id, doc in texts.items():
+            self._pending[doc_id] = doc
+            self._deleted.discard(doc_id)
+
+    def delete(self, ids: List) -> None:
+        for doc_id in ids:
+            self._pending.pop(doc_id, None)
+            self._deleted.add(doc_id)
+
+    def write_to(self, path: str, keep_ids: Optional[List[str]] = None):
+        """
+        Write this docstore (base file + buffered changes) to a new SQLite file.
+        With `keep_ids`, rows not in it are dropped.
+        """
+        out = sqlite3.connect(path)
+        try:
+            if self._conn is not None:
+                with self._lock:
+                    self._conn.backup(out)
+            out.execute("CREATE TABLE IF NOT EXISTS chunks (id TEXT PRIMARY KEY, text TEXT, metadata TEXT)")
+            with out:
+                out.executemany("DELETE FROM chunks WHERE id = ?", [(i,) for i in self._deleted])
+                out.executemany(
+                    "INSERT OR REPLACE INTO chunks (id, text, metadata) VALUES (?, ?, ?)",
+                    [(i, d.page_content, json.dumps(d.metadata)) for i, d in self._pending.items()],
+                )
+                if keep_ids is not None:
+                    out.execute("CREATE TEMP TABLE keep (id TEXT PRIMARY KEY)")
+                    out.executemany("INSERT OR IGNORE INTO keep VALUES (?)", [(i,) for i in keep_ids])
+                    out.execute("DELETE FROM chunks WHERE id NOT IN (SELECT id FROM keep)")
+            out.execute("VACUUM")
+        finally:
+            out.close()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class RowIds(MutableMapping):
+    """
+    FAISS row -> chunk id mapping over a (memory-mapped) string array.
+    Rows added or changed after loading live in a small overlay dict.
+    """
+
+    def __init__(self, base: np.ndarray):
+        self._base = base
+        self._overlay: Dict[int, str] = {}
+        self._removed = set()
+
+    def __getitem__(self, pos: int) -> str:
+        if pos in self._overlay:
+            return self._overlay[pos]
+        if 0 <= pos < len(self._base) and pos not in self._removed:
+            return str(self._base[pos])
+        raise KeyError(pos)
+
+    def __setitem__(self, pos: int, doc_id: str):
+        self._overlay[pos] = doc_id
+        self._removed.discard(pos)
+
+    def __delitem__(self, pos: int):
+        if pos in self._overlay:
+            del self._overlay[pos]
+        elif 0 <= pos < len(self._base) and pos not in self._removed:
+            self._removed.add(pos)
+        else:
+            raise KeyError(pos)
+
+    def __iter__(self) -> Iterator[int]:
+        for pos in range(len(self._base)):
+            if pos not in self._removed or pos in self._overlay:
+                yield pos
+        for pos in sorted(self._overlay):
+            if pos >= len(self._base):
+                yield pos
+
+    def __len__(self) -> int:
+        extra = sum(1 for pos in self._overlay if pos >= len(self._base) or pos in self._removed)
+        return len(self._base) - len(self._removed) + extra
+
+
+def is_mmapped(vectorstore: FAISS) -> bool:
+    """
+    True while `vectorstore.index` is the read-only mapping made by `load_vectorstore`.
+    """
+    source = getattr(vectorstore, "_mmap_source", None)
+    return source is not None and source[0] is vectorstore.index
+
+
+def save_vectorstore(vectorstore: FAISS, path: str):
+    """
+    Write `vectorstore` as a snapshot directory at `path` (created if needed).
+    """
+    os.makedirs(path, exist_ok=True)
+    index = vectorstore.index
+    ids = [vectorstore.index_to_docstore_id[i] for i in range(index.ntotal)]
+
+    faiss.write_index(index, os.path.join(path, INDEX_FILE))
+    np.save(os.path.join(path, IDS_FILE), np.array(ids, dtype=str) if ids else np.array([], dtype="<U32"))
+
+    db_path = os.path.join(path, DOCSTORE_FILE)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    docstore = vectorstore.docstore
+    if not isinstance(docstore, SQLiteDocstore):
+        # e.g. the InMemoryDocstore of a freshly built FAISS store
+        copy = SQLiteDocstore()
+        copy.add({i: d for i in ids if isinstance(d := docstore.search(i), Document)})
+        docstore = copy
+    docstore.write_to(db_path, keep_ids=ids)
+
+
+def load_vectorstore(path: str, embedding, mmap: bool = True) -> FAISS:
+    """
+    Load a snapshot written by `save_vectorstore`. No pickle is involved.
+
+    With `mmap=True` the index and id map are memory-mapped read-only and
+    document text is read from SQLite only for search hits, so opening is
+    nearly free regardless of index size.
+    """
+    index_path = os.path.join(path, INDEX_FILE)
+    flags = faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY if mmap else 0
+    index = faiss.read_index(index_path, flags)
+    ids = np.load(os.path.join(path, IDS_FILE), mmap_mode="r" if mmap else None)
+
+    vectorstore = FAISS(
+        embedding_function=embedding,
+        index=index,
+        docstore=SQLiteDocstore(os.path.join(path, DOCSTORE_FILE)),
+        index_to_docstore_id=RowIds(ids),
+    )
+    vectorstore._mmap_source = (index, index_path) if mmap else None
+    return vectorstore
+
+
+def make_writable(vectorstore: FAISS):
+    """
+    Replace a memory-mapped (read-only) index with an in-memory copy.
+    Adding to a memory-mapped index would abort the process inside FAISS.
+    """
+    if is_mmapped(vectorstore):
+        vectorstore.index = faiss.read_index(vectorstore._mmap_source[1])
+        vectorstore._mmap_source = None
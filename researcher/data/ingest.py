@@ -0,0 +1,205 @@
+# researcher/data/ingest.py
+"""
+Bulk corpus ingestion into the RAG index.
+
+    python -m researcher.data.ingest papers/ notes/ --workers 8
+
+Files are loaded and chunked in worker processes (rag_loader.load_document +
+the shared chunking stage, run through chunking.map_ordered), embedded in large batches in the main process,
+and committed to the index one batch at a time. Every committed batch is a
+durable delta, so an interrupted run picks up where it stopped: files whose
+path, size and mtime are already in the index are skipped without loading.
+"""
+import argparse
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from researcher.data.chunking import map_ordered
+from researcher.data.rag_index import FAISS_DIR, ChunkedDocument, RAGIndexManager, chunk_source_document
+
+EXTENSIONS = (".pdf", ".txt", ".md", ".json")
+EMBED_BATCH_CHUNKS = 1024        # chunks per embedding call / index commit
+SNAPSHOT_EVERY_CHUNKS = 100_000  # compact deltas into a snapshot this often
+
+
+@dataclass
+class IngestStats:
+    files_seen: int = 0
+    files_skipped: int = 0
+    files_indexed: int = 0
+    files_failed: int = 0
+    chunks: int = 0
+    started: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.perf_counter() - self.started, 1e-9)
+
+    def line(self) -> str:
+        done = self.files_indexed + self.files_failed
+        return (
+            f"{done} docs, {self.chunks} chunks in {self.elapsed:.1f}s — "
+            f"{done / self.elapsed:.1f} docs/s, {self.chunks / self.elapsed:.1f} chunks/s "
+            f"(skipped {self.files_skipped}, failed {self.files_failed})"
+        )
+
+
+def iter_files(paths: Sequence[str], extensions: Sequence[str] = EXTENSIONS) -> Iterator[str]:
+    """
+    Files under `paths` (files or directories, walked recursively) with a supported extension.
+    """
+    extensions = tuple(e.lower() for e in extensions)
+    for path in paths:
+        if os.path.isfile(path):
+            if path.lower().endswith(extensions):
+                yield os.path.abspath(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.abspath(os.path.join(root, name))
+
+
+def _file_info(path: str) -> Dict[str, float]:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+def _load_and_chunk(path: str) -> Tuple[str, Optional[ChunkedDocument], Optional[str]]:
+    """Worker: load one file and chunk it. Returns (path, chunked, error)."""
+    from researcher.data.rag_loader import load_document
+
+    try:
+        info = _file_info(path)
+        documents = load_document(path)
+        return path, chunk_source_document(documents, source=path, **info), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def _indexed_files(manager: RAGIndexManager) -> Dict[str, Tuple[float, float]]:
+    """path -> (size, mtime) for every indexed file, including copies of indexed content."""
+    files = {}
+    for entry in manager.documents.values():
+        if entry.get("source"):
+            files[entry["source"]] = (entry.get("size"), entry.get("mtime"))
+        for path, info in entry.get("aliases", {}).items():
+            files[path] = (info.get("size"), info.get("mtime"))
+    return files
+
+
+def ingest(
+    paths: Sequence[str],
+    manager: Optional[RAGIndexManager] = None,
+    workers: Optional[int] = None,
+    batch_chunks: int = EMBED_BATCH_CHUNKS,
+    snapshot_every: int = SNAPSHOT_EVERY_CHUNKS,
+    extensions: Sequence[str] = EXTENSIONS,
+    log_every: float = 5.0,
+) -> IngestStats:
+    """
+    Ingest every supported file under `paths` into `manager` (default: FAISS_DIR).
+
+    Args:
+        paths: Files or directories.
+        manager: Target index.
+        workers: Loader/chunker processes (default: CPU count; 1 = in-process).
+        batch_chunks: Chunks per embedding call and index commit.
+        snapshot_every: Compact into a snapshot after this many new chunks.
+        extensions: File types to pick up.
+        log_every: Seconds between progress lines.
+
+    Returns:
+        IngestStats: Counts and throughput.
+    """
+    # Deltas are compacted by `snapshot_every`, not per document count
+    manager = manager or RAGIndexManager(FAISS_DIR, compact_after=10 ** 9)
+    workers = workers or os.cpu_count() or 1
+    stats = IngestStats(started=time.perf_counter())
+    indexed = _indexed_files(manager)
+
+    def todo() -> Iterator[str]:
+        for path in iter_files(paths, extensions):
+            stats.files_seen += 1
+            try:
+                info = _file_info(path)
+            except OSError as e:
+                # e.g. a dangling symlink, or a file removed during the walk
+                stats.files_failed += 1
+                print(f"[ingest] ✗ {path}: {e}")
+                continue
+            if indexed.get(path) == (info["size"], info["mtime"]):
+                stats.files_skipped += 1
+                continue
+            yield path
+
+    pending: List[ChunkedDocument] = []
+    pending_hashes = set()
+    pending_chunks = 0
+    since_snapshot = 0
+    last_log = time.perf_counter()
+
+    def commit():
+        nonlocal pending, pending_hashes, pending_chunks, since_snapshot
+        if pending:
+            since_snapshot += manager.add_chunked(pending)
+            pending, pending_hashes, pending_chunks = [], set(), 0
+        if since_snapshot >= snapshot_every:
+            manager.save()
+            since_snapshot = 0
+
+    # Files are loaded and chunked in parallel, in order, a bounded number at a time
+    for path, item, error in map_ordered(_load_and_chunk, todo(), workers, in_flight=4 * workers):
+        if error is not None:
+            stats.files_failed += 1
+            print(f"[ingest] ✗ {path}: {error}")
+            continue
+        # Content already indexed (a touched file, or a copy under another
+        # path): nothing to embed, but add_chunked records its file info so
+        # later runs skip it without loading
+        pending.append(item)
+        if item.doc_hash in manager.documents or item.doc_hash in pending_hashes:
+            stats.files_skipped += 1
+        else:
+            pending_hashes.add(item.doc_hash)
+            stats.files_indexed += 1
+            stats.chunks += len(item.chunks)
+            pending_chunks += len(item.chunks)
+        if pending_chunks >= batch_chunks:
+            commit()
+        if time.perf_counter() - last_log >= log_every:
+            print(f"[ingest] {stats.line()}")
+            last_log = time.perf_counter()
+
+    commit()
+    manager.save()
+    print(f"[ingest] Done: {stats.line()}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Ingest a directory tree into the RAG index")
+    parser.add_argument("paths", nargs="+", help="files or directories to ingest")
+    parser.add_argument("--index-dir", default=FAISS_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="loader processes (default: CPU count)")
+    parser.add_argument("--batch-chunks", type=int, default=EMBED_BATCH_CHUNKS)
+    parser.add_argument("--snapshot-every", type=int, default=SNAPSHOT_EVERY_CHUNKS)
+    parser.add_argument("--extensions", nargs="+", default=list(EXTENSIONS))
+    args = parser.parse_args(argv)
+
+    manager = RAGIndexManager(args.index_dir, compact_after=10 ** 9)
+    ingest(
+        args.paths,
+        manager=manager,
+        workers=args.workers,
+        batch_chunks=args.batch_chunks,
+        snapshot_every=args.snapshot_every,
+        extensions=args.extensions,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,117 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
 import fitz # PyMuPDF
 
-def extract_text_from_pdf(pdf_path:str) -> str:
+# A path on disk, raw PDF bytes, or a binary file-like object (e.g. a Streamlit upload)
+PdfSource = Union[str, os.PathLike, bytes, bytearray, BinaryIO]
+
+# Documents with at least this many pages are split across processes by default
+PARALLEL_PAGE_THRESHOLD = 64
+
+
+class PDFExtractionError(Exception):
+    """Raised when text cannot be extracted from a PDF."""
+
+
+class PDFNotFoundError(PDFExtractionError, FileNotFoundError):
+    """Raised when the PDF path does not exist."""
+
+
+def _read_source(source: PdfSource) -> Union[str, bytes]:
+    """
+    Normalize a source to something picklable: a path string or raw bytes.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        return source.read()
+
+    path = os.fspath(source)
+    if not os.path.exists(path):
+        raise PDFNotFoundError(f"The file {path} was not found.")
+    return path
+
+
+def _open(source: Union[str, bytes]) -> fitz.Document:
+    try:
+        if isinstance(source, bytes):
+            return fitz.open(stream=source, filetype="pdf")
+        return fitz.open(source)
+    except Exception as e:
+        raise PDFExtractionError(f"Could not open PDF: {e}") from e
+
+
+def iter_pages(source: PdfSource, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """
+    Yields the text of each page in [start, stop), one page at a time.
+
+    Args:
+        source (PdfSource): Path, bytes, or binary file-like object.
+        start (int): First page index (0-based).
+        stop (int, optional): Page index to stop before (default: last page).
+
+    Yields:
+        str: Stripped text of each page.
+
+    Raises:
+        PDFNotFoundError: If a path is given and does not exist.
+        PDFExtractionError: If the PDF cannot be opened or a page cannot be read.
+    """
+    doc = _open(_read_source(source))
+    try:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for i in range(start, stop):
+            try:
+                yield doc.load_page(i).get_text().strip()
+            except Exception as e:
+                raise PDFExtractionError(f"Failed to read page {i + 1}: {e}") from e
+    finally:
+        doc.close()
+
+
+def _extract_range(args: Tuple[Union[str, bytes], int, int]) -> List[str]:
+    """Worker entry point: extract one page range (must be top-level to pickle)."""
+    source, start, stop = args
+    return list(iter_pages(source, start, stop))
+
+
+def extract_text_from_pdf(pdf: PdfSource, workers: Optional[int] = None) -> str:
     """
     Extracts and concatenates text from a PDF file.
 
+    Large documents (>= PARALLEL_PAGE_THRESHOLD pages) are split into page
+    ranges and extracted in a process pool, one range per core.
+
     Args:
-        pdf_path (str): The path to the PDF file.
+        pdf (PdfSource): Path to the PDF, its raw bytes, or a binary file-like object.
+        workers (int, optional): Number of processes. Defaults to the CPU count
+            for large documents and 1 otherwise.
 
     Returns:
-        str: The extracted text from the PDF.
+        str: The extracted text from the PDF, one page per line block.
+
+    Raises:
+        PDFNotFoundError: If a path is given and does not exist.
+        PDFExtractionError: If the PDF cannot be opened or read.
     """
-    try:
-       doc = fitz.open(pdf_path)
-       full_text = ""
-
-         # Iterate through each page and extract text
-       for page in doc:
-           text = page.get_text().strip()
-           full_text += text + "\n"
-
-       doc.close()
-       return full_text.strip()
-    except FileNotFoundError:
-       return f"Error: The file {pdf_path} was not found."
-    except Exception as e:
-       return f"An error occurred while extracting text from the PDF: {str(e)}"
-    
+    source = _read_source(pdf)
+
+    doc = _open(source)
+    page_count = doc.page_count
+    doc.close()
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if page_count >= PARALLEL_PAGE_THRESHOLD else 1
+    workers = max(1, min(workers, page_count or 1))
+
+    if workers == 1:
+        pages = list(iter_pages(source))
+    else:
+        step = -(-page_count // workers)  # ceil division
+        ranges = [(source, a, min(a + step, page_count)) for a in range(0, page_count, step)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pages = [text for chunk in pool.map(_extract_range, ranges) for text in chunk]
+
+    return "\n".join(pages).strip()
@@ -1,44 +1,65 @@
 # phase_5_rag_based_agent/rag_index.py
 
 # ------------ Imports and Constants ------------
+import glob
+import hashlib
+import json
 import os
-from typing import List
+import shutil
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.embeddings import Embeddings
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
+
+from config import LOCAL_EMBEDDING_MODEL, RAG_RETRIEVAL_MODE, RAG_RRF_K, RAG_HYBRID_CANDIDATES
+from researcher.llm import embedding_registry
+from researcher.llm.embeddings import get_cache as get_embedding_cache
+from researcher.data import ann_index, chunking
+from researcher.data.ann_index import ANNConfig
+from researcher.data.bm25_index import BM25Index, is_lexical_query, reciprocal_rank_fusion
+from researcher.data.faiss_store import (
+    DOCSTORE_FILE,
+    INDEX_FILE,
+    SQLiteDocstore,
+    load_vectorstore,
+    make_writable,
+    save_vectorstore,
+)
 
 # Constants
-CHUNK_SIZE = 500
-CHUNK_OVERLAP = 50
-EMBEDDING_MODEL_NAME = "BAAI/bge-small-en-v1.5"
+CHUNK_SIZE = chunking.CHUNK_SIZE
+CHUNK_OVERLAP = chunking.CHUNK_OVERLAP
+EMBEDDING_MODEL_NAME = LOCAL_EMBEDDING_MODEL
 FAISS_DIR = "phase_5_rag_based_agent/vectorstore"
-INDEX_FAISS_PATH = os.path.join(FAISS_DIR, "index.faiss")
-INDEX_METADATA_PATH = os.path.join(FAISS_DIR, "index.pkl")
+INDEX_FAISS_PATH = os.path.join(FAISS_DIR, INDEX_FILE)
+CURRENT_FILE = "CURRENT"
+SNAPSHOT_PREFIX = "snapshot-"
+MANIFEST_FILE = "manifest.json"
+BM25_FILE = "bm25.npz"
+RETRIEVAL_MODES = ("auto", "dense", "lexical", "hybrid")
+DELTA_DIR = "deltas"
+COMPACT_AFTER_DELTAS = 20
 
 
 # ------------ Chunk Documents ------------
 def chunk_documents(documents: List[Document]) -> List[Document]:
     """
-    Splits documents into smaller chunks using recursive splitting.
+    Splits documents into smaller chunks using recursive splitting
+    (the shared settings and chunk ids of `chunking.split`).
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=CHUNK_SIZE,
-        chunk_overlap=CHUNK_OVERLAP,
-        separators=["\n\n", "\n", ".", " ", ""]
-    )
-    return splitter.split_documents(documents)
+    return chunking.split(documents, CHUNK_SIZE, CHUNK_OVERLAP)
 
 
 # ------------ Embedding Model Loader ------------
 def get_embedding_model():
     """
-    Load the consistent HuggingFace embedding model.
+    The shared HuggingFace embedding model (loaded once per process).
     """
-    return HuggingFaceEmbeddings(
-        model_name=EMBEDDING_MODEL_NAME,
-        model_kwargs={"device": "cpu"}  # Use "cuda" if GPU is available
-    )
+    return embedding_registry.get_embedding_model(EMBEDDING_MODEL_NAME)
 
 
 # ------------ Build and Save FAISS Index ------------
@@ -46,26 +67,540 @@ def build_and_save_faiss_index(chunks: List[Document]):
     """
     Create and save a FAISS vectorstore from document chunks.
     """
-    os.makedirs(FAISS_DIR, exist_ok=True)
     embedding_model = get_embedding_model()
     vectorstore = FAISS.from_documents(chunks, embedding_model)
-    vectorstore.save_local(FAISS_DIR)
+    save_vectorstore(vectorstore, FAISS_DIR)
     print(f"[✔] FAISS index saved at: {FAISS_DIR}")
 
 
 # ------------ Load FAISS Index ------------
 def load_faiss_index():
     """
-    Load FAISS vectorstore using the same embedding model.
+    Load FAISS vectorstore using the same embedding model (memory-mapped, read-only).
+    Reads the index manager's current snapshot if there is one.
     """
     try:
         embedding_model = get_embedding_model()
-        return FAISS.load_local(
-            FAISS_DIR,
-            embeddings=embedding_model,
-            allow_dangerous_deserialization=True
-        )
+        return load_vectorstore(_current_snapshot_dir(FAISS_DIR) or FAISS_DIR, embedding_model)
     except Exception as e:
         print(f"[!] Error loading FAISS index: {e}")
         return None
 
+
+# ------------ Incremental Index Manager ------------
+class _SharedEmbeddings(Embeddings):
+    """
+    Stand-in for the shared model that loads it only when a vector is needed,
+    so opening an index (or answering lexical queries) never loads the model.
+    """
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return get_embedding_model().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return get_embedding_model().embed_query(text)
+
+
+def document_hash(documents: List[Document]) -> str:
+    """
+    Content hash of one source document (all of its pages, in order).
+    """
+    h = hashlib.sha256()
+    for doc in documents:
+        h.update(doc.page_content.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+@dataclass
+class ChunkedDocument:
+    """One source document, hashed and chunked, ready for `RAGIndexManager.add_chunked`."""
+    doc_hash: str
+    source: Optional[str]
+    chunks: List[Document]
+    info: Dict[str, Any] = field(default_factory=dict)  # extra manifest fields (e.g. file mtime)
+
+
+def chunk_source_document(documents: List[Document], source: Optional[str] = None, **info) -> ChunkedDocument:
+    """
+    Hash and chunk one source document. Pure function, safe to run in worker processes.
+    """
+    doc_hash = document_hash(documents)
+    chunks = chunking.split(documents, CHUNK_SIZE, CHUNK_OVERLAP, scope=doc_hash)
+    for c in chunks:
+        c.metadata["doc_hash"] = doc_hash
+    return ChunkedDocument(doc_hash, source, chunks, info)
+
+
+def _write_json_atomic(path: str, data: Any):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _current_snapshot_dir(index_dir: str) -> Optional[str]:
+    path = os.path.join(index_dir, CURRENT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return os.path.join(index_dir, json.load(f)["snapshot"])
+
+
+class RAGIndexManager:
+    """
+    Keeps one FAISS vectorstore hot in memory and updates it incrementally.
+
+    - Documents are identified by content hash; re-adding a known document
+      is a no-op, so only new chunks are ever embedded.
+    - Every add/remove is persisted as a small delta (chunk texts, metadata
+      and vectors) instead of rewriting the whole index.
+    - After COMPACT_AFTER_DELTAS deltas (or on `save()`), the in-memory
+      store is written as a new base snapshot and the deltas are dropped.
+
+    On disk (index_dir):
+      CURRENT                   name of the live snapshot, switched atomically
+      snapshot-NNNNNN/          index.faiss, ids.npy, docstore.sqlite (see
+                                faiss_store), bm25.npz and manifest.json
+      deltas/NNNNNN.json|.npy   changes after the snapshot, replayed on load
+
+    Snapshots are never modified once written, so with `mmap=True` the
+    index is memory-mapped and shared with other processes reading the
+    same directory; it is copied into memory only on the first write.
+
+    The index starts as exact (flat) search. With an approximate
+    `ann_config.index_type`, it is rebuilt as IVF/HNSW/PQ once it holds
+    `ann_config.min_vectors` vectors; later adds go straight into it.
+    """
+
+    def __init__(
+        self,
+        index_dir: str = FAISS_DIR,
+        embedding_model=None,
+        embedding_cache=None,
+        ann_config: Optional[ANNConfig] = None,
+        mmap: bool = True,
+        compact_after: Optional[int] = None,
+    ):
+        self.index_dir = index_dir
+        self._embedding_model = embedding_model
+        # Cached vectors are only valid for the shared model they were made with
+        if embedding_cache is None and embedding_model is None:
+            embedding_cache = get_embedding_cache()
+        self.embedding_cache = embedding_cache
+        self.ann_config = ann_config or ANNConfig.from_config()
+        self.mmap = mmap
+        self.compact_after = compact_after
+        self._lock = threading.RLock()
+
+        self.vectorstore: Optional[FAISS] = None
+        self.bm25 = BM25Index()
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self._snapshot: Optional[str] = None
+        self._delta_seq = 0
+        self._deltas_since_snapshot = 0
+
+        self._load()
+
+    # ---------- properties ----------
+    @property
+    def embedding_model(self):
+        if self._embedding_model is None:
+            self._embedding_model = _SharedEmbeddings()
+        return self._embedding_model
+
+    @property
+    def delta_dir(self) -> str:
+        return os.path.join(self.index_dir, DELTA_DIR)
+
+    def has_document(self, doc_hash: str) -> bool:
+        return doc_hash in self.documents
+
+    # ---------- public API ----------
+    def add_documents(self, documents: List[Document], source: Optional[str] = None) -> str:
+        """
+        Chunk, embed and index one source document (e.g. the pages of a PDF).
+        Returns its content hash. Already-indexed documents are skipped.
+        """
+        item = chunk_source_document(documents, source)
+        if self.has_document(item.doc_hash):
+            print(f"[=] Already indexed: {source or item.doc_hash[:12]}")
+        else:
+            self.add_chunked([item])
+        return item.doc_hash
+
+    def add_chunked(self, items: List["ChunkedDocument"]) -> int:
+        """
+        Index already-chunked documents with one embedding call and one delta
+        for the whole batch. A new version of an already indexed `source`
+        replaces the old one. Known documents are not re-indexed, but their
+        file info is recorded (see `_record_file`) so ingestion can skip them
+        next time. Returns chunks added.
+        """
+        with self._lock:
+            fresh: Dict[str, ChunkedDocument] = {}
+            known: List[ChunkedDocument] = []
+            for item in items:
+                if item.doc_hash in self.documents or item.doc_hash in fresh:
+                    known.append(item)
+                else:
+                    fresh[item.doc_hash] = item
+            if not fresh:
+                self._record_files(known)
+                return 0
+
+            chunks = [c for item in fresh.values() for c in item.chunks]
+            ids = [c.metadata["chunk_id"] for c in chunks]
+            texts = [c.page_content for c in chunks]
+            metadatas = [c.metadata for c in chunks]
+            vectors, reused = self._embed(texts)
+
+            self._apply_add(ids, texts, metadatas, vectors)
+            docs = []
+            for item in fresh.values():
+                entry = {"source": item.source, "chunk_ids": [c.metadata["chunk_id"] for c in item.chunks], **item.info}
+                self.documents[item.doc_hash] = entry
+                docs.append({"doc_hash": item.doc_hash, "n_chunks": len(item.chunks),
+                             **{k: v for k, v in entry.items() if k != "chunk_ids"}})
+            self._write_delta({
+                "op": "add", "docs": docs, "ids": ids, "texts": texts, "metadatas": metadatas,
+            }, np.asarray(vectors, dtype=np.float32))
+
+            # A new version of a file replaces the old one
+            sources = {item.source: item.doc_hash for item in fresh.values() if item.source is not None}
+            for old_hash, entry in list(self.documents.items()):
+                if entry.get("source") in sources and sources[entry["source"]] != old_hash:
+                    self.remove_document(old_hash)
+            for source, doc_hash in sources.items():
+                self._release_source(doc_hash, source)
+            self._record_files(known)
+
+        label = next(iter(fresh.values())).source if len(fresh) == 1 else f"{len(fresh)} documents"
+        print(f"[+] Indexed {len(ids)} chunks from {label} ({reused} embeddings reused)")
+        return len(ids)
+
+    def _record_file(self, doc_hash: str, source: Optional[str], info: Dict[str, Any]) -> bool:
+        """
+        Note that file `source` (with size/mtime `info`) holds the content of
+        indexed document `doc_hash`: a touched file updates the entry's info,
+        a copy under another path becomes an alias. Returns True if anything changed.
+        """
+        entry = self.documents.get(doc_hash)
+        if entry is None or source is None:
+            return False
+        if entry.get("source") == source:
+            changed = any(entry.get(k) != v for k, v in info.items())
+            entry.update(info)
+            return changed
+        self._release_source(doc_hash, source)
+        aliases = entry.setdefault("aliases", {})
+        changed = aliases.get(source) != info
+        aliases[source] = dict(info)
+        return changed
+
+    def _release_source(self, doc_hash: str, source: str):
+        """`source` now holds `doc_hash`'s content: drop it as an alias of other documents."""
+        for other, entry in self.documents.items():
+            if other != doc_hash:
+                entry.get("aliases", {}).pop(source, None)
+
+    def _record_files(self, items: List["ChunkedDocument"]):
+        files = [
+            {"doc_hash": item.doc_hash, "source": item.source, **item.info}
+            for item in items
+            if self._record_file(item.doc_hash, item.source, item.info)
+        ]
+        if files:
+            self._write_delta({"op": "files", "files": files})
+
+    def _embed(self, texts: List[str]):
+        """
+        Embed chunk texts, reusing cached vectors for text seen before
+        (keyed by content hash). Returns (vectors, number reused).
+        """
+        if not texts:
+            return [], 0
+        cache = self.embedding_cache
+        if cache is None:
+            return self.embedding_model.embed_documents(texts), 0
+
+        vectors = cache.get_many(EMBEDDING_MODEL_NAME, texts)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            fresh = self.embedding_model.embed_documents([texts[i] for i in missing])
+            cache.put_many(EMBEDDING_MODEL_NAME, [texts[i] for i in missing], fresh)
+            for i, v in zip(missing, fresh):
+                vectors[i] = v
+        return vectors, len(texts) - len(missing)
+
+    def remove_document(self, doc_hash: str) -> bool:
+        """
+        Remove a document's chunks from the index. Returns False if unknown.
+        """
+        with self._lock:
+            entry = self.documents.pop(doc_hash, None)
+            if entry is None:
+                return False
+            self._apply_remove(entry["chunk_ids"])
+            self._write_delta({"op": "remove", "doc_hash": doc_hash, "ids": entry["chunk_ids"]})
+        return True
+
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """
+        Tune approximate search (IVF `nprobe`, HNSW `ef_search`) on the live index.
+        """
+        with self._lock:
+            if nprobe:
+                self.ann_config.nprobe = nprobe
+            if ef_search:
+                self.ann_config.ef_search = ef_search
+            if self.vectorstore is not None:
+                ann_index.set_search_params(self.vectorstore.index, nprobe, ef_search)
+
+    def retrieve(self, query: str, top_k: int = 5, mode: str = RAG_RETRIEVAL_MODE) -> List[Document]:
+        """
+        Top-k chunks for `query`.
+
+        mode="dense" uses FAISS only, "lexical" BM25 only (no embedding call),
+        "hybrid" fuses both rankings with reciprocal-rank fusion, and "auto"
+        picks lexical for identifier-like queries (model names, datasets,
+        equations; see `is_lexical_query`) when BM25 finds anything, else hybrid.
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode {mode!r}; expected one of {RETRIEVAL_MODES}")
+        with self._lock:
+            if self.vectorstore is None:
+                return []
+            if mode == "dense":
+                return self.vectorstore.similarity_search(query, k=top_k)
+
+            n_candidates = max(top_k, RAG_HYBRID_CANDIDATES)
+            lexical = [chunk_id for chunk_id, _ in self.bm25.search(query, k=n_candidates)]
+            if mode == "lexical" or (mode == "auto" and lexical and is_lexical_query(query)):
+                return self._fetch(lexical[:top_k])
+
+            dense = self.vectorstore.similarity_search(query, k=n_candidates)
+            by_id = {d.metadata.get("chunk_id", d.id): d for d in dense}
+            fused = reciprocal_rank_fusion([list(by_id), lexical], k=RAG_RRF_K, limit=top_k)
+            return self._fetch([chunk_id for chunk_id, _ in fused], known=by_id)
+
+    def _rebuild_bm25(self):
+        # snapshots written before BM25 existed: index the stored chunk text once
+        ids = list(self.vectorstore.index_to_docstore_id.values())
+        docs = [self.vectorstore.docstore.search(i) for i in ids]
+        pairs = [(i, d.page_content) for i, d in zip(ids, docs) if isinstance(d, Document)]
+        self.bm25 = BM25Index()
+        self.bm25.add([i for i, _ in pairs], [t for _, t in pairs])
+
+    def _fetch(self, chunk_ids: List[str], known: Optional[Dict[str, Document]] = None) -> List[Document]:
+        """
+        Documents for chunk ids, reading text from the docstore only when needed.
+        """
+        docs = []
+        for chunk_id in chunk_ids:
+            doc = (known or {}).get(chunk_id) or self.vectorstore.docstore.search(chunk_id)
+            if isinstance(doc, Document):
+                docs.append(doc)
+        return docs
+
+    def save(self):
+        """
+        Compact: write the in-memory store as a new snapshot, switch CURRENT
+        to it, then drop the deltas and snapshots it replaces.
+        """
+        with self._lock:
+            name = f"{SNAPSHOT_PREFIX}{self._delta_seq:06d}"
+            if name == self._snapshot:
+                return
+            final = os.path.join(self.index_dir, name)
+            tmp = f"{final}.tmp"
+            shutil.rmtree(tmp, ignore_errors=True)
+            os.makedirs(tmp)
+            if self.vectorstore is not None:
+                save_vectorstore(self.vectorstore, tmp)
+            self.bm25.save(os.path.join(tmp, BM25_FILE))
+            _write_json_atomic(
+                os.path.join(tmp, MANIFEST_FILE),
+                {"documents": self.documents, "delta_seq": self._delta_seq},
+            )
+            shutil.rmtree(final, ignore_errors=True)
+            os.replace(tmp, final)
+            _write_json_atomic(os.path.join(self.index_dir, CURRENT_FILE), {"snapshot": name})
+
+            # buffered docstore changes are now in the new snapshot's file
+            if self.vectorstore is not None:
+                old = self.vectorstore.docstore
+                self.vectorstore.docstore = SQLiteDocstore(os.path.join(final, DOCSTORE_FILE))
+                if isinstance(old, SQLiteDocstore):
+                    old.close()
+            self._snapshot = name
+            self._deltas_since_snapshot = 0
+            self._remove_obsolete_files()
+
+    # ---------- internals ----------
+    def _ensure_writable(self):
+        if self.vectorstore is not None:
+            make_writable(self.vectorstore)
+            ann_index.set_search_params(self.vectorstore.index, self.ann_config.nprobe, self.ann_config.ef_search)
+
+    def _apply_add(self, ids: List[str], texts: List[str], metadatas: List[dict], vectors):
+        if not ids:
+            return
+        self._ensure_writable()
+        self.bm25.add(ids, texts)
+        pairs = list(zip(texts, [list(map(float, v)) for v in vectors]))
+        if self.vectorstore is None:
+            self.vectorstore = FAISS.from_embeddings(pairs, self.embedding_model, metadatas=metadatas, ids=ids)
+        else:
+            self.vectorstore.add_embeddings(pairs, metadatas=metadatas, ids=ids)
+        self._maybe_upgrade_index()
+
+    def _apply_remove(self, ids: List[str]):
+        if self.vectorstore is None or not ids:
+            return
+        self._ensure_writable()
+        self.bm25.remove(ids)
+        if ann_index.supports_remove(self.vectorstore.index):
+            self.vectorstore.delete(ids)
+        else:
+            self._delete_by_rebuild(ids)
+
+    def _maybe_upgrade_index(self):
+        """
+        Switch from the exact flat index to the configured ANN type once large enough.
+        Row positions are preserved, so the docstore mapping stays valid.
+        """
+        index = self.vectorstore.index
+        if (
+            self.ann_config.index_type == "flat"
+            or ann_index.index_type_of(index) != "flat"
+            or index.ntotal < self.ann_config.min_vectors
+        ):
+            return
+        print(f"[~] Building {self.ann_config.index_type} index over {index.ntotal} vectors")
+        self.vectorstore.index = ann_index.build_index(ann_index.reconstruct_all(index), self.ann_config)
+
+    def _delete_by_rebuild(self, ids: List[str]):
+        """
+        Delete for ANN indexes (IVF, HNSW): refill the trained index with the
+        kept vectors so row positions stay 0..n-1, as the docstore mapping expects.
+        """
+        vs = self.vectorstore
+        drop = set(ids)
+        rows = sorted(vs.index_to_docstore_id.items())
+        kept = [(pos, doc_id) for pos, doc_id in rows if doc_id not in drop]
+        vectors = ann_index.reconstruct_all(vs.index)[[pos for pos, _ in kept]]
+        vs.index = ann_index.refill(vs.index, vectors)
+        vs.docstore.delete([doc_id for _, doc_id in rows if doc_id in drop])
+        vs.index_to_docstore_id = {i: doc_id for i, (_, doc_id) in enumerate(kept)}
+
+    def _write_delta(self, record: Dict[str, Any], vectors: Optional[np.ndarray] = None):
+        os.makedirs(self.delta_dir, exist_ok=True)
+        self._delta_seq += 1
+        self._deltas_since_snapshot += 1
+        base = os.path.join(self.delta_dir, f"{self._delta_seq:06d}")
+        if vectors is not None:
+            np.save(f"{base}.npy", vectors)
+        # the JSON file is written last: a delta only counts once it exists
+        _write_json_atomic(f"{base}.json", record)
+
+        if self._deltas_since_snapshot >= (self.compact_after or COMPACT_AFTER_DELTAS):
+            self.save()
+
+    def _replay_add(self, record: Dict[str, Any], vectors: np.ndarray):
+        offset = 0
+        keep = []
+        for doc in record["docs"]:
+            n = doc["n_chunks"]
+            if doc["doc_hash"] not in self.documents:
+                info = {k: v for k, v in doc.items() if k not in ("doc_hash", "n_chunks")}
+                self.documents[doc["doc_hash"]] = {**info, "chunk_ids": record["ids"][offset:offset + n]}
+                if info.get("source") is not None:
+                    self._release_source(doc["doc_hash"], info["source"])
+                keep.extend(range(offset, offset + n))
+            offset += n
+        if keep:
+            self._apply_add(
+                [record["ids"][i] for i in keep],
+                [record["texts"][i] for i in keep],
+                [record["metadatas"][i] for i in keep],
+                vectors[keep],
+            )
+
+    def _remove_obsolete_files(self):
+        # Processes still reading an old snapshot keep their open/mapped files on POSIX
+        for path in glob.glob(os.path.join(self.index_dir, f"{SNAPSHOT_PREFIX}*")):
+            if os.path.basename(path) != self._snapshot:
+                shutil.rmtree(path, ignore_errors=True)
+        for path in glob.glob(os.path.join(self.delta_dir, "*.json")):
+            if _delta_number(path) <= self._delta_seq:
+                base = path[:-len(".json")]
+                for p in (f"{base}.npy", path):
+                    if os.path.exists(p):
+                        os.remove(p)
+
+    def _load(self):
+        snapshot_dir = _current_snapshot_dir(self.index_dir)
+        if snapshot_dir is not None:
+            with open(os.path.join(snapshot_dir, MANIFEST_FILE), encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.documents = manifest["documents"]
+            self._delta_seq = manifest["delta_seq"]
+            self._snapshot = os.path.basename(snapshot_dir)
+            if os.path.exists(os.path.join(snapshot_dir, INDEX_FILE)):
+                self.vectorstore = load_vectorstore(snapshot_dir, self.embedding_model, mmap=self.mmap)
+                bm25_path = os.path.join(snapshot_dir, BM25_FILE)
+                if os.path.exists(bm25_path):
+                    self.bm25 = BM25Index.load(bm25_path)
+                else:
+                    self._rebuild_bm25()
+                ann_index.set_search_params(
+                    self.vectorstore.index, self.ann_config.nprobe, self.ann_config.ef_search
+                )
+
+        # Replay deltas written after the snapshot
+        for path in sorted(glob.glob(os.path.join(self.delta_dir, "*.json")), key=_delta_number):
+            seq = _delta_number(path)
+            if seq <= self._delta_seq:
+                continue
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+            if record["op"] == "add":
+                self._replay_add(record, np.load(path[:-len(".json")] + ".npy"))
+            elif record["op"] == "remove" and record["doc_hash"] in self.documents:
+                self._apply_remove(record["ids"])
+                self.documents.pop(record["doc_hash"])
+            elif record["op"] == "files":
+                for f in record["files"]:
+                    info = {k: v for k, v in f.items() if k not in ("doc_hash", "source")}
+                    self._record_file(f["doc_hash"], f["source"], info)
+            self._delta_seq = seq
+            self._deltas_since_snapshot += 1
+
+
+def _delta_number(path: str) -> int:
+    return int(os.path.basename(path).split(".")[0])
+
+
+_default_manager: Optional[RAGIndexManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def get_index_manager() -> RAGIndexManager:
+    """
+    Shared index manager for FAISS_DIR, loaded once per process.
+    """
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = RAGIndexManager(FAISS_DIR)
+        return _default_manager
+
+
+# ------------ Retrieval ------------
+def retrieve_relevant_chunks(query: str, top_k: int = 5, mode: str = RAG_RETRIEVAL_MODE) -> List[str]:
+    """
+    Return the text of the top_k chunks most relevant to `query` (see RAGIndexManager.retrieve).
+    """
+    return [d.page_content for d in get_index_manager().retrieve(query, top_k=top_k, mode=mode)]
+
@@ -8,9 +8,11 @@ from langchain_community.document_loaders import (
     JSONLoader,
     UnstructuredMarkdownLoader,
 )
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
+
+from researcher.data import chunking, faiss_store
+from researcher.data.chunking import CHUNK_SIZE, CHUNK_OVERLAP
+from researcher.llm.embedding_registry import get_embedding_model
 
 # -------------------- Document Loader --------------------
 def load_document(file_path: str):
@@ -34,23 +36,26 @@ def load_document(file_path: str):
     return loader.load()
 
 # -------------------- Chunking --------------------
-def split_documents(documents, chunk_size: int = 1000, chunk_overlap: int = 150):
-    """Split documents into manageable chunks for embedding."""
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size, chunk_overlap=chunk_overlap
-    )
-    return splitter.split_documents(documents)
+def split_documents(documents, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP):
+    """Split documents into manageable chunks for embedding (same settings as rag_index)."""
+    return chunking.split(documents, chunk_size, chunk_overlap)
 
 # -------------------- Embedding Model --------------------
-embedding_model = HuggingFaceEmbeddings(
-    model_name="BAAI/bge-small-en-v1.5",
-    model_kwargs={"device": "cpu"}  # change to "cuda" for GPU
-)
+def __getattr__(name):
+    # `embedding_model` used to be built at import time; it is now the shared
+    # registry model, loaded on first access.
+    if name == "embedding_model":
+        return get_embedding_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # -------------------- FAISS Vector Store --------------------
 def create_faiss_index_from_documents(documents, embeddings, save_path: str):
-    """Create and save a FAISS index from document chunks."""
+    """
+    Create a FAISS index from document chunks and save it as a snapshot
+    (faiss_store.save_vectorstore: SQLite docstore, no pickle), loadable
+    with faiss_store.load_vectorstore.
+    """
     db = FAISS.from_documents(documents, embeddings)
-    db.save_local(save_path)
+    faiss_store.save_vectorstore(db, save_path)
     return db
 
@@ -0,0 +1,151 @@
+# researcher/llm/concurrency.py
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Deque, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter usable from both threads and coroutines.
+
+    `rate_per_minute` tokens are added continuously up to `capacity`
+    (defaults to one minute's worth). A rate of 0/None disables limiting.
+    State is guarded by a threading lock and never held across an await,
+    so one bucket can be shared by several event loops and threads.
+    """
+
+    def __init__(self, rate_per_minute: Optional[float], capacity: Optional[float] = None):
+        self.rate_per_minute = rate_per_minute or 0
+        self.capacity = capacity or self.rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_minute > 0
+
+    def _reserve(self, amount: float) -> float:
+        """
+        Take `amount` tokens if available. Otherwise return how long to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            rate_per_sec = self.rate_per_minute / 60.0
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate_per_sec)
+            self._updated = now
+
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / rate_per_sec
+
+    def acquire(self, amount: float = 1.0):
+        """Blocking acquire for synchronous callers."""
+        if not self.enabled:
+            return
+        amount = min(amount, self.capacity)
+        while (delay := self._reserve(amount)) > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, amount: float = 1.0):
+        """Non-blocking acquire for coroutines."""
+        if not self.enabled:
+            return
+        amount = min(amount, self.capacity)
+        while (delay := self._reserve(amount)) > 0:
+            await asyncio.sleep(delay)
+
+
+class InFlightLimiter:
+    """
+    At most `limit` concurrent holders, shared by threads and coroutines on
+    any number of event loops (an asyncio.Semaphore is bound to one loop).
+    Like TokenBucket, the lock is never held across an await; waiting
+    coroutines are woken on their own loop when a slot is released.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._in_use = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def _try_take(self) -> bool:
+        if self._in_use < self.limit:
+            self._in_use += 1
+            return True
+        return False
+
+    def acquire(self):
+        """Blocking acquire for synchronous callers."""
+        with self._cond:
+            while not self._try_take():
+                self._cond.wait()
+
+    async def aacquire(self):
+        """Non-blocking acquire for coroutines."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._try_take():
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._cond:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                raise
+
+    def release(self):
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+            waiters, self._waiters = list(self._waiters), deque()
+        # Every waiting coroutine retries; the losers queue up again
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    async def __aenter__(self):
+        await self.aacquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+    If this thread already runs an event loop (Jupyter, some UIs), the
+    coroutine runs on a fresh loop in a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
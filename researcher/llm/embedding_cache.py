@@ -0,0 +1,243 @@
+# researcher/llm/embedding_cache.py
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalization applied before hashing: trim and collapse whitespace.
+    """
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def content_key(text: str) -> str:
+    """
+    Content address of a text: sha256 of its normalized form.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed embedding cache.
+
+    Layout inside `cache_dir`:
+      - index.sqlite       (model, key) -> slot, plus LRU timestamps
+      - <model>.f32        float32 matrix per model, memory-mapped, one row per slot
+
+    The cache is bounded by `max_entries` across all models. When full, the
+    least recently used entry is evicted and its slot is reused.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, cache_dir: str, max_entries: int = 200_000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(
+            os.path.join(cache_dir, "index.sqlite"), check_same_thread=False
+        )
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS models (
+                model TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                capacity INTEGER NOT NULL,
+                next_slot INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                model TEXT NOT NULL,
+                key TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, key)
+            );
+            CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used);
+            CREATE TABLE IF NOT EXISTS free_slots (
+                model TEXT NOT NULL,
+                slot INTEGER NOT NULL
+            );
+            """
+        )
+        self._db.commit()
+
+        self._vectors: Dict[str, np.memmap] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------- storage helpers ----------
+    def _vector_path(self, model: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+        return os.path.join(self.cache_dir, f"{safe}.f32")
+
+    def _model_info(self, model: str):
+        return self._db.execute(
+            "SELECT dim, capacity, next_slot FROM models WHERE model = ?", (model,)
+        ).fetchone()
+
+    def _open_vectors(self, model: str, dim: int, capacity: int) -> np.memmap:
+        path = self._vector_path(model)
+        size = dim * capacity * 4
+        if not os.path.exists(path) or os.path.getsize(path) < size:
+            with open(path, "ab") as f:
+                f.truncate(size)
+        mm = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, dim))
+        self._vectors[model] = mm
+        return mm
+
+    def _matrix(self, model: str, dim: int, capacity: int) -> np.memmap:
+        mm = self._vectors.get(model)
+        if mm is None or mm.shape != (capacity, dim):
+            if mm is not None:
+                mm.flush()
+            mm = self._open_vectors(model, dim, capacity)
+        return mm
+
+    def _allocate_slot(self, model: str, dim: int) -> int:
+        """
+        Return a free slot for `model`, growing its file or evicting as needed.
+        """
+        total = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if total >= self.max_entries:
+            self._evict(total - self.max_entries + 1)
+
+        row = self._db.execute(
+            "SELECT rowid, slot FROM free_slots WHERE model = ? LIMIT 1", (model,)
+        ).fetchone()
+        if row:
+            self._db.execute("DELETE FROM free_slots WHERE rowid = ?", (row[0],))
+            return row[1]
+
+        info = self._model_info(model)
+        if info is None:
+            self._db.execute(
+                "INSERT INTO models (model, dim, capacity, next_slot) VALUES (?, ?, ?, 0)",
+                (model, dim, self.INITIAL_CAPACITY),
+            )
+            info = (dim, self.INITIAL_CAPACITY, 0)
+
+        _, capacity, slot = info
+        if slot >= capacity:
+            capacity *= 2
+        self._db.execute(
+            "UPDATE models SET capacity = ?, next_slot = ? WHERE model = ?",
+            (capacity, slot + 1, model),
+        )
+        return slot
+
+    def _evict(self, count: int):
+        rows = self._db.execute(
+            "SELECT model, key, slot FROM entries ORDER BY last_used ASC LIMIT ?", (count,)
+        ).fetchall()
+        for model, key, slot in rows:
+            self._db.execute("DELETE FROM entries WHERE model = ? AND key = ?", (model, key))
+            self._db.execute("INSERT INTO free_slots (model, slot) VALUES (?, ?)", (model, slot))
+        self.evictions += len(rows)
+
+    # ---------- public API ----------
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for `texts`. Misses are returned as None.
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        if not texts:
+            return results
+
+        with self._lock:
+            info = self._model_info(model)
+            if info is None:
+                self.misses += len(texts)
+                return results
+
+            dim, capacity, _ = info
+            matrix = self._matrix(model, dim, capacity)
+            now = time.time()
+            touched = []
+
+            for i, text in enumerate(texts):
+                key = content_key(text)
+                row = self._db.execute(
+                    "SELECT slot FROM entries WHERE model = ? AND key = ?", (model, key)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    continue
+                results[i] = matrix[row[0]].tolist()
+                touched.append((now, model, key))
+                self.hits += 1
+
+            if touched:
+                self._db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE model = ? AND key = ?", touched
+                )
+                self._db.commit()
+
+        return results
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """
+        Store embeddings for `texts`. Empty vectors or vectors whose dimension
+        does not match the model's existing entries are skipped.
+        """
+        with self._lock:
+            now = time.time()
+            for text, vec in zip(texts, vectors):
+                if not vec:
+                    continue
+
+                info = self._model_info(model)
+                if info is not None and info[0] != len(vec):
+                    continue
+
+                key = content_key(text)
+                row = self._db.execute(
+                    "SELECT slot FROM entries WHERE model = ? AND key = ?", (model, key)
+                ).fetchone()
+                slot = row[0] if row else self._allocate_slot(model, len(vec))
+
+                dim, capacity, _ = self._model_info(model)
+                matrix = self._matrix(model, dim, capacity)
+                matrix[slot] = np.asarray(vec, dtype=np.float32)
+
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (model, key, slot, last_used) VALUES (?, ?, ?, ?)",
+                    (model, key, slot, now),
+                )
+
+            for mm in self._vectors.values():
+                mm.flush()
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        with self._lock:
+            for mm in self._vectors.values():
+                mm.flush()
+            self._vectors.clear()
+            for (model,) in self._db.execute("SELECT model FROM models").fetchall():
+                path = self._vector_path(model)
+                if os.path.exists(path):
+                    os.remove(path)
+            self._db.executescript("DELETE FROM entries; DELETE FROM free_slots; DELETE FROM models;")
+            self._db.commit()
@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import (
+    LOCAL_EMBEDDING_MODEL,
+    LOCAL_EMBEDDING_DEVICE,
+    LOCAL_EMBEDDING_BATCH_SIZE,
+    LOCAL_EMBEDDING_BACKEND,
+    LOCAL_EMBEDDING_ONNX_FILE,
+    LOCAL_EMBEDDING_THREADS,
+    LOCAL_EMBEDDING_WARMUP,
+)
+
+# One loaded model per (model_name, device, backend); building one is seconds of
+# disk reads and hundreds of MB of RAM, so every caller shares the same instance.
+_models: Dict[Tuple[str, str, str], object] = {}
+_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def _model_kwargs(device: str, backend: str) -> dict:
+    kwargs = {"device": device}
+    if backend != "torch":
+        # sentence-transformers >= 3.2 runs ONNX / OpenVINO exports on CPU
+        kwargs["backend"] = backend
+        model_kwargs = {}
+        if LOCAL_EMBEDDING_ONNX_FILE:
+            model_kwargs["file_name"] = LOCAL_EMBEDDING_ONNX_FILE
+        if backend == "onnx" and LOCAL_EMBEDDING_THREADS > 0:
+            session_options = _onnx_session_options(LOCAL_EMBEDDING_THREADS)
+            if session_options is not None:
+                model_kwargs["session_options"] = session_options
+        if model_kwargs:
+            kwargs["model_kwargs"] = model_kwargs
+    return kwargs
+
+
+def _onnx_session_options(threads: int):
+    """ONNX Runtime session using `threads` intra-op threads (torch gets the same via _set_torch_threads)."""
+    try:
+        import onnxruntime
+    except ImportError:
+        return None
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = threads
+    return options
+
+
+def _set_torch_threads():
+    if LOCAL_EMBEDDING_THREADS <= 0:
+        return
+    try:
+        import torch
+        torch.set_num_threads(LOCAL_EMBEDDING_THREADS)
+    except ImportError:
+        pass
+
+
+def _load(model_name: str, device: str, backend: str, batch_size: int):
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    _set_torch_threads()
+    start = time.perf_counter()
+    try:
+        model = HuggingFaceEmbeddings(
+            model_name=model_name,
+            model_kwargs=_model_kwargs(device, backend),
+            encode_kwargs={"batch_size": batch_size},
+        )
+    except Exception as e:
+        if backend == "torch":
+            raise
+        print(f"[EmbeddingRegistry] {backend} backend unavailable ({e}); falling back to torch")
+        model = HuggingFaceEmbeddings(
+            model_name=model_name,
+            model_kwargs=_model_kwargs(device, "torch"),
+            encode_kwargs={"batch_size": batch_size},
+        )
+    print(f"[EmbeddingRegistry] Loaded {model_name} ({backend}, {device}) in {time.perf_counter() - start:.1f}s")
+    return model
+
+
+def get_embedding_model(
+    model_name: Optional[str] = None,
+    device: Optional[str] = None,
+    backend: Optional[str] = None,
+    batch_size: Optional[int] = None,
+):
+    """
+    Shared LangChain `HuggingFaceEmbeddings` instance, loaded on first use.
+
+    Thread-safe: concurrent first callers wait for a single load instead of
+    each building their own copy. Defaults come from the LOCAL_EMBEDDING_*
+    settings in config.py. `batch_size` only applies to the first load.
+    """
+    key = (
+        model_name or LOCAL_EMBEDDING_MODEL,
+        device or LOCAL_EMBEDDING_DEVICE,
+        backend or LOCAL_EMBEDDING_BACKEND,
+    )
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            model = _load(*key, batch_size or LOCAL_EMBEDDING_BATCH_SIZE)
+            _models[key] = model
+    return model
+
+
+def warm_up(background: bool = True) -> Optional[threading.Thread]:
+    """
+    Load the default model and run one encode so the first real request does
+    not pay for weight loading and kernel initialization.
+
+    With `background=True` this returns immediately and loads on a daemon
+    thread; later `get_embedding_model()` calls simply wait on the same lock.
+    Does nothing when LOCAL_EMBEDDING_WARMUP=0.
+    """
+    global _warmup_thread
+    if not LOCAL_EMBEDDING_WARMUP:
+        return None
+
+    def _run():
+        try:
+            get_embedding_model().embed_query("warm-up")
+        except Exception as e:
+            print(f"[EmbeddingRegistry] Warm-up failed: {e}")
+
+    if not background:
+        _run()
+        return None
+    if _warmup_thread is None:
+        _warmup_thread = threading.Thread(target=_run, name="embedding-warmup", daemon=True)
+        _warmup_thread.start()
+    return _warmup_thread
+
+
+def clear():
+    """
+    Drop all loaded models (mainly for tests).
+    """
+    global _warmup_thread
+    with _lock:
+        _models.clear()
+        _warmup_thread = None
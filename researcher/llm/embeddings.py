@@ -1,40 +1,252 @@
 import os
-from typing import List
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
 from openai import OpenAI
 from dotenv import load_dotenv
 load_dotenv()
 
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-MODEL_NAME = "text-embedding-3-small"
+from config import (
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_PROVIDER,
+    OPENAI_EMBEDDING_MODEL,
+    LOCAL_EMBEDDING_MODEL,
+    LOCAL_EMBEDDING_BATCH_SIZE,
+)
+from researcher.llm.embedding_cache import EmbeddingCache
 
+MODEL_NAME = OPENAI_EMBEDDING_MODEL
+
+# Provider limits for a single embeddings request (OpenAI: 2048 inputs, 300k tokens).
+# We stay a little under the token limit because our token count is an estimate.
+MAX_BATCH_INPUTS = 2048
+MAX_BATCH_TOKENS = 250_000
+MAX_INPUT_TOKENS = 8191
+
+# Texts per encode call for the local provider (the model batches internally
+# by LOCAL_EMBEDDING_BATCH_SIZE; this bounds memory for very large inputs)
+LOCAL_CHUNK_INPUTS = 32 * LOCAL_EMBEDDING_BATCH_SIZE
+
+_client: Optional[OpenAI] = None
+_cache: Optional[EmbeddingCache] = None
+_providers: Dict[str, "EmbeddingProvider"] = {}
+_providers_lock = threading.Lock()
+
+
+def _get_client() -> OpenAI:
+    """
+    Lazily create the OpenAI client so importing this module never needs an API key.
+    """
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return _client
+
+
+def get_cache() -> Optional[EmbeddingCache]:
+    """
+    Shared on-disk embedding cache, or None when disabled via EMBEDDING_CACHE_ENABLED=0.
+    """
+    global _cache
+    if _cache is None and EMBEDDING_CACHE_ENABLED:
+        try:
+            _cache = EmbeddingCache(EMBEDDING_CACHE_DIR, max_entries=EMBEDDING_CACHE_MAX_ENTRIES)
+        except Exception as e:
+            print(f"[embeddings] Cache unavailable, continuing without it: {e}")
+            return None
+    return _cache
+
+
+def _estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text).
+    """
+    return max(1, len(text) // 4)
+
+
+def _truncate(text: str) -> str:
+    """
+    Clip a single input so it fits the model's per-input token limit.
+    """
+    max_chars = MAX_INPUT_TOKENS * 4
+    return text if len(text) <= max_chars else text[:max_chars]
+
+
+def _make_batches(
+    texts: List[str],
+    max_inputs: int = MAX_BATCH_INPUTS,
+    max_tokens: int = MAX_BATCH_TOKENS,
+) -> List[List[int]]:
+    """
+    Split input positions into batches that respect both the per-request
+    input count and the per-request token budget.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        tokens = _estimate_tokens(text)
+        if current and (len(current) >= max_inputs or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+class EmbeddingProvider(ABC):
+    """
+    Turns a list of texts into vectors. `embed` returns one entry per input,
+    with an empty list for inputs that failed.
+    """
+    name = ""
+    model_name = ""
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI embeddings API, packed into as few requests as the limits allow."""
+    name = "openai"
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        self.model_name = model_name
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        results: List[List[float]] = [[] for _ in texts]
+        inputs = [_truncate(t) for t in texts]
+        batches = _make_batches(inputs)
+        print(f"📦 Requests: {len(batches)}")
+
+        for batch in batches:
+            try:
+                response = _get_client().embeddings.create(
+                    model=self.model_name,
+                    input=[inputs[j] for j in batch],
+                )
+                # The API returns items with an `index` field relative to the request
+                for item in response.data:
+                    results[batch[item.index]] = item.embedding
+
+            except Exception as e:
+                print("❌ EMBEDDING ERROR:")
+                print(str(e))
+        return results
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    The shared local sentence-transformers model from embedding_registry
+    (torch, ONNX or OpenVINO on CPU per LOCAL_EMBEDDING_BACKEND). Runs
+    offline, and with the default model name it is the very instance the
+    RAG index embeds with, so cache entries are shared too.
+    """
+    name = "local"
+
+    def __init__(self, model_name: str = LOCAL_EMBEDDING_MODEL):
+        self.model_name = model_name
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        from researcher.llm import embedding_registry
+
+        results: List[List[float]] = [[] for _ in texts]
+        try:
+            model = embedding_registry.get_embedding_model(self.model_name)
+        except Exception as e:
+            print("❌ EMBEDDING ERROR (local model failed to load):")
+            print(str(e))
+            return results
+
+        for start in range(0, len(texts), LOCAL_CHUNK_INPUTS):
+            try:
+                vectors = model.embed_documents(texts[start:start + LOCAL_CHUNK_INPUTS])
+                results[start:start + len(vectors)] = [list(map(float, v)) for v in vectors]
+            except Exception as e:
+                print("❌ EMBEDDING ERROR:")
+                print(str(e))
+        return results
+
+
+PROVIDERS = {"openai": OpenAIEmbeddingProvider, "local": LocalEmbeddingProvider}
+
+
+def get_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """
+    Shared provider instance for `name` (default: EMBEDDING_PROVIDER).
+    """
+    name = (name or EMBEDDING_PROVIDER).lower()
+    provider = _providers.get(name)
+    if provider is None:
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown embedding provider: {name} (expected one of {sorted(PROVIDERS)})")
+        with _providers_lock:
+            provider = _providers.setdefault(name, PROVIDERS[name]())
+    return provider
+
+
+def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    Embed many texts with the configured provider in as few calls as possible.
+
+    Texts already in the embedding cache are not sent at all. The result is
+    aligned with `texts`; empty texts and texts whose batch failed get an
+    empty embedding.
+    """
+    provider = get_provider()
+    results: List[List[float]] = [[] for _ in texts]
+
+    # Only consider non-empty inputs, remembering their original positions
+    positions = [i for i, t in enumerate(texts) if t and t.strip()]
+    if not positions:
+        return results
+
+    # Serve what we can from the cache
+    cache = get_cache()
+    if cache is not None:
+        cached = cache.get_many(provider.model_name, [texts[i] for i in positions])
+        missing = []
+        for i, vec in zip(positions, cached):
+            if vec is None:
+                missing.append(i)
+            else:
+                results[i] = vec
+        positions = missing
+        if not positions:
+            return results
+
+    inputs = [texts[i] for i in positions]
 
-def get_embedding(text: str) -> List[float]:
-    # Print header for each embedding call
     print("\n" + "="*60)
-    print("🔍 Generating Embedding")
+    print("🔍 Generating Embeddings")
     print("-"*60)
-    print(f"📝 Text Preview: {text[:80].replace('\n',' ')}")
-    
-    if not text or not text.strip():
-        print("⚠️ EMPTY TEXT — returning empty embedding.")
-        print("="*60 + "\n")
-        return []
-
-    try:
-        response = client.embeddings.create(
-            model=MODEL_NAME,
-            input=text
-        )
-
-        emb = response.data[0].embedding
-        print(f"📏 Embedding Size: {len(emb)}")
-        print("✅ Status: Success")
-        print("="*60 + "\n")
-
-        return emb
-
-    except Exception as e:
-        print("❌ EMBEDDING ERROR:")
-        print(str(e))
-        print("="*60 + "\n")
-        return []
+    print(f"🧩 Provider: {provider.name} ({provider.model_name})")
+    print(f"📝 Inputs to embed: {len(inputs)} of {len(texts)}")
+
+    for i, vec in zip(positions, provider.embed(inputs)):
+        results[i] = vec
+
+    if cache is not None:
+        done = [i for i in positions if results[i]]
+        cache.put_many(provider.model_name, [texts[i] for i in done], [results[i] for i in done])
+        stats = cache.stats()
+        print(f"🗄️ Cache: {stats['hits']} hits / {stats['misses']} misses")
+
+    print("✅ Status: Done")
+    print("="*60 + "\n")
+
+    return results
+
+
+def get_embedding(text: str) -> List[float]:
+    """
+    Embed a single text. Thin wrapper around `get_embeddings`.
+    """
+    return get_embeddings([text])[0]
@@ -1,7 +1,9 @@
+import asyncio
 import os
-from typing import List, Dict, Optional
+import weakref
+from typing import Iterator, List, Dict, Optional
 
-from groq import Groq
+from groq import Groq, AsyncGroq
 from groq.types.chat import ChatCompletionUserMessageParam, ChatCompletionSystemMessageParam
 
 
@@ -23,11 +25,42 @@ class GroqProvider:
         if not api_key:
             raise ValueError("GROQ_API_KEY is missing. Add it to your .env file.")
 
+        self._api_key = api_key
         self.client = Groq(api_key=api_key)
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGroq]" = weakref.WeakKeyDictionary()
         self.model = model or self.DEFAULT_MODEL
         self.temperature = temperature
         self.max_tokens = max_tokens
 
+    def _get_async_client(self) -> AsyncGroq:
+        """
+        One AsyncGroq client per event loop: its connection pool is bound to
+        the loop it was first used on.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncGroq(api_key=self._api_key)
+            self._async_clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """
+        Close the AsyncGroq client of the running loop (and its connection
+        pool). Call before a short-lived loop ends, e.g. one made by run_sync.
+        """
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def _build_messages(self, prompt: str, system_prompt: Optional[str]) -> List:
+        messages: List = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
     def generate(
         self,
         prompt: str,
@@ -39,11 +72,7 @@ class GroqProvider:
         Unified Generation API.
         LangGraph & your agents will rely on this.
         """
-        messages: List = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-
-        messages.append({"role": "user", "content": prompt})
+        messages = self._build_messages(prompt, system_prompt)
 
         try:
             response = self.client.chat.completions.create(
@@ -59,3 +88,70 @@ class GroqProvider:
         except Exception as e:
             print(f"[GroqProvider] LLM Error: {e}")
             return f"[LLM ERROR] {e}"
+
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Streaming Generation API: yields text deltas as they arrive.
+        On failure yields an "[LLM ERROR] ..." chunk, like `generate`; if the
+        stream breaks midway, that chunk follows the deltas already sent.
+        """
+        messages = self._build_messages(prompt, system_prompt)
+        stream = None
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature or self.temperature,
+                max_tokens=max_tokens or self.max_tokens,
+                stream=True,
+            )
+
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+        except Exception as e:
+            print(f"[GroqProvider] LLM Error: {e}")
+            yield f"[LLM ERROR] {e}"
+
+        finally:
+            # Release the HTTP connection if the caller stopped reading early
+            if stream is not None and hasattr(stream, "close"):
+                stream.close()
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Async counterpart of `generate`, same arguments and error handling.
+        """
+        messages = self._build_messages(prompt, system_prompt)
+
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature or self.temperature,
+                max_tokens=max_tokens or self.max_tokens,
+            )
+
+            content = response.choices[0].message.content
+            return content.strip() if content is not None else ""
+
+        except Exception as e:
+            print(f"[GroqProvider] LLM Error: {e}")
+            return f"[LLM ERROR] {e}"
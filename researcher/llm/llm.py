@@ -4,23 +4,210 @@ from researcher.llm.provider_router import LLMRouter
 _llm_router = LLMRouter()
 
 
-from typing import Optional
+from typing import Iterator, List, Optional
+
+from config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_SEMANTIC_THRESHOLD,
+)
+from researcher.llm.response_cache import ResponseCache
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Shared LLM response cache, or None when disabled via LLM_CACHE_ENABLED=0.
+    """
+    global _response_cache
+    if _response_cache is None and LLM_CACHE_ENABLED:
+        embed_fn = None
+        if LLM_CACHE_SEMANTIC_THRESHOLD:
+            from researcher.llm.embeddings import get_embedding
+            embed_fn = get_embedding
+        try:
+            _response_cache = ResponseCache(
+                LLM_CACHE_PATH,
+                max_entries=LLM_CACHE_MAX_ENTRIES,
+                ttl_seconds=LLM_CACHE_TTL_SECONDS,
+                semantic_threshold=LLM_CACHE_SEMANTIC_THRESHOLD,
+                embed_fn=embed_fn,
+            )
+        except Exception as e:
+            print(f"[llm] Response cache unavailable, continuing without it: {e}")
+            return None
+    return _response_cache
+
+
+def _cache_context(
+    system_prompt: Optional[str],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+) -> str:
+    """
+    Cache context for a call, using the provider's effective defaults so
+    `temperature=None` and the explicit default share entries.
+    """
+    llm = _llm_router.llm
+    return ResponseCache.context_key(
+        _llm_router.provider,
+        getattr(llm, "model", ""),
+        system_prompt,
+        temperature or getattr(llm, "temperature", None),
+        max_tokens or getattr(llm, "max_tokens", None),
+    )
+
+
+def _cacheable(response: str) -> bool:
+    return bool(response) and not response.startswith("[LLM ERROR]")
+
 
 def generate(
     prompt: str,
     system_prompt: Optional[str] = None,
     temperature: Optional[float] = None,
     max_tokens: Optional[int] = None,
+    use_cache: bool = True,
 ) -> str:
     """
     Universal LLM entrypoint for your entire application.
+    Responses are cached; pass `use_cache=False` for calls that must be
+    freshly sampled.
     Usage:
         from researcher.llm.llm import generate
         text = generate("Explain GraphRAG")
     """
-    return _llm_router.generate(
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        context = _cache_context(system_prompt, temperature, max_tokens)
+        cached = cache.get(context, prompt)
+        if cached is not None:
+            return cached
+
+    response = _llm_router.generate(
         prompt,
         system_prompt=system_prompt,
         temperature=temperature,
         max_tokens=max_tokens,
     )
+
+    if cache is not None and _cacheable(response):
+        cache.put(context, prompt, response)
+    return response
+
+
+def stream_generate(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    use_cache: bool = True,
+) -> Iterator[str]:
+    """
+    Streaming version of `generate`: yields text chunks as the provider
+    produces them, so callers can render tokens incrementally.
+    A cached response is yielded as a single chunk.
+    Usage:
+        from researcher.llm.llm import stream_generate
+        for chunk in stream_generate("Explain GraphRAG"):
+            print(chunk, end="")
+    """
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        context = _cache_context(system_prompt, temperature, max_tokens)
+        cached = cache.get(context, prompt)
+        if cached is not None:
+            yield cached
+            return
+
+    parts: List[str] = []
+    failed = False
+    stream = _llm_router.stream(
+        prompt,
+        system_prompt=system_prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    try:
+        for chunk in stream:
+            # A stream that breaks midway ends with an error chunk after real text
+            failed = failed or chunk.startswith("[LLM ERROR]")
+            parts.append(chunk)
+            yield chunk
+    finally:
+        stream.close()
+
+    response = "".join(parts).strip()
+    if cache is not None and not failed and _cacheable(response):
+        cache.put(context, prompt, response)
+
+
+async def agenerate(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    use_cache: bool = True,
+) -> str:
+    """
+    Async version of `generate`, sharing the router's concurrency and rate
+    limits and the response cache.
+    """
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        context = _cache_context(system_prompt, temperature, max_tokens)
+        cached = cache.get(context, prompt)
+        if cached is not None:
+            return cached
+
+    response = await _llm_router.agenerate(
+        prompt,
+        system_prompt=system_prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+
+    if cache is not None and _cacheable(response):
+        cache.put(context, prompt, response)
+    return response
+
+
+def generate_many(
+    prompts: List[str],
+    system_prompt: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    use_cache: bool = True,
+) -> List[str]:
+    """
+    Run several prompts concurrently; results come back in prompt order.
+    Cached prompts are answered locally and only the misses are sent.
+    Usage:
+        from researcher.llm.llm import generate_many
+        summaries = generate_many([prompt_a, prompt_b])
+    """
+    results: List[Optional[str]] = [None] * len(prompts)
+
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        context = _cache_context(system_prompt, temperature, max_tokens)
+        for i, p in enumerate(prompts):
+            results[i] = cache.get(context, p)
+
+    missing = [i for i, r in enumerate(results) if r is None]
+    fresh = _llm_router.generate_many(
+        [prompts[i] for i in missing],
+        system_prompt=system_prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+
+    for i, response in zip(missing, fresh):
+        results[i] = response
+        if cache is not None and _cacheable(response):
+            cache.put(context, prompts[i], response)
+
+    return results
@@ -1,6 +1,67 @@
 import requests
 import json
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
+
+OLLAMA_GENERATE_URL = "http://localhost:11434/api/generate"
+
+
+def _build_payload(
+    prompt: Union[str, object],
+    model: str,
+    system_prompt: Optional[str],
+    temperature: float,
+    max_tokens: int,
+    stream: bool,
+) -> dict:
+    # Handle LangChain's PromptValue or custom objects safely
+    prompt_str = str(prompt) if hasattr(prompt, "to_string") else str(prompt)
+    combined_prompt = f"{system_prompt.strip()}\n\n{prompt_str.strip()}" if system_prompt else prompt_str.strip()
+
+    return {
+        "model": model,
+        "prompt": combined_prompt,
+        "temperature": temperature,
+        "stream": stream,
+        "options": {
+            "num_predict": max_tokens
+        }
+    }
+
+
+def stream_zephyr_locally(
+    prompt: Union[str, object],
+    model: str = "zephyr",
+    system_prompt: Optional[str] = "",
+    temperature: float = 0.7,
+    max_tokens: int = 512,
+) -> Iterator[str]:
+    """
+    Stream tokens from a local Zephyr model via Ollama as they are generated.
+
+    Ollama answers a streaming request with one JSON object per line; each
+    carries the next piece of text in "response" until "done" is true.
+
+    Yields:
+        str: Response fragments, or a single error message on connection failure.
+    """
+    payload = _build_payload(prompt, model, system_prompt, temperature, max_tokens, stream=True)
+
+    try:
+        with requests.post(OLLAMA_GENERATE_URL, json=payload, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                token = data.get("response", "")
+                if token:
+                    yield token
+                if data.get("done"):
+                    break
+
+    except requests.exceptions.RequestException as e:
+        yield f"[Zephyr connection error] {e}"
+
 
 def query_zephyr_locally(
     prompt: Union[str, object],
@@ -20,33 +81,35 @@ def query_zephyr_locally(
         system_prompt (str, optional): Optional system-level instruction.
         temperature (float): Generation temperature for randomness (default: 0.7).
         max_tokens (int): Max tokens to generate in the response (default: 512).
-        stream (bool): Whether to stream output from model (currently False).
+        stream (bool): If True, read the response as a token stream (printing
+            tokens as they arrive when `log` is set) and return the joined text.
+            Use `stream_zephyr_locally` to consume tokens directly.
         log (bool): If True, print the prompt and response for debugging.
 
     Returns:
         str: Model-generated response or error message.
     """
-    # Handle LangChain's PromptValue or custom objects safely
-    prompt_str = str(prompt) if hasattr(prompt, "to_string") else str(prompt)
-    combined_prompt = f"{system_prompt.strip()}\n\n{prompt_str.strip()}" if system_prompt else prompt_str.strip()
-
-    payload = {
-        "model": model,
-        "prompt": combined_prompt,
-        "temperature": temperature,
-        "stream": stream,
-        "options": {
-            "num_predict": max_tokens
-        }
-    }
+    payload = _build_payload(prompt, model, system_prompt, temperature, max_tokens, stream=stream)
 
     if log:
         print("\n[🔧 Prompt Sent to Zephyr]")
-        print(combined_prompt)
+        print(payload["prompt"])
         print("-" * 60)
 
+    if stream:
+        if log:
+            print("[📨 Zephyr's Response]")
+        parts = []
+        for token in stream_zephyr_locally(prompt, model, system_prompt, temperature, max_tokens):
+            parts.append(token)
+            if log:
+                print(token, end="", flush=True)
+        if log:
+            print("\n" + "=" * 60)
+        return "".join(parts)
+
     try:
-        response = requests.post("http://localhost:11434/api/generate", json=payload)
+        response = requests.post(OLLAMA_GENERATE_URL, json=payload)
         response.raise_for_status()
         output = response.json().get("response", "[No 'response' field in JSON]")
 
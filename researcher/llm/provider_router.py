@@ -1,4 +1,8 @@
-from config import LLM_PROVIDER
+import asyncio
+from typing import Iterator, List, Optional
+
+from config import LLM_PROVIDER, LLM_MAX_IN_FLIGHT, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+from researcher.llm.concurrency import InFlightLimiter, TokenBucket, run_sync
 from researcher.llm.groq_provider import GroqProvider
 # from researcher.llm.local_zephyr import LocalZephyrProvider  # future
 
@@ -6,9 +10,20 @@ from researcher.llm.groq_provider import GroqProvider
 class LLMRouter:
     """
     Routes generation calls to the correct backend.
+
+    Every call, sync or async, goes through the same limits:
+      - at most `max_in_flight` concurrent requests in total, across threads
+        and every event loop
+      - token buckets for requests/minute and tokens/minute
     """
 
-    def __init__(self, provider: str | None = None):
+    def __init__(
+        self,
+        provider: str | None = None,
+        max_in_flight: int = LLM_MAX_IN_FLIGHT,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+    ):
         provider = provider or LLM_PROVIDER.lower()
 
         if provider == "groq":
@@ -20,9 +35,80 @@ class LLMRouter:
         else:
             raise ValueError(f"Unknown LLM provider: {provider}")
 
+        self.provider = provider
+        self.max_in_flight = max(1, max_in_flight)
+        self._request_bucket = TokenBucket(requests_per_minute)
+        self._token_bucket = TokenBucket(tokens_per_minute)
+        self._slots = InFlightLimiter(self.max_in_flight)
+
+    def _estimate_tokens(self, prompt: str, **kwargs) -> int:
+        """
+        Rough request size for the tokens/minute budget: prompt + system
+        prompt (~4 chars per token) plus the completion budget.
+        """
+        text_len = len(prompt or "") + len(kwargs.get("system_prompt") or "")
+        max_tokens = kwargs.get("max_tokens") or getattr(self.llm, "max_tokens", 0)
+        return text_len // 4 + max_tokens
+
     def generate(self, prompt: str, **kwargs) -> str:
         """
         Pass through to the selected provider.
         Extra kwargs allow system_prompt, temperature, etc.
         """
-        return self.llm.generate(prompt, **kwargs)
+        with self._slots:
+            self._request_bucket.acquire(1)
+            self._token_bucket.acquire(self._estimate_tokens(prompt, **kwargs))
+            return self.llm.generate(prompt, **kwargs)
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Streaming pass-through: yields text deltas from the provider as they
+        arrive. The in-flight slot is held until the stream is exhausted or
+        closed; closing it early (e.g. the UI stops reading) also closes the
+        provider's stream.
+        """
+        self._slots.acquire()
+        upstream = None
+        try:
+            self._request_bucket.acquire(1)
+            self._token_bucket.acquire(self._estimate_tokens(prompt, **kwargs))
+            upstream = self.llm.stream(prompt, **kwargs)
+            for chunk in upstream:
+                yield chunk
+        finally:
+            if upstream is not None and hasattr(upstream, "close"):
+                upstream.close()
+            self._slots.release()
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """
+        Async pass-through, subject to the in-flight and rate limits.
+        """
+        async with self._slots:
+            await self._request_bucket.aacquire(1)
+            await self._token_bucket.aacquire(self._estimate_tokens(prompt, **kwargs))
+            return await self.llm.agenerate(prompt, **kwargs)
+
+    async def agenerate_many(self, prompts: List[str], **kwargs) -> List[str]:
+        """
+        Fan several prompts out concurrently. Results keep the order of `prompts`.
+        """
+        return list(await asyncio.gather(*(self.agenerate(p, **kwargs) for p in prompts)))
+
+    def generate_many(self, prompts: List[str], **kwargs) -> List[str]:
+        """
+        Synchronous wrapper around `agenerate_many`. The batch runs on its own
+        event loop, so the provider's clients for that loop are closed with it.
+        """
+        if not prompts:
+            return []
+
+        async def run() -> List[str]:
+            try:
+                return await self.agenerate_many(prompts, **kwargs)
+            finally:
+                aclose = getattr(self.llm, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        return run_sync(run())
@@ -0,0 +1,182 @@
+# researcher/llm/response_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class ResponseCache:
+    """
+    Persistent cache of LLM responses backed by SQLite.
+
+    Exact hits are keyed on (provider, model, system prompt, prompt,
+    temperature, max_tokens). When `semantic_threshold` is set, a miss falls
+    back to the most similar cached prompt (cosine similarity of prompt
+    embeddings) generated under the same provider/model/system/params.
+
+    Entries expire after `ttl_seconds`; beyond `max_entries` the least
+    recently used ones are evicted.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: int = 20_000,
+        ttl_seconds: Optional[float] = None,
+        semantic_threshold: Optional[float] = None,
+        embed_fn: Optional[Callable[[str], List[float]]] = None,
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold or None
+        self.embed_fn = embed_fn
+
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                context TEXT NOT NULL,
+                response TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_context ON responses (context);
+            CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_used);
+            """
+        )
+        self._db.commit()
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    # ---------- keys ----------
+    @staticmethod
+    def _hash(obj) -> str:
+        return hashlib.sha256(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def context_key(cls, provider: str, model: str, system_prompt: Optional[str],
+                    temperature: Optional[float], max_tokens: Optional[int]) -> str:
+        """Everything except the prompt itself."""
+        return cls._hash([provider, model, system_prompt or "", temperature, max_tokens])
+
+    @classmethod
+    def make_key(cls, context: str, prompt: str) -> str:
+        return cls._hash([context, prompt])
+
+    # ---------- public API ----------
+    def get(self, context: str, prompt: str) -> Optional[str]:
+        now = time.time()
+        key = self.make_key(context, prompt)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and not self._expired(row[1], now):
+                self._touch(key, now)
+                self.hits += 1
+                return row[0]
+
+        if self.semantic_threshold and self.embed_fn:
+            response = self._semantic_lookup(context, prompt, now)
+            if response is not None:
+                return response
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, context: str, prompt: str, response: str):
+        now = time.time()
+        embedding = None
+        if self.semantic_threshold and self.embed_fn:
+            vec = self.embed_fn(prompt)
+            if vec:
+                embedding = np.asarray(vec, dtype=np.float32).tobytes()
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, context, response, embedding, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.make_key(context, prompt), context, response, embedding, now, now),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    # ---------- internals ----------
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and (now - created_at) > self.ttl_seconds
+
+    def _touch(self, key: str, now: float):
+        self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self._db.commit()
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def _semantic_lookup(self, context: str, prompt: str, now: float) -> Optional[str]:
+        query = np.asarray(self.embed_fn(prompt), dtype=np.float32)
+        if query.size == 0:
+            return None
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, response, embedding, created_at FROM responses "
+                "WHERE context = ? AND embedding IS NOT NULL",
+                (context,),
+            ).fetchall()
+            rows = [r for r in rows if not self._expired(r[3], now)]
+            if not rows:
+                return None
+
+            matrix = np.stack([np.frombuffer(r[2], dtype=np.float32) for r in rows])
+            if matrix.shape[1] != query.shape[0]:
+                return None
+
+            norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+            scores = np.divide(matrix @ query, norms, out=np.zeros(len(rows), dtype=np.float32), where=norms > 0)
+            best = int(np.argmax(scores))
+            if scores[best] < self.semantic_threshold:
+                return None
+
+            self._touch(rows[best][0], now)
+            self.semantic_hits += 1
+            return rows[best][1]
@@ -0,0 +1,263 @@
+# researcher/memory/backends.py
+"""
+Storage backends for MemoryStore.
+
+A backend is a client with Chroma's collection API (the subset MemoryStore
+uses): get_or_create_collection / list_collections / get_max_batch_size on
+the client; add / upsert / update / get / query / delete / count on each
+collection.
+
+  chroma  chromadb.PersistentClient in the memory directory
+  sqlite  embedded fallback: rows in one SQLite file, vectors searched
+          exactly with NumPy (fine for the few thousand entries a research
+          memory holds)
+  auto    chroma if it is installed and opens, else sqlite
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import chromadb
+except Exception:
+    chromadb = None
+
+BACKENDS = ("auto", "chroma", "sqlite")
+SQLITE_FILE = "memory.sqlite"
+SQLITE_MAX_BATCH = 50_000
+
+
+def open_backend(kind: str, path: str) -> Tuple[str, Any]:
+    """
+    Open the memory backend `kind` in directory `path`.
+
+    Returns:
+        (name, client): The backend actually opened and its client.
+    """
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown memory backend: {kind} (expected one of {BACKENDS})")
+    os.makedirs(path, exist_ok=True)
+
+    if kind in ("auto", "chroma"):
+        if chromadb is None:
+            if kind == "chroma":
+                raise ImportError("chromadb is not installed. Install it with: pip install chromadb")
+            print("[MemoryStore] chromadb not installed; using the SQLite backend.")
+        else:
+            try:
+                return "chroma", ChromaClient(path)
+            except Exception as e:
+                if kind == "chroma":
+                    raise
+                print(f"[MemoryStore] Chroma failed to open ({e}); using the SQLite backend.")
+
+    return "sqlite", SQLiteClient(os.path.join(path, SQLITE_FILE))
+
+
+class ChromaClient:
+    """chromadb.PersistentClient, with collections created without a default embedding function."""
+
+    def __init__(self, path: str):
+        self.client = chromadb.PersistentClient(path=path)
+
+    def get_or_create_collection(self, name: str):
+        # We always pass our own embeddings; don't let Chroma load its default model
+        return self.client.get_or_create_collection(name=name, embedding_function=None)
+
+    def list_collections(self):
+        return self.client.list_collections()
+
+    def get_max_batch_size(self) -> int:
+        return self.client.get_max_batch_size()
+
+
+class SQLiteClient:
+    """
+    Embedded backend: one SQLite file for all collections. Vectors are loaded
+    into NumPy per collection on first query, not when the file is opened.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " collection TEXT NOT NULL, id TEXT NOT NULL, document TEXT,"
+            " metadata TEXT, embedding BLOB, PRIMARY KEY (collection, id))"
+        )
+        self.conn.commit()
+        self._collections: Dict[str, "SQLiteCollection"] = {}
+
+    def get_or_create_collection(self, name: str) -> "SQLiteCollection":
+        with self.lock:
+            if name not in self._collections:
+                self._collections[name] = SQLiteCollection(self, name)
+            return self._collections[name]
+
+    def list_collections(self) -> List["SQLiteCollection"]:
+        with self.lock:
+            names = {r[0] for r in self.conn.execute("SELECT DISTINCT collection FROM entries")}
+            return [self.get_or_create_collection(n) for n in sorted(names | set(self._collections))]
+
+    def get_max_batch_size(self) -> int:
+        return SQLITE_MAX_BATCH
+
+
+def _blob(vec) -> bytes:
+    return np.asarray(vec, dtype=np.float32).tobytes()
+
+
+class SQLiteCollection:
+    def __init__(self, client: SQLiteClient, name: str):
+        self.client = client
+        self.name = name
+        self._ids: Optional[List[str]] = None   # row order of _vecs
+        self._vecs: Optional[np.ndarray] = None
+
+    # ---------- vectors ----------
+    def _load_vectors(self):
+        if self._ids is not None:
+            return
+        rows = self.client.conn.execute(
+            "SELECT id, embedding FROM entries WHERE collection = ? ORDER BY rowid", (self.name,)
+        ).fetchall()
+        self._ids = [r[0] for r in rows]
+        self._vecs = (
+            np.stack([np.frombuffer(r[1], dtype=np.float32) for r in rows])
+            if rows else np.empty((0, 0), dtype=np.float32)
+        )
+
+    def _invalidate(self):
+        self._ids, self._vecs = None, None
+
+    # ---------- writes ----------
+    def _write(self, verb: str, ids, documents, metadatas, embeddings):
+        documents = documents or [None] * len(ids)
+        metadatas = metadatas or [None] * len(ids)
+        rows = [
+            (self.name, i, d, json.dumps(m or {}), _blob(e))
+            for i, d, m, e in zip(ids, documents, metadatas, embeddings)
+        ]
+        with self.client.lock:
+            try:
+                with self.client.conn:
+                    self.client.conn.executemany(
+                        f"{verb} INTO entries (collection, id, document, metadata, embedding) VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.IntegrityError as e:
+                raise ValueError(f"ID already exists in {self.name}: {e}") from e
+            self._invalidate()
+
+    def add(self, ids, documents=None, metadatas=None, embeddings=None):
+        self._write("INSERT", ids, documents, metadatas, embeddings)
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None):
+        self._write("INSERT OR REPLACE", ids, documents, metadatas, embeddings)
+
+    def update(self, ids, documents=None, metadatas=None, embeddings=None):
+        with self.client.lock, self.client.conn:
+            for n, i in enumerate(ids):
+                if documents is not None:
+                    self.client.conn.execute(
+                        "UPDATE entries SET document = ? WHERE collection = ? AND id = ?", (documents[n], self.name, i)
+                    )
+                if metadatas is not None:
+                    self.client.conn.execute(
+                        "UPDATE entries SET metadata = ? WHERE collection = ? AND id = ?",
+                        (json.dumps(metadatas[n] or {}), self.name, i),
+                    )
+                if embeddings is not None:
+                    self.client.conn.execute(
+                        "UPDATE entries SET embedding = ? WHERE collection = ? AND id = ?",
+                        (_blob(embeddings[n]), self.name, i),
+                    )
+            if embeddings is not None:
+                self._invalidate()
+
+    def delete(self, ids=None):
+        with self.client.lock, self.client.conn:
+            self.client.conn.executemany(
+                "DELETE FROM entries WHERE collection = ? AND id = ?", [(self.name, i) for i in ids or []]
+            )
+            self._invalidate()
+
+    # ---------- reads ----------
+    def count(self) -> int:
+        with self.client.lock:
+            return self.client.conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE collection = ?", (self.name,)
+            ).fetchone()[0]
+
+    def _rows(self, ids: Optional[List[str]]) -> Dict[str, tuple]:
+        with self.client.lock:
+            if ids is None:
+                rows = self.client.conn.execute(
+                    "SELECT id, document, metadata, embedding FROM entries WHERE collection = ? ORDER BY rowid",
+                    (self.name,),
+                ).fetchall()
+            else:
+                rows = []
+                for start in range(0, len(ids), 500):
+                    part = ids[start:start + 500]
+                    rows += self.client.conn.execute(
+                        "SELECT id, document, metadata, embedding FROM entries WHERE collection = ?"
+                        f" AND id IN ({','.join('?' * len(part))})",
+                        (self.name, *part),
+                    ).fetchall()
+        return {r[0]: r for r in rows}
+
+    @staticmethod
+    def _shape(order: List[str], rows: Dict[str, tuple], include) -> Dict[str, Any]:
+        order = [i for i in order if i in rows]
+        out: Dict[str, Any] = {"ids": order}
+        if "documents" in include:
+            out["documents"] = [rows[i][1] for i in order]
+        if "metadatas" in include:
+            out["metadatas"] = [json.loads(rows[i][2]) if rows[i][2] else None for i in order]
+        if "embeddings" in include:
+            out["embeddings"] = [np.frombuffer(rows[i][3], dtype=np.float32) for i in order]
+        return out
+
+    def get(self, ids=None, limit: Optional[int] = None, include=("documents", "metadatas")) -> Dict[str, Any]:
+        rows = self._rows(list(ids) if ids is not None else None)
+        order = list(ids) if ids is not None else list(rows)
+        return self._shape(order[:limit] if limit else order, rows, include)
+
+    def query(self, query_embeddings=None, n_results: int = 10, include=("documents", "metadatas", "distances")):
+        """Exact nearest neighbours by squared L2 distance (Chroma's default space)."""
+        if query_embeddings is None:
+            raise ValueError("query_embeddings is required")
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        with self.client.lock:
+            self._load_vectors()
+            ids, vecs = self._ids, self._vecs
+
+        empty = {k: [[] for _ in queries] for k in ("ids", *include)}
+        if not ids:
+            return empty
+
+        k = min(n_results, len(ids))
+        dists = (
+            (queries ** 2).sum(axis=1, keepdims=True)
+            - 2 * queries @ vecs.T
+            + (vecs ** 2).sum(axis=1)[None, :]
+        )
+        top = np.argpartition(dists, k - 1, axis=1)[:, :k]
+        out: Dict[str, List] = {key: [] for key in empty}
+        rows = self._rows(sorted({ids[j] for j in top.ravel()}))
+        for q, cand in enumerate(top):
+            cand = cand[np.argsort(dists[q, cand])]
+            shaped = self._shape([ids[j] for j in cand], rows, include)
+            out["ids"].append(shaped["ids"])
+            for key in include:
+                if key == "distances":
+                    out[key].append([max(float(dists[q, j]), 0.0) for j in cand])
+                else:
+                    out[key].append(shaped[key])
+        return out
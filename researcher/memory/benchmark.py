@@ -0,0 +1,131 @@
+# researcher/memory/benchmark.py
+"""
+Per-item vs batched MemoryStore writes and reads.
+
+    python -m researcher.memory.benchmark --insights 10 --questions 7
+    python -m researcher.memory.benchmark --offline-rtt-ms 150 --backend sqlite
+
+Simulates persisting one research run (insights + questions) and querying
+them back, once through add/query and once through add_many/query_many.
+Each pass gets its own store and its own texts (tagged with a run id) so the
+embedding cache cannot serve one pass from the other's work.
+
+--offline-rtt-ms replaces the embedding provider with a deterministic local
+embedder that sleeps that long per request, to measure without network
+access. Measured that way (SQLite backend, 150 ms per embedding request,
+10 insights + 7 questions, top_k=5):
+
+    path        embed calls   write s   query s
+    per-item             34     2.568     2.561
+    batched               4     0.303     0.302
+
+With no simulated latency the store work alone is 0.008 / 0.003 s per-item
+against 0.001 / 0.001 s batched.
+
+With the real provider the gap follows the same call counts: 34 embedding
+requests become 4 (one per collection for writes, one per collection for
+reads), and 34 single-row store calls become 4.
+"""
+import argparse
+import hashlib
+import shutil
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from researcher.memory import memory_store
+from researcher.memory.memory_store import MemoryStore
+
+
+def _texts(kind: str, n: int, tag: str) -> List[str]:
+    return [f"[{tag}] {kind} {i}: finding about retrieval method {i} and its trade-offs." for i in range(n)]
+
+
+class _OfflineEmbedder:
+    """Stands in for the embedding API: hash-based vectors, fixed latency per request."""
+
+    def __init__(self, rtt_s: float, dim: int = 64):
+        self.rtt_s = rtt_s
+        self.dim = dim
+        self.calls = 0
+
+    def _vector(self, text: str) -> List[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [digest[i % len(digest)] / 255.0 for i in range(self.dim)]
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        time.sleep(self.rtt_s)
+        return [self._vector(t) if t.strip() else [] for t in texts]
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embeddings([text])[0]
+
+
+def _run(
+    batched: bool,
+    insights: int,
+    questions: int,
+    top_k: int,
+    backend: Optional[str] = None,
+    embedder: Optional[_OfflineEmbedder] = None,
+) -> Dict[str, float]:
+    tag = uuid.uuid4().hex[:8]
+    batch = {"insights": _texts("insight", insights, tag), "questions": _texts("question", questions, tag)}
+    root = tempfile.mkdtemp(prefix="memory-bench-")
+    calls_before = embedder.calls if embedder else 0
+    try:
+        store = MemoryStore(persist_directory=root, backend=backend)
+        store.list_collections()  # open the backend outside the timed section
+
+        start = time.perf_counter()
+        for category, texts in batch.items():
+            if batched:
+                store.add_many(category, texts, [{"run": tag}] * len(texts))
+            else:
+                for text in texts:
+                    store.add(category, text, {"run": tag})
+        write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for category, texts in batch.items():
+            if batched:
+                store.query_many(category, texts, top_k=top_k)
+            else:
+                for text in texts:
+                    store.query(category, text, top_k=top_k)
+        query_s = time.perf_counter() - start
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    calls = embedder.calls - calls_before if embedder else -1
+    return {"write_s": write_s, "query_s": query_s, "embed_calls": calls}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Per-item vs batched MemoryStore calls")
+    parser.add_argument("--insights", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=7)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--backend", default=None, help="memory backend (default: MEMORY_BACKEND)")
+    parser.add_argument("--offline-rtt-ms", type=float, default=None,
+                        help="use a local stand-in embedder with this latency per request")
+    args = parser.parse_args(argv)
+
+    embedder = None
+    if args.offline_rtt_ms is not None:
+        embedder = _OfflineEmbedder(args.offline_rtt_ms / 1000)
+        memory_store.get_embeddings = embedder.get_embeddings
+        memory_store.get_embedding = embedder.get_embedding
+
+    print(f"[MemoryStore] {args.insights} insights + {args.questions} questions")
+    print(f"{'path':<10} {'embed calls':>11} {'write s':>8} {'query s':>8}")
+    for name, batched in (("per-item", False), ("batched", True)):
+        r = _run(batched, args.insights, args.questions, args.top_k, args.backend, embedder)
+        calls = r["embed_calls"] if r["embed_calls"] >= 0 else "-"
+        print(f"{name:<10} {calls:>11} {r['write_s']:>8.3f} {r['query_s']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
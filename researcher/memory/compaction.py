@@ -0,0 +1,192 @@
+# researcher/memory/compaction.py
+"""
+Compaction for the research memory.
+
+    python -m researcher.memory.compaction --dry-run
+
+Per collection:
+  1. near-duplicates (cosine similarity >= `similarity`) are merged into the
+     most-used entry of their group; access counts are summed and the other
+     metadata is filled in from the duplicates
+  2. entries idle for more than `max_age_days` are evicted, unless they have
+     been read at least `keep_if_accessed` times
+  3. if more than `max_items` remain, the least-used / longest-idle go
+
+Usage comes from the access statistics MemoryStore keeps in each entry's
+metadata (created_at, last_accessed, access_count).
+"""
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import (
+    MEMORY_DEDUP_SIMILARITY,
+    MEMORY_MAX_AGE_DAYS,
+    MEMORY_KEEP_IF_ACCESSED,
+    MEMORY_MAX_ITEMS,
+)
+
+CREATED_AT = "created_at"
+LAST_ACCESSED = "last_accessed"
+ACCESS_COUNT = "access_count"
+MERGED_COUNT = "merged_count"
+
+
+@dataclass
+class CompactionPlan:
+    merges: Dict[str, List[str]] = field(default_factory=dict)   # keeper id -> absorbed ids
+    updates: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # keeper id -> merged metadata
+    evicted: List[str] = field(default_factory=list)
+
+    @property
+    def deleted(self) -> List[str]:
+        return [i for dups in self.merges.values() for i in dups] + self.evicted
+
+
+@dataclass
+class CompactionStats:
+    before: int = 0
+    merged: int = 0
+    evicted: int = 0
+
+    @property
+    def after(self) -> int:
+        return self.before - self.merged - self.evicted
+
+
+def last_used(meta: Dict[str, Any]) -> float:
+    """Most recent read, else creation time; 0 for entries from before access tracking."""
+    return float(meta.get(LAST_ACCESSED) or meta.get(CREATED_AT) or 0.0)
+
+
+def _merge_metadata(keeper: Dict[str, Any], dups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged = dict(keeper)
+    for meta in dups:
+        for key, value in meta.items():
+            merged.setdefault(key, value)
+    group = [keeper] + dups
+    merged[ACCESS_COUNT] = sum(int(m.get(ACCESS_COUNT, 0)) for m in group)
+    merged[MERGED_COUNT] = sum(int(m.get(MERGED_COUNT, 0)) + 1 for m in dups) + int(keeper.get(MERGED_COUNT, 0))
+    created = [float(m[CREATED_AT]) for m in group if m.get(CREATED_AT)]
+    if created:
+        merged[CREATED_AT] = min(created)
+    accessed = [float(m[LAST_ACCESSED]) for m in group if m.get(LAST_ACCESSED)]
+    if accessed:
+        merged[LAST_ACCESSED] = max(accessed)
+    return merged
+
+
+def plan_compaction(
+    ids: Sequence[str],
+    embeddings,
+    metadatas: Sequence[Optional[Dict[str, Any]]],
+    similarity: float = MEMORY_DEDUP_SIMILARITY,
+    max_age_days: float = MEMORY_MAX_AGE_DAYS,
+    keep_if_accessed: int = MEMORY_KEEP_IF_ACCESSED,
+    max_items: int = MEMORY_MAX_ITEMS,
+    now: Optional[float] = None,
+) -> CompactionPlan:
+    """
+    Decide what to merge and evict in one collection (pure; nothing is written).
+
+    A `similarity`, `max_age_days` or `max_items` of 0 disables that rule.
+    """
+    now = time.time() if now is None else now
+    metas = [dict(m or {}) for m in metadatas]
+    plan = CompactionPlan()
+    if not ids:
+        return plan
+
+    # Most-used first, so each duplicate group is kept under its best entry
+    order = sorted(range(len(ids)), key=lambda i: (-int(metas[i].get(ACCESS_COUNT, 0)), -last_used(metas[i])))
+    alive = np.ones(len(ids), dtype=bool)
+
+    if similarity:
+        vecs = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        vecs = vecs / np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+        for i in order:
+            if not alive[i]:
+                continue
+            sims = vecs @ vecs[i]
+            sims[i] = -1.0
+            dups = np.flatnonzero(alive & (sims >= similarity))
+            if len(dups):
+                alive[dups] = False
+                plan.merges[ids[i]] = [ids[j] for j in dups]
+                metas[i] = _merge_metadata(metas[i], [metas[j] for j in dups])
+                plan.updates[ids[i]] = metas[i]
+
+    survivors = [i for i in order if alive[i]]
+
+    if max_age_days:
+        cutoff = now - max_age_days * 86400
+        idle = {
+            i for i in survivors
+            if 0 < last_used(metas[i]) < cutoff and int(metas[i].get(ACCESS_COUNT, 0)) < keep_if_accessed
+        }
+        plan.evicted += [ids[i] for i in survivors if i in idle]
+        survivors = [i for i in survivors if i not in idle]
+
+    if max_items and len(survivors) > max_items:
+        # `survivors` is still best-first
+        plan.evicted += [ids[i] for i in survivors[max_items:]]
+
+    for key in plan.evicted:
+        plan.updates.pop(key, None)
+    return plan
+
+
+def compact_collection(collection, dry_run: bool = False, **options) -> CompactionStats:
+    """
+    Compact one collection (anything with Chroma's get/update/delete API).
+    """
+    data = collection.get(include=["embeddings", "metadatas"])
+    ids = list(data.get("ids") or [])
+    embeddings = data.get("embeddings")
+    metadatas = data.get("metadatas") or [None] * len(ids)
+
+    plan = plan_compaction(ids, embeddings if embeddings is not None else [], metadatas, **options)
+    stats = CompactionStats(
+        before=len(ids),
+        merged=sum(len(d) for d in plan.merges.values()),
+        evicted=len(plan.evicted),
+    )
+    if dry_run:
+        return stats
+
+    if plan.updates:
+        collection.update(ids=list(plan.updates), metadatas=list(plan.updates.values()))
+    if plan.deleted:
+        collection.delete(ids=plan.deleted)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    from researcher.memory.memory_store import COLLECTIONS, MemoryStore
+
+    parser = argparse.ArgumentParser(description="Merge near-duplicates and evict stale research memory")
+    parser.add_argument("--persist-dir", default=None)
+    parser.add_argument("--collections", nargs="+", default=list(COLLECTIONS))
+    parser.add_argument("--similarity", type=float, default=MEMORY_DEDUP_SIMILARITY)
+    parser.add_argument("--max-age-days", type=float, default=MEMORY_MAX_AGE_DAYS)
+    parser.add_argument("--keep-if-accessed", type=int, default=MEMORY_KEEP_IF_ACCESSED)
+    parser.add_argument("--max-items", type=int, default=MEMORY_MAX_ITEMS)
+    parser.add_argument("--dry-run", action="store_true", help="report only, change nothing")
+    args = parser.parse_args(argv)
+
+    store = MemoryStore(persist_directory=args.persist_dir)
+    store.compact(
+        args.collections,
+        dry_run=args.dry_run,
+        similarity=args.similarity,
+        max_age_days=args.max_age_days,
+        keep_if_accessed=args.keep_if_accessed,
+        max_items=args.max_items,
+    )
+
+
+if __name__ == "__main__":
+    main()
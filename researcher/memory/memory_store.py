@@ -1,24 +1,59 @@
 # researcher/memory/memory_store.py
 from typing import Any, Dict, List, Optional
+import atexit
 import os
+import threading
+import time
 import uuid
 import traceback
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
-try:
-    import chromadb
-    from chromadb.config import Settings
-except Exception as e:
-    chromadb = None  # will raise later if used
+from config import MEMORY_BACKEND, MEMORY_DIR
+from researcher.llm.embeddings import get_embedding, get_embeddings
+from researcher.memory.backends import open_backend
+from researcher.memory.compaction import (
+    ACCESS_COUNT,
+    CREATED_AT,
+    LAST_ACCESSED,
+    MERGED_COUNT,
+    CompactionStats,
+    compact_collection,
+)
 
-from researcher.llm.embeddings import get_embedding
 
+DEFAULT_PERSIST_DIR = MEMORY_DIR
 
-DEFAULT_PERSIST_DIR = os.path.join(os.getcwd(), "researcher_memory_db")
+# Upper bound on rows per Chroma call when the client cannot tell us its own limit
+DEFAULT_MAX_BATCH = 5000
+
+QUERY_KEYS = ("ids", "documents", "metadatas", "distances")
+
+COLLECTIONS = ("summaries", "insights", "questions", "citations")
+
+# Cross-collection ranking: a hit's score is distance / weight, so a higher
+# weight pulls that collection's results up.
+SEARCH_WEIGHTS = {"summaries": 1.0, "insights": 1.0, "questions": 0.8, "citations": 0.6}
+
+# Reads are counted in memory and written to entry metadata in batches
+ACCESS_FLUSH_EVERY = 100
+
+# Usage metadata an upsert carries over from the entry it replaces
+USAGE_KEYS = (CREATED_AT, LAST_ACCESSED, ACCESS_COUNT, MERGED_COUNT)
+
+
+def _empty_query_result(error: str) -> Dict[str, Any]:
+    """A failed query in `query`'s shape (fresh lists, never shared between results)."""
+    result: Dict[str, Any] = {key: [[]] for key in QUERY_KEYS}
+    result["error"] = error
+    return result
 
 
 class MemoryStore:
     """
-    Persistent vector memory using ChromaDB (duckdb+parquet backend).
+    Persistent vector memory on a pluggable backend (see memory.backends:
+    Chroma PersistentClient, or the embedded SQLite + NumPy fallback).
+    The backend is opened on first use, not at construction.
     Collections:
       - summaries
       - insights
@@ -26,37 +61,56 @@ class MemoryStore:
       - citations
     """
 
-    def __init__(self, persist_directory: Optional[str] = None):
-        if chromadb is None:
-            raise ImportError(
-                "chromadb is not installed. Install it with: pip install chromadb"
-            )
-
+    def __init__(self, persist_directory: Optional[str] = None, backend: Optional[str] = None):
         self.persist_directory = persist_directory or DEFAULT_PERSIST_DIR
-        os.makedirs(self.persist_directory, exist_ok=True)
+        self.backend = backend or MEMORY_BACKEND
+        self._client = None
+        self._collection_map: Dict[str, Any] = {}
+        self._open_lock = threading.Lock()
+        self._search_pool: Optional[ThreadPoolExecutor] = None
+        self._search_pool_lock = threading.Lock()
 
-        # Chroma 0.5+ config
-        settings = Settings(
-            chroma_db_impl="duckdb+parquet",
-            persist_directory=self.persist_directory,
-        )
+        # category -> id -> [reads, last read time], not yet written back
+        self._access: Dict[str, Dict[str, List[float]]] = {}
+        self._access_pending = 0
+        self._access_lock = threading.Lock()
+        _live_stores.add(self)
 
-        try:
-            self.client = chromadb.Client(settings)
-        except Exception:
-            print("[MemoryStore] Persistent backend failed, switching to in-memory.")
-            self.client = chromadb.Client()
+    def _open(self):
+        if self._client is not None:
+            return
+        with self._open_lock:
+            if self._client is not None:
+                return
+            start = time.perf_counter()
+            name, client = open_backend(self.backend, self.persist_directory)
+            collections = {col: client.get_or_create_collection(col) for col in COLLECTIONS}
+
+            counts = {}
+            for col, collection in collections.items():
+                try:
+                    counts[col] = collection.count()
+                except Exception:
+                    counts[col] = 0
+            print(
+                f"[MemoryStore] Opened {name} backend at {self.persist_directory}: "
+                f"{sum(counts.values())} vectors ("
+                + ", ".join(f"{c} {n}" for c, n in counts.items())
+                + f") in {time.perf_counter() - start:.2f}s"
+            )
+            self.backend = name
+            self._collection_map = collections
+            self._client = client
 
-        # initialize collections
-        self._collections: Dict[str, Any] = {}
-        for col in ("summaries", "insights", "questions", "citations"):
-            self._collections[col] = self._get_or_create(col)
+    @property
+    def client(self):
+        self._open()
+        return self._client
 
-    def _get_or_create(self, name: str):
-        try:
-            return self.client.get_or_create_collection(name=name)
-        except Exception:
-            return self.client.create_collection(name=name)
+    @property
+    def _collections(self) -> Dict[str, Any]:
+        self._open()
+        return self._collection_map
 
     def list_collections(self) -> List[str]:
         try:
@@ -71,48 +125,19 @@ class MemoryStore:
         metadata: Optional[Dict[str, Any]] = None,
         id: Optional[str] = None,
     ) -> str:
-        if category not in self._collections:
-            raise ValueError(f"Unknown collection: {category}")
-
-        metadata = metadata or {}
-        doc_id = id or metadata.get("id") or str(uuid.uuid4())
-
-        emb = get_embedding(text)
-        if not emb:
-            raise ValueError("Failed to compute embedding for text.")
-
-        try:
-            self._collections[category].add(
-                ids=[doc_id],
-                documents=[text],
-                metadatas=[metadata],
-                embeddings=[emb],
-            )
-            return doc_id
-        except Exception as e:
-            print(f"[MemoryStore] Error adding document: {e}")
-            traceback.print_exc()
-            raise
+        doc_id = id or (metadata or {}).get("id") or str(uuid.uuid4())
+        return self._write_one("add", category, doc_id, text, metadata)
 
     def upsert(self, category: str, id: str, text: str, metadata: Optional[Dict[str, Any]] = None):
-        if category not in self._collections:
-            raise ValueError(f"Unknown collection: {category}")
+        return self._write_one("upsert", category, id, text, metadata)
 
-        metadata = metadata or {}
-        emb = get_embedding(text)
-
-        try:
-            self._collections[category].upsert(
-                ids=[id],
-                documents=[text],
-                metadatas=[metadata],
-                embeddings=[emb],
-            )
-            return id
-        except Exception as e:
-            print(f"[MemoryStore] Error in upsert: {e}")
-            traceback.print_exc()
-            raise
+    def _write_one(self, method: str, category: str, id: str, text: str, metadata: Optional[Dict[str, Any]]) -> str:
+        """Single-item add/upsert on top of the batch path; raises on failure."""
+        result = self._write_many(method, category, [id], [text], [metadata])[0]
+        if not result["ok"]:
+            print(f"[MemoryStore] Error in {method}: {result['error']}")
+            raise ValueError(result["error"])
+        return id
 
     def query(
         self,
@@ -129,29 +154,249 @@ class MemoryStore:
                 if not emb:
                     return {"documents": [], "metadatas": [], "distances": []}
 
-                return self._collections[category].query(
+                res = self._collections[category].query(
                     query_embeddings=[emb],
                     n_results=top_k,
                     include=["documents", "metadatas", "distances"],
                 )
-
-            # no text → return default top-k
-            return self._collections[category].query(
-                n_results=top_k,
-                include=["documents", "metadatas", "distances"],
-            )
+            else:
+                # no text → return default top-k
+                res = self._collections[category].query(
+                    n_results=top_k,
+                    include=["documents", "metadatas", "distances"],
+                )
+            self._record_access(category, [i for group in res.get("ids") or [] for i in group])
+            return res
 
         except Exception as e:
             print(f"[MemoryStore] Query failed: {e}")
             traceback.print_exc()
             return {"documents": [], "metadatas": [], "distances": []}
 
+    # ---------- batch API ----------
+    def _collection(self, category: str):
+        if category not in self._collections:
+            raise ValueError(f"Unknown collection: {category}")
+        return self._collections[category]
+
+    def _max_batch(self) -> int:
+        try:
+            return int(self.client.get_max_batch_size())
+        except Exception:
+            return DEFAULT_MAX_BATCH
+
+    def _write_many(
+        self,
+        method: str,
+        category: str,
+        ids: List[str],
+        texts: List[str],
+        metadatas: Optional[List[Optional[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Shared body of add_many / upsert_many: one batched embedding request,
+        then one Chroma call per max-batch-size slice. If a slice is rejected
+        (e.g. a duplicate id on add), its rows are retried one by one so each
+        item gets its own result.
+        """
+        collection = self._collection(category)
+        metadatas = metadatas or [None] * len(texts)
+        if not (len(ids) == len(texts) == len(metadatas)):
+            raise ValueError("ids, texts and metadatas must have the same length")
+        now = time.time()
+        kept = self._usage_metadata(collection, ids) if method == "upsert" else {}
+        metadatas = [{CREATED_AT: now, **kept.get(i, {}), **(m or {})} for i, m in zip(ids, metadatas)]
+
+        results: List[Dict[str, Any]] = [{"id": i, "ok": False} for i in ids]
+        embeddings = get_embeddings(texts) if texts else []
+        rows = []
+        for pos, emb in enumerate(embeddings):
+            if emb:
+                rows.append(pos)
+            else:
+                results[pos]["error"] = "Failed to compute embedding for text."
+
+        write = getattr(collection, method)
+        step = self._max_batch()
+        for start in range(0, len(rows), step):
+            part = rows[start:start + step]
+            try:
+                write(
+                    ids=[ids[p] for p in part],
+                    documents=[texts[p] for p in part],
+                    metadatas=[metadatas[p] for p in part],
+                    embeddings=[embeddings[p] for p in part],
+                )
+                for p in part:
+                    results[p]["ok"] = True
+            except Exception as e:
+                print(f"[MemoryStore] Batch {method} of {len(part)} failed ({e}); retrying per item")
+                for p in part:
+                    try:
+                        write(ids=[ids[p]], documents=[texts[p]],
+                              metadatas=[metadatas[p]], embeddings=[embeddings[p]])
+                        results[p]["ok"] = True
+                    except Exception as item_error:
+                        results[p]["error"] = str(item_error)
+        return results
+
+    @staticmethod
+    def _usage_metadata(collection, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """USAGE_KEYS of the entries among `ids` that already exist."""
+        try:
+            res = collection.get(ids=list(ids), include=["metadatas"])
+        except Exception as e:
+            print(f"[MemoryStore] Could not read existing metadata: {e}")
+            return {}
+        found = res.get("ids") or []
+        metas = res.get("metadatas") or [None] * len(found)
+        return {i: {k: m[k] for k in USAGE_KEYS if k in m} for i, m in zip(found, metas) if m}
+
+    def add_many(
+        self,
+        category: str,
+        texts: List[str],
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+        ids: Optional[List[Optional[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Add several texts to one collection with one embedding request and
+        one Chroma write.
+
+        Returns:
+            List[Dict]: One result per text, in order: {"id", "ok"} plus "error" on failure.
+        """
+        metadatas = metadatas or [None] * len(texts)
+        ids = ids or [None] * len(texts)
+        doc_ids = [i or (m or {}).get("id") or str(uuid.uuid4()) for i, m in zip(ids, metadatas)]
+        return self._write_many("add", category, doc_ids, texts, metadatas)
+
+    def upsert_many(
+        self,
+        category: str,
+        ids: List[str],
+        texts: List[str],
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Batched `upsert`; same result format as `add_many`.
+        """
+        return self._write_many("upsert", category, list(ids), texts, metadatas)
+
+    def query_many(self, category: str, texts: List[str], top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Run several similarity queries against one collection with one
+        embedding request and one Chroma query.
+
+        Returns:
+            List[Dict]: Per query, a result shaped like `query`'s (lists of one
+            list); failed queries get empty lists and an "error" key.
+        """
+        collection = self._collection(category)
+        results = [_empty_query_result("Failed to compute embedding for text.") for _ in texts]
+        embeddings = get_embeddings(texts) if texts else []
+        rows = [pos for pos, emb in enumerate(embeddings) if emb]
+        if not rows:
+            return results
+
+        try:
+            res = collection.query(
+                query_embeddings=[embeddings[p] for p in rows],
+                n_results=top_k,
+                include=["documents", "metadatas", "distances"],
+            )
+        except Exception as e:
+            print(f"[MemoryStore] Batch query failed: {e}")
+            for p in rows:
+                results[p]["error"] = str(e)
+            return results
+
+        for n, p in enumerate(rows):
+            results[p] = {
+                key: [res[key][n]] if res.get(key) is not None else [[]]
+                for key in QUERY_KEYS
+            }
+        self._record_access(category, [i for r in results for i in r["ids"][0]])
+        return results
+
+    # ---------- cross-collection search ----------
+    def _query_embedding(self, category: str, emb: List[float], top_k: int) -> List[Dict[str, Any]]:
+        res = self._collections[category].query(
+            query_embeddings=[emb],
+            n_results=top_k,
+            include=["documents", "metadatas", "distances"],
+        )
+        ids = (res.get("ids") or [[]])[0]
+        docs = (res.get("documents") or [[]])[0]
+        metas = (res.get("metadatas") or [[]])[0] or [None] * len(ids)
+        dists = (res.get("distances") or [[]])[0]
+        return [
+            {"id": i, "category": category, "document": d, "metadata": m or {}, "distance": float(dist)}
+            for i, d, m, dist in zip(ids, docs, metas, dists)
+        ]
+
+    def _get_search_pool(self) -> ThreadPoolExecutor:
+        # The shared store is searched from several threads; create one pool only
+        with self._search_pool_lock:
+            if self._search_pool is None:
+                self._search_pool = ThreadPoolExecutor(
+                    max_workers=len(COLLECTIONS), thread_name_prefix="memory-search"
+                )
+            return self._search_pool
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        categories: Optional[List[str]] = None,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search all collections for `query` and return one ranked list.
+
+        The query is embedded once and the collections are queried
+        concurrently, so latency follows the slowest collection rather than
+        the sum. Hits are ranked by distance / weight (see SEARCH_WEIGHTS).
+
+        Returns:
+            List[Dict]: Up to top_k hits, best first, each with
+            id, category, document, metadata, distance and score.
+        """
+        categories = list(categories or COLLECTIONS)
+        for category in categories:
+            self._collection(category)
+        weights = {**SEARCH_WEIGHTS, **(weights or {})}
+
+        emb = get_embedding(query) if query else []
+        if not emb:
+            return []
+
+        pool = self._get_search_pool()
+        futures = {c: pool.submit(self._query_embedding, c, emb, top_k) for c in categories}
+
+        hits: List[Dict[str, Any]] = []
+        for category, future in futures.items():
+            try:
+                hits.extend(future.result())
+            except Exception as e:
+                print(f"[MemoryStore] Search in {category} failed: {e}")
+
+        for hit in hits:
+            hit["score"] = hit["distance"] / max(weights.get(hit["category"], 1.0), 1e-9)
+        hits.sort(key=lambda h: h["score"])
+        hits = hits[:top_k]
+        for category in categories:
+            self._record_access(category, [h["id"] for h in hits if h["category"] == category])
+        return hits
+
     def get(self, category: str, id: str):
         if category not in self._collections:
             raise ValueError(f"Unknown collection: {category}")
 
         try:
-            return self._collections[category].get(ids=[id])
+            res = self._collections[category].get(ids=[id])
+            self._record_access(category, (res or {}).get("ids") or [])
+            return res
         except Exception as e:
             print(f"[MemoryStore] Get failed: {e}")
             traceback.print_exc()
@@ -168,3 +413,99 @@ class MemoryStore:
             print(f"[MemoryStore] Delete failed: {e}")
             traceback.print_exc()
             return False
+
+
+    # ---------- usage statistics & compaction ----------
+    def _record_access(self, category: str, ids: List[str]):
+        if not ids:
+            return
+        now = time.time()
+        with self._access_lock:
+            counts = self._access.setdefault(category, {})
+            for i in ids:
+                entry = counts.setdefault(i, [0, now])
+                entry[0] += 1
+                entry[1] = now
+            self._access_pending += len(ids)
+            flush = self._access_pending >= ACCESS_FLUSH_EVERY
+        if flush:
+            self.flush_access_stats()
+
+    def flush_access_stats(self):
+        """
+        Write buffered read counts into entry metadata (access_count, last_accessed).
+        """
+        with self._access_lock:
+            pending, self._access, self._access_pending = self._access, {}, 0
+
+        for category, counts in pending.items():
+            try:
+                collection = self._collections[category]
+                res = collection.get(ids=list(counts), include=["metadatas"])
+                ids = res.get("ids") or []
+                metas = res.get("metadatas") or [None] * len(ids)
+                updated = []
+                for i, meta in zip(ids, metas):
+                    meta = dict(meta or {})
+                    reads, last = counts[i]
+                    meta[ACCESS_COUNT] = int(meta.get(ACCESS_COUNT, 0)) + int(reads)
+                    meta[LAST_ACCESSED] = max(float(meta.get(LAST_ACCESSED, 0)), last)
+                    updated.append(meta)
+                if ids:
+                    collection.update(ids=ids, metadatas=updated)
+            except Exception as e:
+                print(f"[MemoryStore] Could not save access stats for {category}: {e}")
+
+    def compact(
+        self,
+        categories: Optional[List[str]] = None,
+        dry_run: bool = False,
+        **options,
+    ) -> Dict[str, CompactionStats]:
+        """
+        Merge near-duplicates and evict stale entries in each collection.
+        Options are those of compaction.plan_compaction (similarity,
+        max_age_days, keep_if_accessed, max_items).
+        """
+        self.flush_access_stats()
+        report = {}
+        for category in categories or list(self._collections):
+            stats = compact_collection(self._collection(category), dry_run=dry_run, **options)
+            report[category] = stats
+            print(
+                f"[MemoryStore] {'Would compact' if dry_run else 'Compacted'} {category}: "
+                f"{stats.before} → {stats.after} (merged {stats.merged}, evicted {stats.evicted})"
+            )
+        return report
+
+
+# Stores with read counts that may still need writing at exit. Weak, so a
+# store that has been dropped (and maybe its directory deleted) is skipped.
+_live_stores: "weakref.WeakSet[MemoryStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_stores():
+    for store in list(_live_stores):
+        if store._access and os.path.isdir(store.persist_directory):
+            store.flush_access_stats()
+
+
+_store: Optional[MemoryStore] = None
+_store_lock = threading.Lock()
+_store_failed = False
+
+
+def get_memory_store() -> Optional[MemoryStore]:
+    """
+    Shared MemoryStore (backend opened on first use), or None if it cannot be created.
+    """
+    global _store, _store_failed
+    with _store_lock:
+        if _store is None and not _store_failed:
+            try:
+                _store = MemoryStore()
+            except Exception as e:
+                print(f"[MemoryStore] Unavailable, continuing without memory: {e}")
+                _store_failed = True
+        return _store
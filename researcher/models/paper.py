@@ -1,13 +1,77 @@
+import json
+import marshal
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Paper:
+    """
+    Compact, serializable paper record.
+
+    Only the fields every stage needs are stored as attributes. Optional
+    metadata (categories, DOI, comments, ...) is kept as a compact JSON string
+    in `extras_json` and only decoded when `extras` is accessed.
+    """
     title: str
     summary: str
     authors: List[str]
     published: str
     pdf_url: Optional[str]
     arxiv_id: Optional[str]
-    raw_entry: dict
+    extras_json: str = ""
+
+    @property
+    def extras(self) -> Dict[str, Any]:
+        return json.loads(self.extras_json) if self.extras_json else {}
+
+    @property
+    def raw_entry(self) -> Dict[str, Any]:
+        """Backwards-compatible alias for `extras`."""
+        return self.extras
+
+    # ---------- serialization ----------
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "summary": self.summary,
+            "authors": list(self.authors),
+            "published": self.published,
+            "pdf_url": self.pdf_url,
+            "arxiv_id": self.arxiv_id,
+            "extras_json": self.extras_json,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Paper":
+        return cls(
+            title=data.get("title", ""),
+            summary=data.get("summary", ""),
+            authors=list(data.get("authors", [])),
+            published=data.get("published", ""),
+            pdf_url=data.get("pdf_url"),
+            arxiv_id=data.get("arxiv_id"),
+            extras_json=data.get("extras_json", ""),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Paper":
+        return cls.from_dict(json.loads(raw))
+
+    def to_bytes(self) -> bytes:
+        """
+        Fast binary encoding for passing papers between processes.
+        Uses `marshal`, so the format is tied to the Python version; use
+        `to_json` for anything persisted long-term.
+        """
+        return marshal.dumps((
+            self.title, self.summary, list(self.authors), self.published,
+            self.pdf_url, self.arxiv_id, self.extras_json,
+        ))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "Paper":
+        return cls(*marshal.loads(raw))
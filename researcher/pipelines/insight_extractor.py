@@ -1,22 +1,36 @@
-from researcher.llm.llm import generate
+from typing import Iterator, Optional
+from researcher.llm.llm import generate, stream_generate
 
-def extract_insights(text: str) -> str:
-    """
-    Extracts key insights from research text using the global LLM provider.
-    """
-    if not text.strip():
-        return "No input text provided."
-
-    prompt = f"""
+def _build_prompt(text: str, num_insights: Optional[int] = None) -> str:
+    count = f"Extract exactly {num_insights} insights.\n" if num_insights else ""
+    return f"""
 You are an expert academic analyst.
 
 Extract the **key insights**, **findings**, and **important contributions**
 from the following research text. Present the insights as a structured,
 bullet-point list. Keep them factual and concise. Avoid hallucinations.
-
+{count}
 TEXT:
 {text}
 
 INSIGHTS:
 """
-    return generate(prompt)
+
+def extract_insights(text: str, num_insights: Optional[int] = None) -> str:
+    """
+    Extracts key insights from research text using the global LLM provider.
+    """
+    if not text.strip():
+        return "No input text provided."
+
+    return generate(_build_prompt(text, num_insights))
+
+def stream_insights(text: str, num_insights: Optional[int] = None) -> Iterator[str]:
+    """
+    Same as `extract_insights`, but yields the insights as they are generated.
+    """
+    if not text.strip():
+        yield "No input text provided."
+        return
+
+    yield from stream_generate(_build_prompt(text, num_insights))
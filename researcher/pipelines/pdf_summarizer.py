@@ -1,13 +1,18 @@
-from researcher.llm.llm import generate
+from typing import Iterator, List
+from researcher.llm.llm import generate, generate_many, stream_generate
+from researcher.utils.token_utils import count_tokens, pack_by_tokens, split_by_tokens
 
-def summarize_pdf_text(paper_text: str) -> str:
-    """
-    Summarizes full text extracted from a research paper using the global LLM provider (Groq for now).
-    """
-    if not paper_text.strip():
-        return "No paper text provided."
+# Token budgets. Papers under SINGLE_PASS_TOKENS are summarized in one request;
+# longer ones are split into sections of MAP_CHUNK_TOKENS, summarized in
+# parallel, and the section summaries are merged in groups of at most
+# REDUCE_INPUT_TOKENS until one summary remains.
+SINGLE_PASS_TOKENS = 3000
+MAP_CHUNK_TOKENS = 2500
+REDUCE_INPUT_TOKENS = 3000
+MAX_REDUCE_DEPTH = 5
 
-    prompt = f"""
+def _build_prompt(paper_text: str) -> str:
+    return f"""
 You are an expert academic summarizer.
 
 Your task is to summarize the following research paper text into a clear,
@@ -19,4 +24,122 @@ TEXT:
 
 SUMMARY:
 """
-    return generate(prompt)
+
+def _build_section_prompt(section_text: str, index: int, total: int) -> str:
+    return f"""
+You are an expert academic summarizer.
+
+The following text is part {index} of {total} of a research paper.
+Summarize it concisely, keeping every contribution, method detail, result and
+number it contains. Do not speculate about other parts of the paper.
+
+TEXT:
+{section_text}
+
+SECTION SUMMARY:
+"""
+
+def _build_reduce_prompt(summaries: List[str]) -> str:
+    joined = "\n\n".join(f"[{i}] {s}" for i, s in enumerate(summaries, 1))
+    return f"""
+You are an expert academic summarizer.
+
+Below are summaries of consecutive parts of one research paper, in order.
+Merge them into a single clear, concise, and cohesive summary. Highlight the
+core contributions, methodology, and findings. Remove repetition, avoid
+hallucinations and stay loyal to the summaries.
+
+PART SUMMARIES:
+{joined}
+
+SUMMARY:
+"""
+
+def _summarize_sections(sections: List[str]) -> List[str]:
+    """
+    Map step: summarize every section concurrently.
+    Section prompts depend only on the section text and position, so the
+    LLM response cache serves them again when a paper is re-summarized
+    after the merge prompt changes.
+    """
+    total = len(sections)
+    prompts = [_build_section_prompt(s, i, total) for i, s in enumerate(sections, 1)]
+    return generate_many(prompts)
+
+def _reduce_prompt_groups(summaries: List[str]) -> List[List[str]]:
+    """
+    Reduce step input: pack consecutive summaries into groups that fit the budget.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for s in summaries:
+        tokens = count_tokens(s)
+        if current and current_tokens + tokens > REDUCE_INPUT_TOKENS:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(s)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+def _reduce_to_fit(summaries: List[str]) -> List[str]:
+    """
+    Merge summaries in parallel groups until they fit one final prompt.
+    """
+    depth = 0
+    while count_tokens("\n\n".join(summaries)) > REDUCE_INPUT_TOKENS and depth < MAX_REDUCE_DEPTH:
+        groups = _reduce_prompt_groups(summaries)
+        if len(groups) == len(summaries):
+            # every summary is over budget on its own — cut them down to size
+            summaries = pack_by_tokens(summaries, REDUCE_INPUT_TOKENS // 2)
+            groups = _reduce_prompt_groups(summaries)
+        summaries = generate_many([_build_reduce_prompt(g) for g in groups])
+        depth += 1
+    return summaries
+
+def _map_reduce_prompt(paper_text: str) -> str:
+    """
+    Map and reduce steps of `map_reduce_summarize`: returns the final merge prompt.
+    """
+    sections = split_by_tokens(paper_text, MAP_CHUNK_TOKENS)
+    partials = _reduce_to_fit(_summarize_sections(sections))
+    return _build_reduce_prompt(partials)
+
+def _final_prompt(paper_text: str) -> str:
+    """
+    The prompt whose answer is the summary: the whole text for short papers,
+    the last merge step for long ones.
+    """
+    if count_tokens(paper_text) <= SINGLE_PASS_TOKENS:
+        return _build_prompt(paper_text)
+    return _map_reduce_prompt(paper_text)
+
+def summarize_pdf_text(paper_text: str) -> str:
+    """
+    Summarizes full text extracted from a research paper using the global LLM provider (Groq for now).
+    Long papers are summarized hierarchically (see `map_reduce_summarize`).
+    """
+    if not paper_text.strip():
+        return "No paper text provided."
+    return generate(_final_prompt(paper_text))
+
+def map_reduce_summarize(paper_text: str) -> str:
+    """
+    Hierarchical summary for texts too long for one request:
+    1) split into token-bounded sections
+    2) summarize sections in parallel (map)
+    3) merge section summaries recursively until one prompt fits (reduce)
+    """
+    return generate(_map_reduce_prompt(paper_text))
+
+def stream_pdf_summary(paper_text: str) -> Iterator[str]:
+    """
+    Same as `summarize_pdf_text`, but yields the summary as it is generated.
+    For long papers only the final merge step is streamed.
+    """
+    if not paper_text.strip():
+        yield "No paper text provided."
+        return
+    yield from stream_generate(_final_prompt(paper_text))
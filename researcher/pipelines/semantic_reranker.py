@@ -2,7 +2,7 @@ from typing import List
 import numpy as np
 
 from researcher.models.paper import Paper
-from researcher.llm.embeddings import get_embedding
+from researcher.llm.embeddings import get_embeddings
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     """
@@ -12,6 +12,17 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
         return 0.0
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
+def cosine_similarities(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of every row in `matrix` against `vector`, in one
+    matrix–vector product. Zero rows score 0.0.
+    """
+    row_norms = np.linalg.norm(matrix, axis=1)
+    vec_norm = np.linalg.norm(vector)
+    denom = row_norms * vec_norm
+    scores = matrix @ vector
+    return np.divide(scores, denom, out=np.zeros_like(scores), where=denom > 0)
+
 def rerank_papers_by_semantics(
     query: str,
     papers: List[Paper],
@@ -25,25 +36,24 @@ def rerank_papers_by_semantics(
     if not papers:
         return []
 
-    # 1. Embed the query
-    query_emb = np.array(get_embedding(query))
-
-    scored_papers = []
-
-    for paper in papers:
-        # 2. Combine metadata for embedding
-        combined_text = f"{paper.title}\n\n{paper.summary}"
-
-        # 3. Get embedding for the paper
-        paper_emb = np.array(get_embedding(combined_text))
+    # 1. Embed the query and every paper (title + abstract) in one batched call
+    texts = [query] + [f"{paper.title}\n\n{paper.summary}" for paper in papers]
+    embeddings = get_embeddings(texts)
 
-        # 4. Compute similarity
-        score = cosine_similarity(query_emb, paper_emb)
+    query_emb = np.asarray(embeddings[0], dtype=np.float32)
+    if query_emb.size == 0:
+        return papers[:top_k]
 
-        scored_papers.append((score, paper))
+    # 2. Stack paper embeddings into a matrix (failed embeddings become zero rows)
+    dim = query_emb.shape[0]
+    matrix = np.zeros((len(papers), dim), dtype=np.float32)
+    for i, emb in enumerate(embeddings[1:]):
+        if len(emb) == dim:
+            matrix[i] = emb
 
-    # 5. Sort papers by score (highest first)
-    scored_papers.sort(reverse=True, key=lambda x: x[0])
+    # 3. Score all candidates at once
+    scores = cosine_similarities(matrix, query_emb)
 
-    # 6. Return top_k
-    return [p for _, p in scored_papers[:top_k]]
\ No newline at end of file
+    # 4. Sort papers by score (highest first, stable for ties) and return top_k
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    return [papers[i] for i in order]
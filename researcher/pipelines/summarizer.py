@@ -1,10 +1,8 @@
-from researcher.llm.llm import generate
+from typing import Iterator, List
+from researcher.llm.llm import generate, generate_many, stream_generate
 
-def summarize_text(text: str) -> str:
-    """
-    Summarizes a block of text using the global LLM provider (Groq for now).
-    """
-    prompt = f"""
+def _build_prompt(text: str) -> str:
+    return f"""
 You are an expert academic summarizer.
 
 Summarize the following text in a clear, structured, and factual way.
@@ -15,4 +13,22 @@ TEXT:
 
 SUMMARY:
 """
-    return generate(prompt)
+
+def summarize_text(text: str) -> str:
+    """
+    Summarizes a block of text using the global LLM provider (Groq for now).
+    """
+    return generate(_build_prompt(text))
+
+def stream_summary(text: str) -> Iterator[str]:
+    """
+    Same as `summarize_text`, but yields the summary as it is generated.
+    """
+    yield from stream_generate(_build_prompt(text))
+
+def summarize_texts(texts: List[str]) -> List[str]:
+    """
+    Summarizes several texts (e.g. one abstract per paper) concurrently.
+    Results are returned in the same order as `texts`.
+    """
+    return generate_many([_build_prompt(t) for t in texts])
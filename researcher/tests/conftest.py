@@ -0,0 +1,6 @@
+# researcher/tests/conftest.py
+import os
+
+# Importing the agents, fetcher or llm module builds the global LLM router,
+# which needs a key; the unit tests never call the API with it.
+os.environ.setdefault("GROQ_API_KEY", "test-key")
@@ -0,0 +1,54 @@
+# researcher/tests/stubs.py
+"""Offline stand-ins shared by the unit tests."""
+import hashlib
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from langchain_core.embeddings import Embeddings
+
+
+class StubArxivClient:
+    """Offline stand-in for arxiv.Client: every query returns the same two papers after a delay."""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def results(self, search):
+        with self._lock:
+            self.queries.append(search.query)
+        time.sleep(self.delay)
+        for n in (1, 2):
+            yield SimpleNamespace(
+                entry_id=f"http://arxiv.org/abs/2401.0000{n}v1",
+                title=f" Paper {n} ",
+                summary="Abstract",
+                authors=[SimpleNamespace(name="A. Author")],
+                published=datetime(2024, 1, n),
+                pdf_url=f"http://arxiv.org/pdf/2401.0000{n}v1",
+            )
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic bag-of-words embeddings; counts how many texts were embedded."""
+
+    dim = 32
+
+    def __init__(self):
+        self.embedded = 0
+
+    def _vec(self, text):
+        v = [0.0] * self.dim
+        for word in text.lower().split():
+            v[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        return v
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [self._vec(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vec(text)
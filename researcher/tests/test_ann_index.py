@@ -0,0 +1,83 @@
+# researcher/tests/test_ann_index.py
+import faiss
+import pytest
+from langchain_core.documents import Document
+
+from researcher.data import ann_index
+from researcher.data.ann_index import ANNConfig
+from researcher.data.rag_index import RAGIndexManager
+from researcher.tests.stubs import HashEmbeddings
+
+
+def test_small_corpus_stays_exact():
+    vectors = ann_index._synthetic_vectors(100, 16)
+    index = ann_index.build_index(vectors, ANNConfig(index_type="ivf_flat", min_vectors=1000))
+    assert ann_index.index_type_of(index) == "flat"
+
+
+@pytest.mark.parametrize("index_type", ["ivf_flat", "hnsw", "ivf_pq"])
+def test_benchmark_reports_recall_against_flat(index_type):
+    vectors = ann_index._synthetic_vectors(3000, 32)
+    queries = vectors[:20]
+    cfg = ANNConfig(index_type=index_type, nprobe=32, ef_search=128, pq_nbits=6)
+    flat, ann = ann_index.benchmark(vectors, queries, k=5, configs=[ANNConfig(), cfg])
+
+    assert flat["recall"] == 1.0
+    assert ann["index_type"] == index_type
+    assert ann["recall"] > (0.3 if index_type == "ivf_pq" else 0.8)
+    if index_type == "ivf_pq":
+        assert ann["mbytes"] < flat["mbytes"]
+
+
+def test_search_params_apply():
+    vectors = ann_index._synthetic_vectors(2000, 16)
+    ivf = ann_index.build_index(vectors, ANNConfig(index_type="ivf_flat", nprobe=3), force=True)
+    assert faiss.extract_index_ivf(ivf).nprobe == 3
+    hnsw = ann_index.build_index(vectors, ANNConfig(index_type="hnsw"), force=True)
+    ann_index.set_search_params(hnsw, ef_search=200)
+    assert hnsw.hnsw.efSearch == 200
+
+
+def test_manager_upgrades_to_hnsw_and_removes(tmp_path):
+    docs = [
+        [Document(page_content=f"paper {i} about topic{i} and method{i}", metadata={})]
+        for i in range(12)
+    ]
+    manager = RAGIndexManager(
+        str(tmp_path), embedding_model=HashEmbeddings(),
+        ann_config=ANNConfig(index_type="hnsw", min_vectors=8),
+    )
+    hashes = [manager.add_documents(d) for d in docs]
+    assert ann_index.index_type_of(manager.vectorstore.index) == "hnsw"
+
+    assert manager.remove_document(hashes[3])
+    texts = [d.page_content for d in manager.retrieve("topic3 method3", top_k=12, mode="dense")]
+    assert len(texts) == 11
+    assert "paper 3 about topic3 and method3" not in texts
+
+    reloaded = RAGIndexManager(
+        str(tmp_path), embedding_model=HashEmbeddings(),
+        ann_config=ANNConfig(index_type="hnsw", min_vectors=8),
+    )
+    assert len(reloaded.retrieve("topic5", top_k=12, mode="dense")) == 11
+
+
+@pytest.mark.parametrize("index_type", ["ivf_flat", "ivf_pq"])
+def test_manager_removes_from_ivf_then_searches_and_adds(tmp_path, index_type):
+    cfg = ANNConfig(index_type=index_type, min_vectors=16, nlist=2, nprobe=2, pq_m=4, pq_nbits=4)
+    manager = RAGIndexManager(str(tmp_path), embedding_model=HashEmbeddings(), ann_config=cfg)
+    hashes = [
+        manager.add_documents([Document(page_content=f"paper {i} about topic{i} and method{i}", metadata={})])
+        for i in range(40)
+    ]
+    assert ann_index.index_type_of(manager.vectorstore.index) == index_type
+
+    assert manager.remove_document(hashes[3])
+    texts = [d.page_content for d in manager.retrieve("topic7 method7", top_k=50, mode="dense")]
+    assert len(texts) == 39 and "paper 3 about topic3 and method3" not in texts
+
+    # new rows must not collide with surviving ids
+    manager.add_documents([Document(page_content="paper 40 about topic40", metadata={})])
+    texts = [d.page_content for d in manager.retrieve("topic40", top_k=50, mode="dense")]
+    assert len(texts) == len(set(texts)) == 40
+    assert "paper 40 about topic40" in texts
@@ -0,0 +1,49 @@
+# researcher/tests/test_arxiv_cache.py
+import time
+
+from researcher.data import arxiv_fetcher
+from researcher.data.arxiv_cache import ArxivCache
+from researcher.tests.stubs import StubArxivClient
+
+
+def _use_cache(monkeypatch, tmp_path, ttl):
+    cache = ArxivCache(str(tmp_path / "arxiv.sqlite"), ttl_seconds=ttl)
+    monkeypatch.setattr(arxiv_fetcher, "_cache", cache)
+    monkeypatch.setattr(arxiv_fetcher, "_rate_limiter", arxiv_fetcher._RateLimiter(0.0))
+    return cache
+
+
+def test_key_uses_normalized_query_and_ignores_category_order():
+    k1 = ArxivCache.make_key("rag evals", ["cs.CL", "cs.AI"], "relevance", "descending", 25)
+    k2 = ArxivCache.make_key("rag evals", ["cs.AI", "cs.CL"], "relevance", "descending", 25)
+    k3 = ArxivCache.make_key("rag evals", ["cs.AI", "cs.CL"], "relevance", "descending", 10)
+    assert k1 == k2
+    assert k1 != k3
+
+
+def test_fresh_hit_skips_network(monkeypatch, tmp_path):
+    _use_cache(monkeypatch, tmp_path, ttl=3600)
+    client = StubArxivClient(delay=0)
+
+    first = arxiv_fetcher.fetch_arxiv_candidates("rag  evals", client=client)
+    second = arxiv_fetcher.fetch_arxiv_candidates(" rag evals\n", client=client)
+
+    assert len(client.queries) == 1
+    assert [p.arxiv_id for p in second] == [p.arxiv_id for p in first]
+    assert second[0].title == "Paper 1"
+
+
+def test_stale_hit_is_served_and_refreshed_in_background(monkeypatch, tmp_path):
+    cache = _use_cache(monkeypatch, tmp_path, ttl=0)
+    client = StubArxivClient(delay=0)
+
+    arxiv_fetcher.fetch_arxiv_candidates("rag evals", client=client)
+    stale = arxiv_fetcher.fetch_arxiv_candidates("rag evals", client=client)
+    assert [p.arxiv_id for p in stale] == ["2401.00001v1", "2401.00002v1"]
+
+    deadline = time.time() + 2
+    while len(client.queries) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(client.queries) == 2
+
+    assert cache.get_papers(["2401.00002v1"])[0].title == "Paper 2"
@@ -0,0 +1,71 @@
+# researcher/tests/test_arxiv_concurrent.py
+import threading
+import time
+
+from researcher.data import arxiv_fetcher
+from researcher.models.paper import Paper
+from researcher.tests.stubs import StubArxivClient
+
+
+def test_queries_are_fetched_concurrently(monkeypatch):
+    monkeypatch.setattr(arxiv_fetcher, "_rate_limiter", arxiv_fetcher._RateLimiter(0.0))
+    monkeypatch.setattr(arxiv_fetcher, "_cache", None)
+    monkeypatch.setattr(arxiv_fetcher, "ARXIV_CACHE_ENABLED", False)
+    client = StubArxivClient(delay=0.2)
+    queries = [f"query {i}" for i in range(6)]
+
+    start = time.monotonic()
+    results = dict(arxiv_fetcher.fetch_candidates_concurrently(queries, candidate_count=5, client=client))
+    elapsed = time.monotonic() - start
+
+    assert sorted(results) == sorted(queries)
+    assert sorted(client.queries) == sorted(queries)
+    assert all([p.arxiv_id for p in papers] == ["2401.00001v1", "2401.00002v1"] for papers in results.values())
+    assert results["query 0"][0].title == "Paper 1"
+    assert results["query 0"][0].published == "2024-01-01"
+    assert elapsed < 0.2 * len(queries) / 2
+
+
+def test_search_merges_in_query_order_not_arrival_order(monkeypatch):
+    def paper(arxiv_id, title):
+        return Paper(title=title, summary="", authors=[], published="", pdf_url=None, arxiv_id=arxiv_id)
+
+    by_query = {
+        "rag": [paper("1", "from rag"), paper("2", "from rag")],
+        "rag evals": [paper("2", "from evals"), paper("3", "from evals")],
+        "rag metrics": [paper("3", "from metrics"), paper("4", "from metrics")],
+    }
+    reranked = []
+
+    def fetch(queries, **kwargs):
+        for q in reversed(queries):  # the last query answers first
+            yield q, by_query[q]
+
+    monkeypatch.setattr(arxiv_fetcher, "expand_query", lambda query, n: ["rag evals", "rag metrics"])
+    monkeypatch.setattr(arxiv_fetcher, "fetch_candidates_concurrently", fetch)
+    monkeypatch.setattr(arxiv_fetcher, "rerank_papers_by_semantics",
+                        lambda query, papers, top_k: reranked.append(papers) or papers[:top_k])
+
+    arxiv_fetcher.search_papers("rag", n_results=2)
+    assert [(p.arxiv_id, p.title) for p in reranked[0]] == [
+        ("1", "from rag"), ("2", "from rag"), ("3", "from evals"), ("4", "from metrics"),
+    ]
+
+
+def test_rate_limiter_spaces_request_starts():
+    limiter = arxiv_fetcher._RateLimiter(0.05)
+    starts = []
+
+    def hit():
+        limiter.wait()
+        starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=hit) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(g >= 0.04 for g in gaps)
@@ -0,0 +1,85 @@
+# researcher/tests/test_bm25_hybrid.py
+from langchain_core.documents import Document
+
+from researcher.data.bm25_index import (
+    BM25Index,
+    is_lexical_query,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from researcher.data.rag_index import RAGIndexManager
+from researcher.tests.stubs import HashEmbeddings
+
+TEXTS = {
+    "a": "We fine-tune bge-small-en-v1.5 on the MS MARCO passage ranking dataset.",
+    "b": "Attention is computed as softmax(QK^T / sqrt(d)) V in every layer.",
+    "c": "Graph neural networks aggregate messages from neighbouring nodes.",
+    "d": "ResNet-50 is trained on ImageNet for 90 epochs.",
+}
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    terms = tokenize("Using bge-small-en-v1.5 and GPT-4")
+    assert "bge-small-en-v1.5" in terms and "bge" in terms
+    assert "gpt-4" in terms and "gpt" in terms
+    assert "and" not in terms
+
+
+def test_bm25_ranks_and_survives_save_load(tmp_path):
+    index = BM25Index()
+    index.add(list(TEXTS), list(TEXTS.values()))
+    assert index.search("ResNet-50 ImageNet", k=2)[0][0] == "d"
+
+    index.remove(["d"])
+    index.add(["e"], ["ImageNet classification with ResNet-50 baselines"])
+    index.save(str(tmp_path / "bm25.npz"))
+
+    loaded = BM25Index.load(str(tmp_path / "bm25.npz"))
+    assert len(loaded) == 4
+    assert [c for c, _ in loaded.search("ResNet-50", k=5)] == ["e"]
+    assert loaded.search("message passing graph", k=1)[0][0] == "c"
+    assert loaded.search("the of and") == []
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion([["x", "y", "z"], ["y", "w"]], k=60)
+    assert fused[0][0] == "y"
+    assert {d for d, _ in fused} == {"x", "y", "z", "w"}
+
+
+def test_lexical_query_detection():
+    assert is_lexical_query("ResNet-50")
+    assert is_lexical_query("bge-small-en-v1.5 MS-MARCO")
+    assert is_lexical_query('"message passing"')
+    assert is_lexical_query("QK^T / sqrt(d)")
+    assert not is_lexical_query("how do graph networks aggregate information")
+
+
+class _CountingEmbeddings(HashEmbeddings):
+    def __init__(self):
+        super().__init__()
+        self.queries = 0
+
+    def embed_query(self, text):
+        self.queries += 1
+        return super().embed_query(text)
+
+
+def test_manager_hybrid_and_lexical_modes(tmp_path):
+    emb = _CountingEmbeddings()
+    manager = RAGIndexManager(str(tmp_path), embedding_model=emb)
+    for name, text in TEXTS.items():
+        manager.add_documents([Document(page_content=text, metadata={"name": name})], source=name)
+
+    # identifier query: answered by BM25 alone, no query embedding
+    docs = manager.retrieve("ResNet-50", top_k=2)
+    assert docs[0].metadata["name"] == "d"
+    assert emb.queries == 0
+
+    docs = manager.retrieve("how do networks aggregate messages", top_k=2, mode="hybrid")
+    assert docs[0].metadata["name"] == "c"
+    assert emb.queries == 1
+
+    manager.save()
+    reloaded = RAGIndexManager(str(tmp_path), embedding_model=emb)
+    assert reloaded.retrieve("bge-small-en-v1.5", top_k=1, mode="lexical")[0].metadata["name"] == "a"
@@ -0,0 +1,67 @@
+# researcher/tests/test_chunking.py
+from langchain_core.documents import Document
+
+from researcher.data import chunking
+from researcher.data.rag_index import RAGIndexManager, chunk_documents
+from researcher.data.rag_loader import split_documents
+from researcher.tests.stubs import HashEmbeddings
+
+
+def _docs(n, words=300):
+    return [
+        Document(
+            page_content=" ".join(f"doc{d} word{w}." for w in range(words)),
+            metadata={"source": f"file{d}.txt"},
+        )
+        for d in range(n)
+    ]
+
+
+def test_ids_are_stable_and_settings_shared():
+    a = chunk_documents(_docs(2))
+    b = split_documents(_docs(2))
+    assert [c.metadata["chunk_id"] for c in a] == [c.metadata["chunk_id"] for c in b]
+    assert len({c.metadata["chunk_id"] for c in a}) == len(a)
+    assert all(len(c.page_content) <= chunking.CHUNK_SIZE for c in a)
+    assert chunking.get_splitter() is chunking.get_splitter()
+
+
+def test_pool_output_matches_serial():
+    docs = _docs(12)
+    batches = [docs[i:i + 3] for i in range(0, len(docs), 3)]
+    serial = [c for chunks in chunking.map_ordered(chunking.split, iter(batches), workers=1) for c in chunks]
+    pooled = [c for chunks in chunking.map_ordered(chunking.split, iter(batches), workers=2, in_flight=2) for c in chunks]
+
+    assert [c.metadata["chunk_id"] for c in pooled] == [c.metadata["chunk_id"] for c in serial]
+    assert [c.page_content for c in pooled] == [c.page_content for c in serial]
+
+
+class _CountingCache:
+    """In-memory stand-in for EmbeddingCache (same get_many/put_many contract)."""
+
+    def __init__(self):
+        self.vectors = {}
+
+    def get_many(self, model, texts):
+        return [self.vectors.get((model, chunking.content_hash(t))) for t in texts]
+
+    def put_many(self, model, texts, vectors):
+        for t, v in zip(texts, vectors):
+            self.vectors[(model, chunking.content_hash(t))] = v
+
+
+def test_reingest_of_edited_file_only_embeds_changed_chunks(tmp_path):
+    emb = HashEmbeddings()
+    manager = RAGIndexManager(str(tmp_path), embedding_model=emb, embedding_cache=_CountingCache())
+
+    pages = [Document(page_content=" ".join(f"page{p} token{w}." for w in range(200)), metadata={"page": p})
+             for p in range(3)]
+    old_hash = manager.add_documents(pages, source="paper.pdf")
+    first = emb.embedded
+
+    edited = pages[:2] + [Document(page_content="A rewritten final page.", metadata={"page": 2})]
+    new_hash = manager.add_documents(edited, source="paper.pdf")
+
+    assert emb.embedded - first == 1          # only the rewritten page's chunk
+    assert not manager.has_document(old_hash)  # the old version was replaced
+    assert manager.has_document(new_hash)
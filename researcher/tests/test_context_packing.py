@@ -0,0 +1,62 @@
+# researcher/tests/test_context_packing.py
+from langchain_core.documents import Document
+
+from researcher.data.rag_index import chunk_documents
+from researcher.utils.context_packing import pack_context
+from researcher.utils.token_utils import count_tokens
+
+PAGE = " ".join(
+    f"Sentence {i} describes experiment {i} with a distinct result of {i * 7} percent."
+    for i in range(40)
+)
+
+
+def _chunks():
+    page = Document(page_content=PAGE, metadata={"source": "paper.pdf", "page": 0, "doc_hash": "h"})
+    return chunk_documents([page])
+
+
+def test_adjacent_chunks_merge_back_into_source_text():
+    chunks = _chunks()
+    assert len(chunks) > 3
+    packed = pack_context(chunks[:3], max_tokens=10_000)
+
+    assert packed.merged == 2
+    assert len(packed.chunks) == 1
+    assert packed.chunks[0] in PAGE
+    assert packed.tokens_saved > 0
+
+
+def test_near_duplicates_from_other_sources_are_dropped():
+    chunk = _chunks()[5]
+    copy = Document(page_content=chunk.page_content, metadata={"source": "copy.pdf"})
+    other = Document(page_content="Completely different passage about graphs.", metadata={})
+    packed = pack_context([chunk, copy, other], max_tokens=10_000)
+
+    assert packed.duplicates == 1
+    assert packed.chunks == [chunk.page_content, other.page_content]
+
+
+def test_budget_keeps_best_ranked_passages():
+    chunks = _chunks()
+    # non-adjacent chunks so nothing merges
+    picked = [chunks[6], chunks[0], chunks[3]]
+    budget = count_tokens(chunks[6].page_content) + count_tokens(chunks[0].page_content) + 5
+    packed = pack_context(picked, max_tokens=budget)
+
+    assert packed.chunks == [chunks[6].page_content, chunks[0].page_content]
+    assert packed.dropped == 1
+    assert packed.tokens_used <= budget
+
+
+def test_rag_answer_uses_packed_context(monkeypatch):
+    from researcher.agents import rag_qa_agent
+
+    prompts = []
+    monkeypatch.setattr(rag_qa_agent, "_retrieve", lambda q, k, r=None: _chunks()[:2])
+    monkeypatch.setattr(rag_qa_agent, "generate", lambda p: prompts.append(p) or "ok")
+
+    assert rag_qa_agent.rag_answer("what was measured?") == "ok"
+    context = prompts[0].split("CONTEXT:")[1].split("QUESTION:")[0].strip()
+    assert "\n\n" not in context  # the two overlapping chunks became one passage
+    assert context in PAGE
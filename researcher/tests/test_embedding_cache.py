@@ -0,0 +1,31 @@
+# researcher/tests/test_embedding_cache.py
+from researcher.llm.embedding_cache import EmbeddingCache, content_key
+
+
+def test_key_ignores_whitespace_differences():
+    assert content_key("deep  learning\n") == content_key("deep learning")
+    assert content_key("deep learning") != content_key("Deep learning")
+
+
+def test_roundtrip_persists_across_instances(tmp_path):
+    cache = EmbeddingCache(str(tmp_path))
+    cache.put_many("model-a", ["x", "y"], [[1.0, 2.0], [3.0, 4.0]])
+
+    reopened = EmbeddingCache(str(tmp_path))
+    assert reopened.get_many("model-a", ["y", "x", "z"]) == [[3.0, 4.0], [1.0, 2.0], None]
+    assert reopened.get_many("model-b", ["x"]) == [None]
+    assert reopened.stats()["hits"] == 2
+    assert reopened.stats()["misses"] == 2
+
+
+def test_lru_eviction_and_growth(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=3)
+    cache.INITIAL_CAPACITY = 2
+    cache.put_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+
+    cache.get_many("m", ["a"])  # "b" is now least recently used
+    cache.put_many("m", ["d"], [[4.0]])
+
+    assert cache.get_many("m", ["a", "b", "c", "d"]) == [[1.0], None, [3.0], [4.0]]
+    assert cache.stats()["entries"] == 3
+    assert cache.stats()["evictions"] == 1
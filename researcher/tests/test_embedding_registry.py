@@ -0,0 +1,68 @@
+# researcher/tests/test_embedding_registry.py
+import threading
+import time
+
+import pytest
+
+from researcher.llm import embedding_registry
+
+
+class _FakeModel:
+    def __init__(self, name):
+        self.name = name
+        self.queries = 0
+
+    def embed_query(self, text):
+        self.queries += 1
+        return [0.0]
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+
+    def fake_load(model_name, device, backend, batch_size):
+        calls.append((model_name, device, backend, batch_size))
+        time.sleep(0.05)  # widen the race window
+        return _FakeModel(model_name)
+
+    monkeypatch.setattr(embedding_registry, "_load", fake_load)
+    embedding_registry.clear()
+    yield calls
+    embedding_registry.clear()
+
+
+def test_concurrent_callers_share_one_load(loads):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(embedding_registry.get_embedding_model("m")))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loads) == 1
+    assert all(r is results[0] for r in results)
+    assert embedding_registry.get_embedding_model("other") is not results[0]
+    assert len(loads) == 2
+
+
+def test_rag_modules_use_registry_model(loads):
+    from researcher.data import rag_index, rag_loader
+
+    model = rag_index.get_embedding_model()
+    assert rag_loader.embedding_model is model
+    assert len(loads) == 1
+
+
+def test_warm_up_loads_and_encodes_once(loads, monkeypatch):
+    monkeypatch.setattr(embedding_registry, "LOCAL_EMBEDDING_WARMUP", True)
+    thread = embedding_registry.warm_up()
+    assert embedding_registry.warm_up() is thread
+    thread.join()
+
+    model = embedding_registry.get_embedding_model()
+    assert model.queries == 1
+    assert len(loads) == 1
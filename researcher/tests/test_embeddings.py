@@ -0,0 +1,98 @@
+# researcher/tests/test_embeddings.py
+from types import SimpleNamespace
+
+import pytest
+
+from researcher.llm import embeddings
+from researcher.llm.embedding_cache import EmbeddingCache
+
+
+class _FakeEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, model, input):
+        self.calls.append(list(input))
+        data = [SimpleNamespace(index=i, embedding=[float(len(t)), 1.0]) for i, t in enumerate(input)]
+        return SimpleNamespace(data=data)
+
+
+def _fake_client(monkeypatch):
+    fake = _FakeEmbeddings()
+    monkeypatch.setattr(embeddings, "_client", SimpleNamespace(embeddings=fake))
+    monkeypatch.setattr(embeddings, "_cache", None)
+    monkeypatch.setattr(embeddings, "EMBEDDING_CACHE_ENABLED", False)
+    return fake
+
+
+def test_batches_respect_input_and_token_limits():
+    texts = ["a" * 40] * 10  # ~10 tokens each
+    assert embeddings._make_batches(texts, max_inputs=4, max_tokens=1000) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert embeddings._make_batches(texts, max_inputs=100, max_tokens=25) == [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]]
+
+
+def test_get_embeddings_is_aligned_and_skips_empty(monkeypatch):
+    fake = _fake_client(monkeypatch)
+    result = embeddings.get_embeddings(["abc", "", "  ", "abcdef"])
+
+    assert len(fake.calls) == 1
+    assert fake.calls[0] == ["abc", "abcdef"]
+    assert result == [[3.0, 1.0], [], [], [6.0, 1.0]]
+
+
+def test_get_embedding_uses_batched_path(monkeypatch):
+    _fake_client(monkeypatch)
+    assert embeddings.get_embedding("hello") == [5.0, 1.0]
+    assert embeddings.get_embedding("") == []
+
+
+def test_get_embeddings_serves_repeats_from_cache(monkeypatch, tmp_path):
+    fake = _fake_client(monkeypatch)
+    monkeypatch.setattr(embeddings, "_cache", EmbeddingCache(str(tmp_path)))
+
+    first = embeddings.get_embeddings(["abc", "abcdef"])
+    second = embeddings.get_embeddings(["abcdef", "  abc  ", "xy"])
+
+    assert fake.calls == [["abc", "abcdef"], ["xy"]]
+    assert second == [first[1], first[0], [2.0, 1.0]]
+
+
+class _FakeLocalModel:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 2.0] for t in texts]
+
+
+def _no_api():
+    raise AssertionError("the local provider must not call the embeddings API")
+
+
+def test_local_provider_shares_the_rag_model_offline(monkeypatch, tmp_path):
+    from researcher.data import rag_index
+    from researcher.llm import embedding_registry
+
+    model = _FakeLocalModel()
+    monkeypatch.setattr(embedding_registry, "_load", lambda *args: model)
+    embedding_registry.clear()
+    monkeypatch.setattr(embeddings, "_get_client", _no_api)
+    monkeypatch.setattr(embeddings, "EMBEDDING_PROVIDER", "local")
+    monkeypatch.setattr(embeddings, "_cache", EmbeddingCache(str(tmp_path)))
+    try:
+        assert embeddings.get_embeddings(["abc", "", "abcdef"]) == [[3.0, 2.0], [], [6.0, 2.0]]
+        assert embeddings.get_embedding("abc") == [3.0, 2.0]  # from the cache
+        assert model.calls == [["abc", "abcdef"]]
+        assert rag_index.get_embedding_model() is model
+        assert embeddings.get_provider().model_name == rag_index.EMBEDDING_MODEL_NAME
+    finally:
+        embedding_registry.clear()
+
+
+def test_providers_must_implement_embed():
+    class Incomplete(embeddings.EmbeddingProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,83 @@
+# researcher/tests/test_faiss_store.py
+import os
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from researcher.data import faiss_store
+from researcher.data.rag_index import RAGIndexManager, _current_snapshot_dir
+from researcher.tests.stubs import HashEmbeddings
+
+
+def _store(emb):
+    docs = [Document(page_content=t, metadata={"n": i}) for i, t in enumerate(
+        ["alpha beta", "gamma delta", "epsilon zeta", "eta theta"]
+    )]
+    return FAISS.from_documents(docs, emb, ids=[f"id{i}" for i in range(4)])
+
+
+def test_round_trip_without_pickle(tmp_path):
+    emb = HashEmbeddings()
+    faiss_store.save_vectorstore(_store(emb), str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["docstore.sqlite", "ids.npy", "index.faiss"]
+
+    loaded = faiss_store.load_vectorstore(str(tmp_path), emb)
+    assert faiss_store.is_mmapped(loaded)
+    hit = loaded.similarity_search("gamma delta", k=1)[0]
+    assert hit.page_content == "gamma delta"
+    assert hit.metadata == {"n": 1}
+    assert len(loaded.index_to_docstore_id) == 4
+
+
+def test_rag_loader_writes_a_loadable_snapshot(tmp_path):
+    from researcher.data.rag_loader import create_faiss_index_from_documents
+
+    emb = HashEmbeddings()
+    docs = [Document(page_content=t) for t in ("alpha beta", "gamma delta")]
+    create_faiss_index_from_documents(docs, emb, str(tmp_path))
+    assert not any(name.endswith(".pkl") for name in os.listdir(tmp_path))
+
+    loaded = faiss_store.load_vectorstore(str(tmp_path), emb)
+    assert loaded.similarity_search("gamma delta", k=1)[0].page_content == "gamma delta"
+
+
+def test_writes_after_mmap_load_go_to_memory(tmp_path):
+    emb = HashEmbeddings()
+    faiss_store.save_vectorstore(_store(emb), str(tmp_path / "a"))
+    loaded = faiss_store.load_vectorstore(str(tmp_path / "a"), emb)
+
+    faiss_store.make_writable(loaded)
+    assert not faiss_store.is_mmapped(loaded)
+    loaded.add_texts(["iota kappa"], ids=["id4"])
+    loaded.delete(["id0"])
+
+    # the snapshot on disk is untouched until saved elsewhere
+    assert faiss_store.load_vectorstore(str(tmp_path / "a"), emb).index.ntotal == 4
+
+    faiss_store.save_vectorstore(loaded, str(tmp_path / "b"))
+    again = faiss_store.load_vectorstore(str(tmp_path / "b"), emb)
+    texts = {d.page_content for d in again.similarity_search("anything", k=10)}
+    assert texts == {"gamma delta", "epsilon zeta", "eta theta", "iota kappa"}
+
+
+def test_manager_snapshots_are_mmapped_and_switch_atomically(tmp_path):
+    emb = HashEmbeddings()
+    manager = RAGIndexManager(str(tmp_path), embedding_model=emb)
+    manager.add_documents([Document(page_content="graph neural networks", metadata={})])
+    manager.save()
+    first = _current_snapshot_dir(str(tmp_path))
+
+    reader = RAGIndexManager(str(tmp_path), embedding_model=emb)
+    assert faiss_store.is_mmapped(reader.vectorstore)
+    assert reader.retrieve("graph", top_k=1)[0].page_content == "graph neural networks"
+
+    manager.add_documents([Document(page_content="diffusion models", metadata={})])
+    manager.save()
+    assert _current_snapshot_dir(str(tmp_path)) != first
+    assert not os.path.exists(first)
+
+    # the writer keeps serving after compaction, from the new docstore file
+    assert {d.page_content for d in manager.retrieve("models", top_k=5)} == {
+        "graph neural networks", "diffusion models"
+    }
+    assert len(RAGIndexManager(str(tmp_path), embedding_model=emb).retrieve("x", top_k=5)) == 2
@@ -0,0 +1,105 @@
+# researcher/tests/test_ingest.py
+import os
+
+import pytest
+
+from researcher.data.ingest import ingest, iter_files
+from researcher.data.rag_index import RAGIndexManager
+from researcher.tests.stubs import HashEmbeddings
+
+
+def _corpus(root, n):
+    (root / "sub").mkdir(parents=True, exist_ok=True)
+    for i in range(n):
+        folder = root / "sub" if i % 2 else root
+        (folder / f"paper{i}.txt").write_text(f"Paper {i} studies topic{i}. " * 40)
+    (root / "ignored.csv").write_text("a,b")
+    (root / "broken.pdf").write_bytes(b"not a pdf")
+
+
+def _manager(path, emb):
+    return RAGIndexManager(str(path), embedding_model=emb, compact_after=10 ** 9)
+
+
+def test_walks_and_reports_failures(tmp_path):
+    _corpus(tmp_path / "corpus", 4)
+    files = list(iter_files([str(tmp_path / "corpus")]))
+    assert len(files) == 5 and not any(f.endswith(".csv") for f in files)
+
+    emb = HashEmbeddings()
+    stats = ingest([str(tmp_path / "corpus")], manager=_manager(tmp_path / "index", emb),
+                   workers=2, batch_chunks=5)
+    assert stats.files_indexed == 4
+    assert stats.files_failed == 1
+    assert stats.chunks > 4
+
+    reloaded = _manager(tmp_path / "index", emb)
+    assert len(reloaded.documents) == 4
+    assert reloaded.retrieve("topic3", top_k=1, mode="lexical")[0].page_content.startswith("Paper 3")
+
+
+def test_dangling_symlink_is_a_failed_file(tmp_path, capsys):
+    _corpus(tmp_path / "corpus", 2)
+    os.symlink(tmp_path / "missing.txt", tmp_path / "corpus" / "dangling.txt")
+
+    stats = ingest([str(tmp_path / "corpus")], manager=_manager(tmp_path / "index", HashEmbeddings()), workers=1)
+    assert stats.files_indexed == 2
+    assert stats.files_failed == 2  # broken.pdf and the symlink
+    assert f"✗ {tmp_path / 'corpus' / 'dangling.txt'}" in capsys.readouterr().out
+
+
+def test_resumes_after_crash(tmp_path, monkeypatch):
+    _corpus(tmp_path / "corpus", 6)
+    emb = HashEmbeddings()
+    manager = _manager(tmp_path / "index", emb)
+
+    calls = {"n": 0}
+    original = manager.add_chunked
+
+    def crash_on_third_batch(items):
+        calls["n"] += 1
+        if calls["n"] == 3:
+            raise KeyboardInterrupt
+        return original(items)
+
+    monkeypatch.setattr(manager, "add_chunked", crash_on_third_batch)
+    with pytest.raises(KeyboardInterrupt):
+        # one file per batch, so two files are committed before the "crash"
+        ingest([str(tmp_path / "corpus")], manager=manager, workers=1, batch_chunks=1)
+
+    embedded_before = emb.embedded
+    resumed = _manager(tmp_path / "index", emb)
+    committed = set(resumed.documents)
+    assert len(committed) == 2
+
+    stats = ingest([str(tmp_path / "corpus")], manager=resumed, workers=1)
+    assert stats.files_skipped == 2
+    assert stats.files_indexed == 4
+    assert len(_manager(tmp_path / "index", emb).documents) == 6
+
+    # committed files were not loaded or embedded again
+    new_chunks = sum(len(e["chunk_ids"]) for h, e in resumed.documents.items() if h not in committed)
+    assert emb.embedded - embedded_before == new_chunks
+
+
+def test_known_content_is_recorded_and_not_reloaded(tmp_path, monkeypatch):
+    from researcher.data import ingest as ingest_module
+
+    corpus = tmp_path / "corpus"
+    _corpus(corpus, 2)
+    (corpus / "copy-of-paper0.txt").write_text((corpus / "paper0.txt").read_text())
+    emb = HashEmbeddings()
+
+    stats = ingest([str(corpus)], manager=_manager(tmp_path / "index", emb), workers=1)
+    assert (stats.files_indexed, stats.files_skipped) == (2, 1)  # the copy is not new content
+
+    os.utime(corpus / "paper0.txt", (1_000_000, 1_000_000))  # touched, same content
+    stats = ingest([str(corpus)], manager=_manager(tmp_path / "index", emb), workers=1)
+    assert (stats.files_indexed, stats.files_skipped) == (0, 3)
+
+    loaded = []
+    original = ingest_module._load_and_chunk
+    monkeypatch.setattr(ingest_module, "_load_and_chunk", lambda p: loaded.append(p) or original(p))
+    stats = ingest([str(corpus)], manager=_manager(tmp_path / "index", emb), workers=1)
+    assert loaded == [str(corpus / "broken.pdf")]  # only the file that keeps failing
+    assert stats.files_skipped == 3
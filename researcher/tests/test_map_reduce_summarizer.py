@@ -0,0 +1,53 @@
+# researcher/tests/test_map_reduce_summarizer.py
+from researcher.pipelines import pdf_summarizer
+from researcher.utils.token_utils import count_tokens, split_by_tokens
+
+
+def test_split_by_tokens_respects_budget_and_order():
+    paragraphs = [f"Paragraph {i}. " + "word " * 150 for i in range(12)]
+    chunks = split_by_tokens("\n\n".join(paragraphs), max_tokens=400)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(c) <= 400 for c in chunks)
+    assert "".join(chunks).replace("\n\n", "").replace(" ", "") == "".join(paragraphs).replace(" ", "")
+
+
+def test_long_text_is_mapped_in_parallel_then_reduced(monkeypatch):
+    batches, finals = [], []
+
+    def fake_generate_many(prompts):
+        batches.append(prompts)
+        return ["short summary"] * len(prompts)
+
+    def fake_generate(prompt):
+        finals.append(prompt)
+        return "final summary"
+
+    monkeypatch.setattr(pdf_summarizer, "generate_many", fake_generate_many)
+    monkeypatch.setattr(pdf_summarizer, "generate", fake_generate)
+
+    text = "\n\n".join(f"Section {i}. " + "token " * 1200 for i in range(6))
+    assert pdf_summarizer.summarize_pdf_text(text) == "final summary"
+
+    assert len(batches) == 1 and len(batches[0]) >= 6  # one parallel map step
+    assert all(count_tokens(p) <= pdf_summarizer.MAP_CHUNK_TOKENS + 200 for p in batches[0])
+    assert len(finals) == 1 and "PART SUMMARIES" in finals[0]
+
+
+def test_short_text_is_single_pass(monkeypatch):
+    monkeypatch.setattr(pdf_summarizer, "generate", lambda prompt: "one shot")
+    monkeypatch.setattr(pdf_summarizer, "generate_many", lambda prompts: 1 / 0)
+    assert pdf_summarizer.summarize_pdf_text("A short abstract.") == "one shot"
+
+
+def test_stream_sends_the_same_final_prompt(monkeypatch):
+    finals = []
+    monkeypatch.setattr(pdf_summarizer, "generate_many", lambda prompts: ["short summary"] * len(prompts))
+    monkeypatch.setattr(pdf_summarizer, "generate", lambda prompt: finals.append(prompt) or "final summary")
+    monkeypatch.setattr(pdf_summarizer, "stream_generate", lambda prompt: finals.append(prompt) or iter(["final ", "summary"]))
+
+    for text in ("A short abstract.", "\n\n".join(f"Section {i}. " + "token " * 1200 for i in range(6))):
+        finals.clear()
+        assert pdf_summarizer.summarize_pdf_text(text) == "final summary"
+        assert "".join(pdf_summarizer.stream_pdf_summary(text)) == "final summary"
+        assert len(finals) == 2 and finals[0] == finals[1]
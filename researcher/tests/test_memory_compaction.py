@@ -0,0 +1,47 @@
+# researcher/tests/test_memory_compaction.py
+import numpy as np
+
+from researcher.memory.compaction import plan_compaction
+
+DAY = 86400
+NOW = 1_000 * DAY
+
+
+def _vec(*xs):
+    return np.array(xs, dtype=np.float32)
+
+
+def test_near_duplicates_merge_into_most_used_entry():
+    ids = ["a", "b", "c"]
+    vecs = [_vec(1, 0, 0), _vec(0.99, 0.05, 0), _vec(0, 1, 0)]
+    metas = [
+        {"created_at": NOW - 5 * DAY, "access_count": 1, "paper": "x"},
+        {"created_at": NOW - 9 * DAY, "access_count": 4, "last_accessed": NOW - DAY},
+        {"created_at": NOW - DAY},
+    ]
+    plan = plan_compaction(ids, vecs, metas, similarity=0.95, max_age_days=0, max_items=0, now=NOW)
+
+    assert plan.merges == {"b": ["a"]}
+    assert plan.deleted == ["a"]
+    merged = plan.updates["b"]
+    assert merged["access_count"] == 5
+    assert merged["merged_count"] == 1
+    assert merged["created_at"] == NOW - 9 * DAY
+    assert merged["paper"] == "x"  # filled in from the duplicate
+
+
+def test_eviction_by_age_access_and_size_cap():
+    ids = ["old", "old-but-used", "legacy", "new1", "new2"]
+    vecs = np.eye(5, dtype=np.float32)
+    metas = [
+        {"created_at": NOW - 400 * DAY},
+        {"created_at": NOW - 400 * DAY, "access_count": 3, "last_accessed": NOW - 300 * DAY},
+        None,  # written before access tracking: kept by age, first to go under the cap
+        {"created_at": NOW - DAY, "access_count": 1},
+        {"created_at": NOW - 2 * DAY},
+    ]
+    plan = plan_compaction(ids, vecs, metas, similarity=0.95, max_age_days=180,
+                           keep_if_accessed=3, max_items=3, now=NOW)
+
+    assert plan.evicted == ["old", "legacy"]
+    assert not plan.merges
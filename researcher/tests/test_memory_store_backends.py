@@ -0,0 +1,90 @@
+# researcher/tests/test_memory_store_backends.py
+import gc
+import hashlib
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from researcher.memory import memory_store
+from researcher.memory.memory_store import MemoryStore
+
+
+def _embed(text):
+    """Deterministic bag-of-words vector, so overlapping texts land close together."""
+    vec = np.zeros(64, dtype=np.float32)
+    for word in text.lower().split():
+        vec[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+    return (vec / max(np.linalg.norm(vec), 1e-9)).tolist() if text.strip() else []
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_store, "get_embedding", _embed)
+    monkeypatch.setattr(memory_store, "get_embeddings", lambda texts: [_embed(t) for t in texts])
+    return MemoryStore(persist_directory=str(tmp_path / "mem"), backend="sqlite")
+
+
+def test_opens_lazily_and_persists(store, tmp_path, capsys):
+    assert not os.path.exists(tmp_path / "mem")
+    store.add_many("insights", ["graph retrieval helps", "rerankers cut noise"])
+    assert "Opened sqlite backend" in capsys.readouterr().out
+
+    reopened = MemoryStore(persist_directory=str(tmp_path / "mem"), backend="sqlite")
+    assert reopened.query("insights", "graph retrieval", top_k=1)["documents"] == [["graph retrieval helps"]]
+    assert "2 vectors (summaries 0, insights 2" in capsys.readouterr().out
+
+
+def test_access_stats_drive_compaction(store):
+    store.add("insights", "dense retrieval beats bm25 on paraphrases", id="a")
+    store.add("insights", "Dense Retrieval beats BM25 on paraphrases", id="b")
+    store.add("insights", "small models hallucinate more", id="c")
+    store.get("insights", "b")
+    store.query("insights", "small models hallucinate more", top_k=1)
+
+    report = store.compact(["insights"], similarity=0.95, max_age_days=0, max_items=0)
+    assert report["insights"].merged == 1
+
+    # "b" was read, so the duplicate group is kept under it
+    left = store.get("insights", "b")
+    assert left["ids"] == ["b"]
+    assert left["metadatas"][0]["access_count"] == 1
+    assert store.get("insights", "a")["ids"] == []
+    assert store._collections["insights"].count() == 2
+
+
+def test_upsert_keeps_age_and_usage(store):
+    store.add("insights", "first wording", {"created_at": 1000.0}, id="a")
+    store.get("insights", "a")
+    store.flush_access_stats()
+
+    store.upsert("insights", "a", "second wording", {"source": "run-2"})
+    meta = store.get("insights", "a")["metadatas"][0]
+    assert meta["created_at"] == 1000.0
+    assert meta["access_count"] == 1 and meta["last_accessed"] > 1000.0
+    assert meta["source"] == "run-2"
+
+    store.upsert_many("insights", ["b"], ["new entry"])
+    assert store.get("insights", "b")["metadatas"][0]["created_at"] > 1000.0
+
+
+def test_exit_flush_skips_dropped_and_deleted_stores(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_store, "get_embeddings", lambda texts: [_embed(t) for t in texts])
+    flushed = []
+    monkeypatch.setattr(MemoryStore, "flush_access_stats", lambda self: flushed.append(self.persist_directory))
+
+    kept = MemoryStore(persist_directory=str(tmp_path / "kept"), backend="sqlite")
+    gone = MemoryStore(persist_directory=str(tmp_path / "gone"), backend="sqlite")
+    dropped = MemoryStore(persist_directory=str(tmp_path / "dropped"), backend="sqlite")
+    for s in (kept, gone, dropped):
+        s.add("insights", "dense retrieval", id="a")
+        s.get("insights", "a")
+
+    gone._client.conn.close()
+    shutil.rmtree(tmp_path / "gone")
+    del dropped, s
+    gc.collect()
+
+    memory_store._flush_live_stores()
+    assert flushed == [str(tmp_path / "kept")]
@@ -0,0 +1,102 @@
+# researcher/tests/test_memory_store_batch.py
+import hashlib
+
+import numpy as np
+import pytest
+
+from researcher.memory import memory_store
+from researcher.memory.memory_store import MemoryStore
+
+
+def _embed(text):
+    vec = np.zeros(32, dtype=np.float32)
+    for word in text.lower().split():
+        vec[int(hashlib.md5(word.encode()).hexdigest(), 16) % 32] += 1
+    return (vec / max(np.linalg.norm(vec), 1e-9)).tolist() if text.strip() else []
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    calls = []
+
+    def embed_many(texts):
+        calls.append(list(texts))
+        return [_embed(t) for t in texts]
+
+    def embed_one(text):
+        raise AssertionError("batch APIs must not embed per item")
+
+    monkeypatch.setattr(memory_store, "get_embedding", embed_one)
+    monkeypatch.setattr(memory_store, "get_embeddings", embed_many)
+    s = MemoryStore(persist_directory=str(tmp_path / "mem"), backend="sqlite")
+    s.embed_calls = calls
+    return s
+
+
+def test_add_many_embeds_once_and_reports_per_item(store):
+    results = store.add_many(
+        "insights",
+        ["graph retrieval helps", "", "rerankers cut noise"],
+        metadatas=[{"run": "r1"}, None, {"run": "r1"}],
+        ids=["a", "b", "c"],
+    )
+    assert store.embed_calls == [["graph retrieval helps", "", "rerankers cut noise"]]
+    assert [r["id"] for r in results] == ["a", "b", "c"]
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert "embedding" in results[1]["error"]
+    assert store._collection("insights").get(ids=["a", "b", "c"])["ids"] == ["a", "c"]
+
+
+def test_rejected_batch_is_retried_per_item(store, capsys):
+    store.add_many("questions", ["what is rag"], ids=["q1"])
+    results = store.add_many("questions", ["why rerank", "what is rag again", "how to chunk"], ids=["q2", "q1", "q3"])
+
+    assert "retrying per item" in capsys.readouterr().out
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert "already exists" in results[1]["error"]
+    # the failed duplicate did not overwrite the stored row
+    assert store._collection("questions").get(ids=["q1"])["documents"] == ["what is rag"]
+    assert store._collection("questions").count() == 3
+
+
+def test_writes_are_sliced_to_the_backend_batch_size(store, monkeypatch):
+    writes = []
+    collection = store._collection("summaries")
+    upsert = collection.upsert
+    monkeypatch.setattr(collection, "upsert", lambda **kw: writes.append(kw["ids"]) or upsert(**kw))
+    monkeypatch.setattr(store, "_max_batch", lambda: 2)
+
+    results = store.upsert_many("summaries", ["s1", "s2", "s3"], ["one", "two", "three"])
+
+    assert all(r["ok"] for r in results)
+    assert len(store.embed_calls) == 1
+    assert writes == [["s1", "s2"], ["s3"]]
+
+
+def test_query_many_embeds_once_and_keeps_results_apart(store):
+    store.add_many("insights", ["graph retrieval helps", "rerankers cut noise"], ids=["g", "r"])
+    store.embed_calls.clear()
+
+    results = store.query_many("insights", ["rerankers noise", "", "   "], top_k=1)
+
+    assert len(store.embed_calls) == 1
+    assert results[0]["ids"] == [["r"]]
+    assert results[0]["documents"] == [["rerankers cut noise"]]
+    assert "error" not in results[0]
+    assert results[1]["ids"] == [[]] and "embedding" in results[1]["error"]
+
+    # failed results share no lists with each other
+    results[1]["ids"][0].append("x")
+    assert results[2]["ids"] == [[]]
+
+
+def test_query_many_reports_backend_failure_per_query(store, monkeypatch):
+    collection = store._collection("insights")
+
+    def broken(**kw):
+        raise RuntimeError("backend down")
+
+    monkeypatch.setattr(collection, "query", broken)
+    results = store.query_many("insights", ["one", "two"])
+    assert [r["error"] for r in results] == ["backend down", "backend down"]
+    assert all(r["documents"] == [[]] for r in results)
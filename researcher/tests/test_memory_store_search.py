@@ -0,0 +1,108 @@
+# researcher/tests/test_memory_store_search.py
+import hashlib
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from researcher.memory import memory_store
+from researcher.memory.memory_store import COLLECTIONS, MemoryStore
+
+
+def _embed(text):
+    vec = np.zeros(64, dtype=np.float32)
+    for word in text.lower().split():
+        vec[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+    return (vec / max(np.linalg.norm(vec), 1e-9)).tolist() if text.strip() else []
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(memory_store, "get_embedding", lambda t: calls.append(t) or _embed(t))
+    monkeypatch.setattr(memory_store, "get_embeddings", lambda texts: [_embed(t) for t in texts])
+    s = MemoryStore(persist_directory=str(tmp_path / "mem"), backend="sqlite")
+    s.embed_calls = calls
+    s.add("summaries", "retrieval augmented generation survey", id="s")
+    s.add("insights", "unrelated topic about birds", id="i")
+    s.add("questions", "does retrieval augmented generation help", id="q")
+    s.add("citations", "retrieval augmented generation survey 2023", id="c")
+    calls.clear()
+    return s
+
+
+def test_search_embeds_once_and_merges_all_collections(store):
+    hits = store.search("retrieval augmented generation survey", top_k=4)
+
+    assert store.embed_calls == ["retrieval augmented generation survey"]
+    assert {h["category"] for h in hits} == set(COLLECTIONS)
+    assert hits[0]["id"] == "s"
+    assert [h["score"] for h in hits] == sorted(h["score"] for h in hits)
+    for h in hits:
+        assert h["score"] == pytest.approx(h["distance"] / memory_store.SEARCH_WEIGHTS[h["category"]])
+
+
+def test_weights_and_categories_shape_the_ranking(store):
+    query = "retrieval augmented generation survey 2023"
+    assert store.search(query, top_k=1)[0]["id"] == "c"
+    # a citation hit is worth less by default; a near tie goes to the summary
+    assert store.search("retrieval augmented generation survey", top_k=1)[0]["id"] == "s"
+
+    boosted = store.search("retrieval augmented generation", top_k=1, weights={"citations": 10})
+    assert boosted[0]["category"] == "citations"
+
+    only = store.search(query, top_k=5, categories=["questions"])
+    assert [h["id"] for h in only] == ["q"]
+
+
+def test_collections_are_queried_concurrently(store, monkeypatch):
+    # Every collection query waits for all the others; a sequential fan-out would time out
+    barrier = threading.Barrier(len(COLLECTIONS), timeout=5)
+    query = store._query_embedding
+
+    def waiting(category, emb, top_k):
+        barrier.wait()
+        return query(category, emb, top_k)
+
+    monkeypatch.setattr(store, "_query_embedding", waiting)
+    hits = store.search("retrieval augmented generation survey", top_k=4)
+    assert len(hits) == 4
+
+
+def test_a_failing_collection_does_not_sink_the_search(store, monkeypatch, capsys):
+    collection = store._collection("citations")
+
+    def broken(**kw):
+        raise RuntimeError("citations offline")
+
+    monkeypatch.setattr(collection, "query", broken)
+    hits = store.search("retrieval augmented generation survey 2023", top_k=4)
+
+    assert "Search in citations failed" in capsys.readouterr().out
+    assert hits and all(h["category"] != "citations" for h in hits)
+
+
+def test_empty_query_returns_nothing(store):
+    assert store.search("", top_k=3) == []
+    assert store.embed_calls == []
+    with pytest.raises(ValueError):
+        store.search("x", categories=["nope"])
+
+
+def test_concurrent_searches_share_one_pool(store, monkeypatch):
+    created = []
+    real = memory_store.ThreadPoolExecutor
+
+    def counting(*args, **kwargs):
+        time.sleep(0.05)  # widen the window between the check and the assignment
+        created.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(memory_store, "ThreadPoolExecutor", counting)
+    threads = [threading.Thread(target=store.search, args=("retrieval survey",)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(created) == 1
@@ -0,0 +1,144 @@
+# researcher/tests/test_orchestrator_dag.py
+import time
+
+from researcher.agents import orchestrator as orchestrator_module
+from researcher.agents.orchestrator import Orchestrator
+
+
+class _SleepyWorker:
+    """Stand-in WorkerAgent: each task sleeps, then records which upstream outputs it saw."""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+
+    def execute_task(self, task, state):
+        time.sleep(self.delay)
+        seen = sorted(k for k in state if k != "query")
+        state[task["name"]] = f"{task['name']} saw {seen}"
+        return state
+
+
+PLAN = [
+    {"name": "search_papers", "dependencies": []},
+    {"name": "summarize_papers", "dependencies": ["search_papers"]},
+    {"name": "extract_insights", "dependencies": ["summarize_papers"]},
+    {"name": "generate_questions", "dependencies": ["summarize_papers"]},
+    {"name": "write_report", "dependencies": ["extract_insights", "generate_questions"]},
+]
+
+
+def _orchestrator(monkeypatch, plan, delay=0.2):
+    monkeypatch.setattr(orchestrator_module, "plan_research", lambda query: plan)
+    orch = Orchestrator(reviewer_enabled=False, max_workers=4)
+    orch.worker = _SleepyWorker(delay)
+    return orch
+
+
+def test_independent_branches_run_in_parallel(monkeypatch):
+    orch = _orchestrator(monkeypatch, PLAN)
+
+    start = time.monotonic()
+    res = orch.run("q")
+    elapsed = time.monotonic() - start
+
+    log = {e["task"]: e for e in res["run_log"]}
+    insights, questions = log["extract_insights"], log["generate_questions"]
+    assert insights["started_at"] < questions["finished_at"]
+    assert questions["started_at"] < insights["finished_at"]
+    assert log["write_report"]["started_at"] >= max(insights["finished_at"], questions["finished_at"])
+    assert elapsed < 0.2 * len(PLAN) - 0.1
+
+    state = res["state"]
+    assert "extract_insights" in state["write_report"] and "generate_questions" in state["write_report"]
+    assert log["write_report"]["produced"] == ["write_report"]
+
+
+def test_cycles_and_unknown_dependencies_are_deterministic(monkeypatch):
+    plan = [
+        {"name": "a", "dependencies": ["missing"]},
+        {"name": "b", "dependencies": ["c"]},
+        {"name": "c", "dependencies": ["b"]},
+        {"name": "d", "dependencies": ["a"]},
+    ]
+    orch = _orchestrator(monkeypatch, plan, delay=0)
+
+    res = orch.run("q")
+    order = [e["task"] for e in res["run_log"]]
+
+    assert order[:2] == ["a", "d"]
+    assert sorted(order[2:]) == ["b", "c"]
+    log = {e["task"]: e for e in res["run_log"]}
+    assert log["a"]["unknown_dependencies"] == ["missing"]
+    assert log["b"]["cycle"] and log["c"]["cycle"]
+    assert "cycle" not in log["d"]
+
+
+class _SlowReviewer:
+    """Stand-in ReviewerAgent: rewrites one task's output, leaves the rest untouched."""
+
+    def __init__(self, revise: str, delay: float = 0.3):
+        self.revise = revise
+        self.delay = delay
+        self.finished = {}
+
+    def review(self, task_name, output):
+        time.sleep(self.delay)
+        self.finished[task_name] = time.time()
+        revised = "a completely different revised text" if task_name == self.revise else output
+        return {"revised_output": revised, "issues_found": [], "quality_score": 0.9}
+
+
+def test_pipelined_reviews_overlap_downstream_tasks(monkeypatch):
+    orch = _orchestrator(monkeypatch, PLAN, delay=0.05)
+    orch.reviewer = _SlowReviewer(revise="summarize_papers")
+
+    res = orch.run("q", review_mode="pipelined")
+
+    log = {e["task"]: e for e in res["run_log"]}
+    assert log["summarize_papers"]["finished_at"] < log["extract_insights"]["started_at"] < orch.reviewer.finished["summarize_papers"]
+    assert all(f"{t['name']}_review" in res["state"] for t in PLAN)
+    assert log["summarize_papers"]["review"]["revised"] is True
+    assert "revised" not in log["search_papers"]["review"]
+    assert not any(e.get("rerun") for e in res["run_log"])
+
+
+def test_rerun_revised_only_reruns_descendants(monkeypatch):
+    orch = _orchestrator(monkeypatch, PLAN, delay=0)
+    orch.reviewer = _SlowReviewer(revise="extract_insights", delay=0)
+
+    res = orch.run("q", review_mode="pipelined", rerun_revised=True)
+
+    reruns = [e["task"] for e in res["run_log"] if e.get("rerun")]
+    assert reruns == ["write_report"]
+    assert res["state"]["extract_insights"] == "a completely different revised text"
+
+
+class _OutputsWorker(_SleepyWorker):
+    """Like _SleepyWorker, but writes each declared expected output instead of the task name."""
+
+    def execute_task(self, task, state):
+        outputs = task.get("expected_outputs") or [task["name"]]
+        for key in outputs:
+            state[key] = f"{key} from {task['name']} saw {sorted(k for k in state if k != 'query')}"
+        return state
+
+
+def test_rerun_revised_maps_onto_declared_outputs(monkeypatch):
+    plan = [
+        {"name": "summarize_papers", "dependencies": [], "expected_outputs": ["summaries"]},
+        {"name": "extract_insights", "dependencies": ["summarize_papers"], "expected_outputs": ["insights", "notes"]},
+        {"name": "write_report", "dependencies": ["summarize_papers"], "expected_outputs": ["report"]},
+    ]
+    orch = _orchestrator(monkeypatch, plan, delay=0)
+    orch.worker = _OutputsWorker(delay=0)
+
+    orch.reviewer = _SlowReviewer(revise="summarize_papers", delay=0)
+    res = orch.run("q", review_mode="pipelined", rerun_revised=True)
+    assert res["state"]["summaries"] == "a completely different revised text"
+    assert sorted(e["task"] for e in res["run_log"] if e.get("rerun")) == ["extract_insights", "write_report"]
+
+    # two declared outputs were reviewed as one text: nothing to map the revision onto
+    orch.reviewer = _SlowReviewer(revise="extract_insights", delay=0)
+    res = orch.run("q", review_mode="pipelined", rerun_revised=True)
+    assert res["state"]["insights"].startswith("insights from")
+    assert not any(e.get("rerun") for e in res["run_log"])
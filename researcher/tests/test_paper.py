@@ -0,0 +1,109 @@
+# researcher/tests/test_paper.py
+import gc
+import pickle
+import tracemalloc
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+
+import arxiv
+
+from researcher.data.arxiv_fetcher import _paper_from_result
+from researcher.models.paper import Paper
+
+
+def _result():
+    return arxiv.Result(
+        entry_id="http://arxiv.org/abs/2401.00001v2",
+        updated=datetime(2024, 2, 1),
+        published=datetime(2024, 1, 1),
+        title=" Sparse Retrieval at Scale ",
+        authors=[arxiv.Result.Author("A. Author"), arxiv.Result.Author("B. Author")],
+        summary="We study sparse retrieval.",
+        primary_category="cs.IR",
+        categories=["cs.IR", "cs.CL"],
+        links=[arxiv.Result.Link("http://arxiv.org/pdf/2401.00001v2", title="pdf")],
+    )
+
+
+def test_paper_from_result_is_slim():
+    res = _result()
+    paper = _paper_from_result(res)
+
+    assert not hasattr(paper, "__dict__")
+    assert paper.title == "Sparse Retrieval at Scale"
+    assert paper.authors == ["A. Author", "B. Author"]
+    assert paper.arxiv_id == "2401.00001v2"
+    assert paper.extras["categories"] == ["cs.IR", "cs.CL"]
+    assert paper.extras["updated"] == "2024-02-01"
+
+    # the arxiv.Result object graph must not be kept alive by the paper
+    ref = weakref.ref(res)
+    del res
+    gc.collect()
+    assert ref() is None
+
+
+def test_roundtrips():
+    paper = _paper_from_result(_result())
+
+    assert Paper.from_json(paper.to_json()) == paper
+    assert Paper.from_bytes(paper.to_bytes()) == paper
+    assert Paper.from_dict(paper.to_dict()) == paper
+    assert pickle.loads(pickle.dumps(paper)) == paper
+
+    bare = Paper("t", "s", [], "", None, None)
+    assert bare.extras == {}
+    assert Paper.from_bytes(bare.to_bytes()) == bare
+
+
+@dataclass
+class _LegacyPaper:
+    """The Paper model before slimming: it kept the whole Result via raw_entry."""
+    title: str
+    summary: str
+    authors: list
+    published: str
+    pdf_url: str
+    arxiv_id: str
+    raw_entry: dict
+
+
+def _legacy_from_result(res):
+    return _LegacyPaper(
+        res.title.strip(), res.summary.strip(), [a.name for a in res.authors],
+        res.published.strftime("%Y-%m-%d"), res.pdf_url, res.get_short_id(), res.__dict__,
+    )
+
+
+def _bytes_per_paper(convert, n=150):
+    def result(i):
+        return arxiv.Result(
+            entry_id=f"http://arxiv.org/abs/2401.{i:05d}v1",
+            updated=datetime(2024, 2, 1),
+            published=datetime(2024, 1, 1),
+            title=f"Paper {i}",
+            authors=[arxiv.Result.Author(f"Author {i}.{j}") for j in range(6)],
+            summary=" ".join(f"word{i}" for _ in range(200)),  # ~1.2 KB abstract
+            primary_category="cs.IR",
+            categories=["cs.IR", "cs.CL"],
+            links=[arxiv.Result.Link(f"http://arxiv.org/pdf/2401.{i:05d}v1", title="pdf")],
+        )
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = [convert(result(i)) for i in range(n)]
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(kept) == n
+    return size / n
+
+
+def test_retained_memory_per_paper():
+    legacy = _bytes_per_paper(_legacy_from_result)
+    slim = _bytes_per_paper(_paper_from_result)
+    # measured: ~4.0 KB -> ~2.5 KB; the abstract text itself is most of what is left
+    assert slim < 0.7 * legacy
@@ -0,0 +1,45 @@
+# researcher/tests/test_pdf_reader.py
+import io
+
+import fitz
+import pytest
+
+from researcher.data.pdf_reader import (
+    PDFExtractionError,
+    PDFNotFoundError,
+    extract_text_from_pdf,
+    iter_pages,
+)
+
+
+def _pdf_bytes(n_pages: int) -> bytes:
+    doc = fitz.open()
+    for i in range(n_pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1} text")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_sources_give_identical_text(tmp_path):
+    data = _pdf_bytes(3)
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(data)
+
+    expected = "Page 1 text\nPage 2 text\nPage 3 text"
+    assert extract_text_from_pdf(str(path)) == expected
+    assert extract_text_from_pdf(data) == expected
+    assert extract_text_from_pdf(io.BytesIO(data)) == expected
+    assert list(iter_pages(data, start=1)) == ["Page 2 text", "Page 3 text"]
+
+
+def test_process_pool_mode_matches_serial():
+    data = _pdf_bytes(9)
+    assert extract_text_from_pdf(data, workers=3) == extract_text_from_pdf(data, workers=1)
+
+
+def test_errors_are_typed(tmp_path):
+    with pytest.raises(PDFNotFoundError):
+        extract_text_from_pdf(str(tmp_path / "missing.pdf"))
+    with pytest.raises(PDFExtractionError):
+        extract_text_from_pdf(b"not a pdf")
@@ -0,0 +1,41 @@
+# researcher/tests/test_planner_memory.py
+import json
+
+from researcher.agents import planner_agent
+
+PLAN = {"tasks": [
+    {"name": "search_papers", "inputs": ["query"], "outputs": ["papers"], "dependencies": []},
+    {"name": "browse_web", "dependencies": []},
+    {"name": "write_report", "dependencies": ["search_papers"]},
+]}
+
+
+class _Store:
+    def __init__(self):
+        self.calls = []
+
+    def search(self, query, top_k=5):
+        self.calls.append((query, top_k))
+        return [
+            {"category": "insights", "document": "Retrieval gating cuts hallucinations.", "distance": 0.1},
+            {"category": "questions", "document": "Does reranking help?", "distance": 0.3},
+        ]
+
+
+def test_plan_uses_cross_collection_memory(monkeypatch):
+    store, prompts = _Store(), []
+    monkeypatch.setattr(planner_agent, "get_memory_store", lambda: store)
+    monkeypatch.setattr(planner_agent, "generate", lambda p: prompts.append(p) or "Plan:\n" + json.dumps(PLAN))
+
+    tasks = planner_agent.plan_research("reduce RAG hallucinations")
+
+    assert store.calls == [("reduce RAG hallucinations", 5)]
+    assert "[insights] Retrieval gating cuts hallucinations." in prompts[0]
+    assert "[questions] Does reranking help?" in prompts[0]
+    assert [t["name"] for t in tasks] == ["search_papers", "write_report"]
+
+
+def test_plan_without_memory_or_valid_json(monkeypatch):
+    monkeypatch.setattr(planner_agent, "get_memory_store", lambda: None)
+    monkeypatch.setattr(planner_agent, "generate", lambda p: "not json")
+    assert planner_agent.plan_research("q") == []
@@ -0,0 +1,60 @@
+# researcher/tests/test_rag_index_manager.py
+import os
+
+from langchain_core.documents import Document
+
+from researcher.data import rag_index
+from researcher.data.rag_index import RAGIndexManager
+from researcher.tests.stubs import HashEmbeddings
+
+
+def _doc(text, source="a.pdf"):
+    return [Document(page_content=text, metadata={"source": source})]
+
+
+def test_only_new_documents_are_embedded(tmp_path):
+    emb = HashEmbeddings()
+    manager = RAGIndexManager(str(tmp_path), embedding_model=emb)
+
+    h1 = manager.add_documents(_doc("transformers use attention layers"), source="a.pdf")
+    first = emb.embedded
+    assert first > 0
+
+    assert manager.add_documents(_doc("transformers use attention layers"), source="a.pdf") == h1
+    assert emb.embedded == first
+
+    manager.add_documents(_doc("graph neural networks pass messages"), source="b.pdf")
+    assert emb.embedded > first
+
+    top = manager.retrieve("graph messages", top_k=1)
+    assert top[0].metadata["doc_hash"] != h1
+
+
+def test_deltas_replay_and_remove(tmp_path):
+    emb = HashEmbeddings()
+    manager = RAGIndexManager(str(tmp_path), embedding_model=emb)
+    h1 = manager.add_documents(_doc("alpha beta gamma"))
+    h2 = manager.add_documents(_doc("delta epsilon zeta"))
+    assert manager.remove_document(h1)
+    assert not os.path.exists(tmp_path / "index.faiss")  # nothing rewritten yet
+
+    reloaded = RAGIndexManager(str(tmp_path), embedding_model=emb)
+    assert set(reloaded.documents) == {h2}
+    texts = [d.page_content for d in reloaded.retrieve("alpha", top_k=5)]
+    assert texts == ["delta epsilon zeta"]
+
+
+def test_compaction_writes_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_index, "COMPACT_AFTER_DELTAS", 2)
+    emb = HashEmbeddings()
+    manager = RAGIndexManager(str(tmp_path), embedding_model=emb)
+    manager.add_documents(_doc("one two three"))
+    manager.add_documents(_doc("four five six"))
+
+    snapshot = rag_index._current_snapshot_dir(str(tmp_path))
+    assert os.path.exists(os.path.join(snapshot, "index.faiss"))
+    assert not os.listdir(tmp_path / rag_index.DELTA_DIR)
+
+    reloaded = RAGIndexManager(str(tmp_path), embedding_model=emb)
+    assert len(reloaded.documents) == 2
+    assert len(reloaded.retrieve("four", top_k=5)) == 2
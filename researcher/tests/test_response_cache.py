@@ -0,0 +1,52 @@
+# researcher/tests/test_response_cache.py
+import time
+
+from researcher.llm.response_cache import ResponseCache
+
+
+def _ctx(system="sys", temperature=0.2):
+    return ResponseCache.context_key("groq", "llama", system, temperature, 400)
+
+
+def test_exact_hits_depend_on_every_key_part(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite"))
+    cache.put(_ctx(), "Explain RAG", "RAG is ...")
+
+    assert cache.get(_ctx(), "Explain RAG") == "RAG is ..."
+    assert cache.get(_ctx(system="other"), "Explain RAG") is None
+    assert cache.get(_ctx(temperature=0.9), "Explain RAG") is None
+    assert cache.get(_ctx(), "Explain GraphRAG") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+    reopened = ResponseCache(str(tmp_path / "llm.sqlite"))
+    assert reopened.get(_ctx(), "Explain RAG") == "RAG is ..."
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite"), max_entries=2, ttl_seconds=0.05)
+    cache.put(_ctx(), "a", "A")
+    cache.put(_ctx(), "b", "B")
+    cache.put(_ctx(), "c", "C")
+    assert cache.stats()["entries"] == 2
+    assert cache.get(_ctx(), "a") is None
+
+    time.sleep(0.1)
+    assert cache.get(_ctx(), "c") is None
+
+
+def test_semantic_mode_matches_near_duplicates(tmp_path):
+    vectors = {
+        "summarize paper X": [1.0, 0.0, 0.0],
+        "please summarize paper X": [0.99, 0.1, 0.0],
+        "list datasets": [0.0, 1.0, 0.0],
+    }
+    cache = ResponseCache(
+        str(tmp_path / "llm.sqlite"), semantic_threshold=0.95, embed_fn=lambda p: vectors[p]
+    )
+    cache.put(_ctx(), "summarize paper X", "summary of X")
+
+    assert cache.get(_ctx(), "please summarize paper X") == "summary of X"
+    assert cache.get(_ctx(), "list datasets") is None
+    assert cache.get(_ctx(system="other"), "please summarize paper X") is None
+    assert cache.stats()["semantic_hits"] == 1
@@ -0,0 +1,140 @@
+# researcher/tests/test_router_concurrency.py
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from researcher.llm import groq_provider
+from researcher.llm.concurrency import TokenBucket
+from researcher.llm.provider_router import LLMRouter
+
+
+class _FakeProvider:
+    max_tokens = 100
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def agenerate(self, prompt, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        # later prompts finish first, to check ordering
+        await asyncio.sleep(0.05 / (1 + int(prompt)))
+        self.in_flight -= 1
+        return f"answer {prompt}"
+
+    def generate(self, prompt, **kwargs):
+        return f"answer {prompt}"
+
+
+def _router(**kwargs):
+    router = LLMRouter(provider="groq", **kwargs)
+    router.llm = _FakeProvider()
+    return router
+
+
+def test_generate_many_is_ordered_and_bounded():
+    router = _router(max_in_flight=3)
+    prompts = [str(i) for i in range(10)]
+
+    assert router.generate_many(prompts) == [f"answer {i}" for i in range(10)]
+    assert router.llm.peak == 3
+
+
+def test_generate_many_inside_running_loop():
+    router = _router(max_in_flight=2)
+
+    async def caller():
+        return router.generate_many(["0", "1"])
+
+    assert asyncio.run(caller()) == ["answer 0", "answer 1"]
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 10 tokens/second, burst of 2
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire(1)
+    elapsed = time.monotonic() - start
+    assert 0.15 <= elapsed < 1.0
+
+    assert not TokenBucket(0).enabled
+    TokenBucket(0).acquire(10**6)  # disabled buckets never block
+
+
+class _SharedCounterProvider:
+    """Counts concurrent calls across threads, sync and async alike."""
+    max_tokens = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def _enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def _exit(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def generate(self, prompt, **kwargs):
+        self._enter()
+        time.sleep(0.03)
+        self._exit()
+        return prompt
+
+    async def agenerate(self, prompt, **kwargs):
+        self._enter()
+        await asyncio.sleep(0.03)
+        self._exit()
+        return prompt
+
+
+def test_one_limit_across_threads_and_event_loops():
+    router = _router(max_in_flight=2)
+    router.llm = _SharedCounterProvider()
+    prompts = [str(i) for i in range(6)]
+
+    threads = [threading.Thread(target=router.generate_many, args=(prompts,)) for _ in range(3)]
+    threads += [threading.Thread(target=router.generate, args=("sync",)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert router.llm.peak == 2
+    assert router._slots.in_use == 0
+
+
+class _FakeAsyncGroq:
+    instances = []
+
+    def __init__(self, api_key=None):
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        _FakeAsyncGroq.instances.append(self)
+
+    async def _create(self, messages, **kwargs):
+        message = SimpleNamespace(content=messages[-1]["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def close(self):
+        self.closed = True
+
+
+def test_generate_many_closes_the_async_client_of_its_loop(monkeypatch):
+    monkeypatch.setattr(groq_provider, "AsyncGroq", _FakeAsyncGroq)
+    _FakeAsyncGroq.instances = []
+    router = LLMRouter(provider="groq")
+
+    for _ in range(2):
+        assert router.generate_many(["a", "b"]) == ["a", "b"]
+
+    # one client per run_sync loop, shared by the batch and closed with it
+    assert len(_FakeAsyncGroq.instances) == 2
+    assert all(c.closed for c in _FakeAsyncGroq.instances)
+    assert len(router.llm._async_clients) == 0
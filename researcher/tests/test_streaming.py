@@ -0,0 +1,99 @@
+# researcher/tests/test_streaming.py
+import json
+
+from researcher.llm import llm, local_zephyr
+from researcher.llm.response_cache import ResponseCache
+
+
+class _FakeProvider:
+    model = "fake"
+    temperature = 0.2
+    max_tokens = 100
+
+    def __init__(self):
+        self.calls = 0
+
+    def stream(self, prompt, **kwargs):
+        self.calls += 1
+        yield from ["Hel", "lo", " world"]
+
+
+def test_stream_generate_yields_chunks_and_caches(monkeypatch, tmp_path):
+    provider = _FakeProvider()
+    monkeypatch.setattr(llm._llm_router, "llm", provider)
+    monkeypatch.setattr(llm, "_response_cache", ResponseCache(str(tmp_path / "llm.sqlite")))
+
+    assert list(llm.stream_generate("hi")) == ["Hel", "lo", " world"]
+    assert list(llm.stream_generate("hi")) == ["Hello world"]
+    assert provider.calls == 1
+
+
+class _FakeStreamResponse:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+def test_zephyr_honours_stream_flag(monkeypatch):
+    lines = [json.dumps({"response": t, "done": False}).encode() for t in ("A", "B")]
+    lines += [b"", json.dumps({"response": "", "done": True}).encode()]
+    seen = {}
+
+    def fake_post(url, json=None, stream=False):
+        seen["payload_stream"] = json["stream"]
+        seen["http_stream"] = stream
+        return _FakeStreamResponse(lines)
+
+    monkeypatch.setattr(local_zephyr.requests, "post", fake_post)
+
+    assert list(local_zephyr.stream_zephyr_locally("q")) == ["A", "B"]
+    assert local_zephyr.query_zephyr_locally("q", stream=True) == "AB"
+    assert seen == {"payload_stream": True, "http_stream": True}
+
+
+class _BreakingProvider(_FakeProvider):
+    def __init__(self):
+        super().__init__()
+        self.closed = False
+
+    def stream(self, prompt, **kwargs):
+        self.calls += 1
+        try:
+            yield "Partial answer"
+            yield "[LLM ERROR] connection reset"
+        finally:
+            self.closed = True
+
+
+def test_broken_stream_is_not_cached(monkeypatch, tmp_path):
+    provider = _BreakingProvider()
+    monkeypatch.setattr(llm._llm_router, "llm", provider)
+    monkeypatch.setattr(llm, "_response_cache", ResponseCache(str(tmp_path / "llm.sqlite")))
+
+    list(llm.stream_generate("hi"))
+    list(llm.stream_generate("hi"))
+    assert provider.calls == 2
+
+
+def test_abandoned_stream_releases_its_slot(monkeypatch):
+    provider = _BreakingProvider()
+    monkeypatch.setattr(llm._llm_router, "llm", provider)
+
+    stream = llm.stream_generate("hi", use_cache=False)
+    assert next(stream) == "Partial answer"
+    assert llm._llm_router._slots.in_use == 1
+    stream.close()
+
+    assert llm._llm_router._slots.in_use == 0
+    assert provider.closed
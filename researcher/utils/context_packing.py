@@ -0,0 +1,158 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from researcher.utils.token_utils import count_tokens
+
+# Chunks whose word 5-gram sets overlap at least this much are treated as duplicates
+NEAR_DUPLICATE_JACCARD = 0.8
+SEPARATOR = "\n\n"
+
+
+@dataclass
+class PackedContext:
+    """Context chosen for a prompt, with what packing saved."""
+    chunks: List[str] = field(default_factory=list)
+    tokens_in: int = 0          # tokens the retrieved chunks would have used verbatim
+    tokens_used: int = 0
+    merged: int = 0             # chunks folded into a neighbour from the same page
+    duplicates: int = 0         # near-duplicate segments removed
+    dropped: int = 0            # segments that did not fit the budget
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_in - self.tokens_used
+
+    @property
+    def text(self) -> str:
+        return SEPARATOR.join(self.chunks)
+
+
+@dataclass
+class _Segment:
+    text: str
+    rank: int                   # best retrieval rank among merged chunks (0 = best)
+    start: Optional[int] = None
+
+    @property
+    def end(self) -> Optional[int]:
+        return None if self.start is None else self.start + len(self.text)
+
+
+def _group_key(doc: Document, i: int) -> Tuple:
+    meta = doc.metadata or {}
+    source = meta.get("doc_hash") or meta.get("source")
+    if source is None or meta.get("start_index") is None:
+        return ("__single__", i)  # nothing to align it with
+    return (source, meta.get("page"))
+
+
+def _suffix_prefix_overlap(a: str, b: str, max_len: int = 2000) -> int:
+    """Length of the longest suffix of `a` that is a prefix of `b`."""
+    for n in range(min(len(a), len(b), max_len), 0, -1):
+        if a.endswith(b[:n]):
+            return n
+    return 0
+
+
+def _merge_adjacent(docs: Sequence[Document]) -> Tuple[List[_Segment], int]:
+    """
+    Merge chunks that overlap or touch within the same source page, using the
+    splitter's start_index offsets. Returns segments and how many chunks merged.
+    """
+    groups: Dict[Tuple, List[_Segment]] = {}
+    for rank, doc in enumerate(docs):
+        start = (doc.metadata or {}).get("start_index")
+        groups.setdefault(_group_key(doc, rank), []).append(_Segment(doc.page_content, rank, start))
+
+    segments, merged = [], 0
+    for group in groups.values():
+        group.sort(key=lambda s: (s.start if s.start is not None else -1))
+        current = group[0]
+        for nxt in group[1:]:
+            overlap = None
+            if current.end is not None and nxt.start is not None and nxt.start <= current.end + 1:
+                overlap = current.end - nxt.start
+                if overlap > 0 and current.text[-overlap:] != nxt.text[:overlap]:
+                    # offsets disagree with the text (e.g. repeated passage) — trust the text
+                    overlap = _suffix_prefix_overlap(current.text, nxt.text) or None
+            if overlap is None:
+                segments.append(current)
+                current = nxt
+                continue
+            if nxt.end <= current.end and overlap >= len(nxt.text):
+                text = current.text  # fully contained
+            else:
+                # a one-character gap is the whitespace the splitter stripped
+                text = current.text + (" " if overlap < 0 else "") + nxt.text[max(overlap, 0):]
+            current = _Segment(text, min(current.rank, nxt.rank), current.start)
+            merged += 1
+        segments.append(current)
+    return segments, merged
+
+
+def _shingles(text: str, n: int = 5) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < n:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+
+def _drop_near_duplicates(segments: List[_Segment]) -> Tuple[List[_Segment], int]:
+    """
+    Keep the best-ranked of any near-identical segments (e.g. the same passage
+    retrieved from two uploads of one paper, or boilerplate repeated per page).
+    """
+    kept: List[Tuple[_Segment, set]] = []
+    removed = 0
+    for seg in sorted(segments, key=lambda s: s.rank):
+        sh = _shingles(seg.text)
+        duplicate = False
+        for other, other_sh in kept:
+            inter = len(sh & other_sh)
+            if inter / max(1, len(sh | other_sh)) >= NEAR_DUPLICATE_JACCARD or inter == len(sh):
+                duplicate = True
+                break
+        if duplicate:
+            removed += 1
+        else:
+            kept.append((seg, sh))
+    return [seg for seg, _ in kept], removed
+
+
+def pack_context(docs: Sequence[Document], max_tokens: int) -> PackedContext:
+    """
+    Turn ranked retrieval results into prompt context within `max_tokens`:
+    1) merge overlapping/adjacent chunks of the same page into one passage
+    2) drop passages that are near-duplicates of a better-ranked one
+    3) add passages best-rank first while they fit the budget
+
+    Args:
+        docs (Sequence[Document]): Retrieved chunks, best first. `doc_hash`/`source`,
+            `page` and `start_index` metadata enable merging.
+        max_tokens (int): Token budget for the joined context.
+
+    Returns:
+        PackedContext: Selected passages (in rank order) and token accounting.
+    """
+    packed = PackedContext()
+    if not docs:
+        return packed
+    packed.tokens_in = count_tokens(SEPARATOR.join(d.page_content for d in docs))
+
+    segments, packed.merged = _merge_adjacent(docs)
+    segments, packed.duplicates = _drop_near_duplicates(segments)
+
+    sep_tokens = count_tokens(SEPARATOR)
+    used = 0
+    for seg in sorted(segments, key=lambda s: s.rank):
+        tokens = count_tokens(seg.text) + (sep_tokens if packed.chunks else 0)
+        if used + tokens > max_tokens:
+            packed.dropped += 1
+            continue
+        packed.chunks.append(seg.text)
+        used += tokens
+    packed.tokens_used = count_tokens(packed.text)
+    return packed
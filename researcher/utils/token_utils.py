@@ -0,0 +1,105 @@
+import re
+from typing import List
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None  # fall back to a character-based estimate
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts tokens in `text`.
+
+    Uses tiktoken's cl100k_base encoding when available. It is close enough
+    for budgeting Llama-family prompts. Otherwise falls back to ~4
+    characters per token.
+
+    Args:
+        text (str): Text to measure.
+
+    Returns:
+        int: Token count (estimated when tiktoken is not installed).
+    """
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4)
+
+
+def _split_oversized(piece: str, max_tokens: int) -> List[str]:
+    """
+    Split a piece with no paragraph breaks: first by sentence, then by words.
+    """
+    sentences = re.split(r"(?<=[.!?])\s+", piece)
+    if len(sentences) > 1:
+        return pack_by_tokens(sentences, max_tokens, separator=" ")
+
+    words = piece.split(" ")
+    if len(words) > 1:
+        return pack_by_tokens(words, max_tokens, separator=" ")
+
+    # a single enormous "word" — cut by characters
+    step = max(1, max_tokens * 4)
+    return [piece[i:i + step] for i in range(0, len(piece), step)]
+
+
+def pack_by_tokens(pieces: List[str], max_tokens: int, separator: str = "\n\n") -> List[str]:
+    """
+    Greedily packs consecutive pieces into chunks of at most `max_tokens`.
+    Pieces that are too large on their own are split further.
+
+    Args:
+        pieces (List[str]): Ordered text pieces (paragraphs, summaries, ...).
+        max_tokens (int): Token budget per chunk.
+        separator (str): Joiner placed between pieces within a chunk.
+
+    Returns:
+        List[str]: Chunks in original order.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    sep_tokens = count_tokens(separator) if separator.strip() else 0
+
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+
+        tokens = count_tokens(piece)
+        if tokens > max_tokens:
+            if current:
+                chunks.append(separator.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_oversized(piece, max_tokens))
+            continue
+
+        if current and current_tokens + sep_tokens + tokens > max_tokens:
+            chunks.append(separator.join(current))
+            current, current_tokens = [], 0
+
+        current.append(piece)
+        current_tokens += tokens + (sep_tokens if len(current) > 1 else 0)
+
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def split_by_tokens(text: str, max_tokens: int) -> List[str]:
+    """
+    Splits text into chunks of at most `max_tokens`, breaking on paragraph
+    boundaries where possible, then sentences, then words.
+
+    Args:
+        text (str): Text to split.
+        max_tokens (int): Token budget per chunk.
+
+    Returns:
+        List[str]: Chunks in original order.
+    """
+    paragraphs = re.split(r"\n\s*\n", text or "")
+    return pack_by_tokens(paragraphs, max_tokens)